@@ -0,0 +1,5 @@
+"""
+Offline benchmarks for happyaccidentsapi
+
+Run with ``python -m benchmarks.run``; see ``benchmarks/README.md``.
+"""
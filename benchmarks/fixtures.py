@@ -0,0 +1,242 @@
+"""
+Response fixtures replayed by the mock server.
+
+Recorded responses (see ``benchmarks.record``) are loaded from
+``benchmarks/fixtures/<name>.json``. Missing fixtures are synthesized with
+the same shape so the suite always runs offline.
+"""
+
+import json
+import os
+import uuid
+from copy import deepcopy
+from pathlib import Path
+from typing import Any, Dict, List
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+USER_ID = "8e6d1e1c-4f1b-4c8a-9d55-0d1c1b5c7f3a"
+
+INFERENCE_PAYLOAD = {
+    "modelId": "841993c68c9b45e3a21d312508578e8f",
+    "prompt": "beach, sunset, highly detailed, 8k, photorealistic",
+    "negativePrompt": "blurry, lowres",
+    "outputWpx": 512,
+    "outputHpx": 512,
+    "numImagesToGenerate": 4,
+    "numInferenceSteps": 25,
+    "samplingMethod": "EULER",
+    "vae": "stabilityai/sd-vae-ft-mse",
+    "guidanceScale": 7.0,
+    "seed": 42,
+}
+
+
+def image_record(inference_id: str, index: int) -> Dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4()),
+        "folderPath": f"{USER_ID}/{inference_id}",
+        "filename": f"result-{index}.png",
+        "createdAt": "2023-07-01T00:00:00.000000+00:00",
+        "userId": USER_ID,
+        "inferenceJobId": inference_id,
+        "favorite": False,
+        "nsfw": False,
+    }
+
+
+def inference_result(status: str = "COMPLETED") -> Dict[str, Any]:
+    inference_id = str(uuid.uuid4())
+    return {
+        "inferenceId": inference_id,
+        "userId": USER_ID,
+        "inferencePayload": INFERENCE_PAYLOAD,
+        "images": [image_record(inference_id, i) for i in range(4)],
+        "status": status,
+        "inferenceType": "TEXT_TO_IMAGE",
+        "createdAt": "2023-07-01T00:00:00.000000+00:00",
+        "dequeuedAt": "2023-07-01T00:00:01.000000+00:00",
+        "completedAt": "2023-07-01T00:00:09.000000+00:00",
+    }
+
+
+def created_inference() -> Dict[str, Any]:
+    return {
+        "inferenceId": str(uuid.uuid4()),
+        "userId": USER_ID,
+        "inferenceType": "TEXT_TO_IMAGE",
+        "inferencePayload": INFERENCE_PAYLOAD,
+        "createdAt": "2023-07-01T00:00:00.000000+00:00",
+        "status": "PENDING",
+        "violatesTos": False,
+    }
+
+
+def _model_image(i: int) -> Dict[str, Any]:
+    return {
+        "url": f"https://image.civitai.com/images/{i}.jpeg",
+        "nsfw": False,
+        "width": 512,
+        "height": 768,
+        "generationProcess": "txt2img",
+    }
+
+
+def _model_file(i: int) -> Dict[str, Any]:
+    return {
+        "name": f"model-{i}.safetensors",
+        "id": i,
+        "sizeKb": 2082642.5,
+        "type": "Model",
+        "pickleScanResult": "Success",
+        "pickleScanMessage": "No Pickle imports",
+        "virusScanResult": "Success",
+        "scannedAt": "2023-07-01T00:00:00.000Z",
+        "downloadUrl": f"https://civitai.com/api/download/models/{i}",
+        "format": "SafeTensor",
+        "metadata": {"format": "SafeTensor", "fp": "fp16", "size": "pruned"},
+    }
+
+
+def metadata_item(i: int = 0) -> Dict[str, Any]:
+    item_id = uuid.uuid4().hex
+    versions = [
+        {
+            "name": f"v{v}",
+            "id": uuid.uuid4().hex,
+            "createdAt": "2023-07-01T00:00:00",
+            "modelMetadataItemId": item_id,
+            "externalId": v,
+            "baseModel": "SD 1.5",
+            "description": "<p>Version notes</p>" * 10,
+            "downloadUrl": f"https://civitai.com/api/download/models/{v}",
+            "images": [_model_image(n) for n in range(5)],
+            "files": [_model_file(n) for n in range(2)],
+        }
+        for v in range(3)
+    ]
+    return {
+        "id": item_id,
+        "name": f"Model {i}",
+        "activeVersionId": versions[0]["id"],
+        "activeVersion": versions[0],
+        "author": "author",
+        "authorAvatarUrl": "https://image.civitai.com/avatar.jpeg",
+        "externalId": i,
+        "type": "Checkpoint",
+        "allowCommercialUse": "Rent",
+        "allowNoCredit": True,
+        "nsfw": False,
+        "description": "<p>Model description</p>" * 50,
+        "requestingUserId": USER_ID,
+        "createdAt": "2023-07-01T00:00:00",
+        "ratings": {
+            "downloadCount": 1000,
+            "favoriteCount": 100,
+            "commentCount": 10,
+            "ratingCount": 50,
+            "rating": 4.8,
+        },
+        "downloadStatus": "COMPLETED",
+        "tags": ["anime", "character", "base model"],
+        "trainedWords": ["masterpiece"],
+        "thumbnailImageUrl": "https://image.civitai.com/thumbnail.jpeg",
+        "thumbnailImageNsfw": False,
+        "versionMetadataItems": versions,
+        "configYaml": "model:\n  target: ldm.models.diffusion\n" * 20,
+    }
+
+
+def civitai_model(i: int = 0) -> Dict[str, Any]:
+    return {
+        "id": i,
+        "name": f"Model {i}",
+        "description": "<p>Model description</p>" * 50,
+        "creator": {"username": "author", "image": None},
+        "type": "Checkpoint",
+        "nsfw": False,
+        "allowNoCredit": True,
+        "allowCommercialUse": "Rent",
+        "allowDerivatives": True,
+        "allowDifferentLicense": True,
+        "modelVersions": [
+            {
+                "id": v,
+                "modelId": i,
+                "name": f"v{v}",
+                "baseModel": "SD 1.5",
+                "trainedWords": [],
+                "createdAt": "2023-07-01T00:00:00",
+                "files": [_model_file(n) for n in range(2)],
+                "images": [_model_image(n) for n in range(5)],
+            }
+            for v in range(3)
+        ],
+        "stats": {"downloadCount": 1000, "rating": 4.8},
+        "tags": ["anime"],
+    }
+
+
+def inference_page(size: int, page: int = 0) -> Dict[str, Any]:
+    return {
+        "items": [inference_result() for _ in range(size)],
+        "paginationMetadata": {"currentPage": page, "pageSize": size},
+    }
+
+
+def metadata_items_page(size: int, page: int = 1, total: int = 10000) -> Dict[str, Any]:
+    return {
+        "items": [metadata_item(i) for i in range(size)],
+        "paginationMetadata": {
+            "currentPage": page,
+            "pageSize": size,
+            "totalItems": total,
+        },
+    }
+
+
+def models_page(size: int, page: int = 1, total: int = 10000) -> Dict[str, Any]:
+    return {
+        "items": [civitai_model(i) for i in range(size)],
+        "metadata": {
+            "totalItems": total,
+            "currentPage": page,
+            "pageSize": size,
+            "totalPages": -(-total // size),
+        },
+    }
+
+
+def image_bytes(size: int = 512 * 1024) -> bytes:
+    return b"\x89PNG\r\n\x1a\n" + os.urandom(size - 8)
+
+
+def _recorded(name: str) -> Any:
+    path = FIXTURES_DIR / f"{name}.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def _resized(page: Dict[str, Any], size: int) -> Dict[str, Any]:
+    # Recorded pages are repeated or cut to the requested page size
+    page = deepcopy(page)
+    items: List[Any] = page["items"] or [None]
+    page["items"] = (items * (size // len(items) + 1))[:size]
+    return page
+
+
+def load(name: str, size: int = 0) -> Any:
+    recorded = _recorded(name)
+    if recorded is not None:
+        return _resized(recorded, size) if "items" in recorded else recorded
+
+    return {
+        "inference": inference_result,
+        "created_inference": created_inference,
+        "metadata_item": metadata_item,
+        "max_queue_depth": lambda: 5,
+        "inferences": lambda: inference_page(size),
+        "metadata_items": lambda: metadata_items_page(size),
+        "models": lambda: models_page(size),
+    }[name]()
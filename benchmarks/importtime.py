@@ -0,0 +1,94 @@
+"""
+Measure the import cost of happyaccidentsapi in fresh interpreters.
+
+    python -m benchmarks.importtime            # time per scenario
+    python -m benchmarks.importtime --top 15   # slowest modules (-X importtime)
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).parent.parent
+
+SCENARIOS = {
+    "import_package": "import happyaccidentsapi",
+    "import_models": "from happyaccidentsapi import CreateInferenceParams",
+    "import_client": "from happyaccidentsapi import ClientAPI",
+    "first_validation": (
+        "from happyaccidentsapi import CreateInferenceParams\n"
+        "CreateInferenceParams(modelId='model', prompt='beach')"
+    ),
+}
+
+PROBE = """
+import sys
+import time
+
+before = set(sys.modules)
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(elapsed, len(set(sys.modules) - before))
+"""
+
+
+def run_python(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def measure(statement: str, repeat: int) -> Dict[str, float]:
+    timings, modules = [], 0
+    for _ in range(repeat):
+        output = run_python(PROBE.format(statement=statement)).stdout.split()
+        timings.append(float(output[0]))
+        modules = int(output[1])
+    return {"ms": statistics.median(timings) * 1000, "modules": modules}
+
+
+def slowest(statement: str, top: int) -> List[Tuple[float, str]]:
+    """
+    Modules with the highest self time reported by ``python -X importtime``
+    """
+    stderr = run_python(statement, "-X", "importtime").stderr
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        timings.append((int(self_us) / 1000, name.strip()))
+    return sorted(timings, reverse=True)[:top]
+
+
+def bench_import(repeat: int) -> Dict[str, Dict[str, float]]:
+    return {name: measure(code, repeat) for name, code in SCENARIOS.items()}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, help="list the slowest modules")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="import_client")
+    args = parser.parse_args(argv)
+
+    if args.top:
+        for ms, name in slowest(SCENARIOS[args.scenario], args.top):
+            print(f"{ms:8.2f} ms  {name}")
+        return 0
+
+    for name, metrics in bench_import(args.repeat).items():
+        print(f"{name:<20} ms={metrics['ms']:.2f}  modules={metrics['modules']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
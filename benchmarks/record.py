@@ -0,0 +1,54 @@
+"""
+Record live API responses as benchmark fixtures.
+
+    TOKEN=... python -m benchmarks.record
+
+Responses are written to ``benchmarks/fixtures/<name>.json`` and replayed
+by the mock server instead of the synthesized payloads.
+"""
+
+import asyncio
+import json
+import sys
+from os import getenv
+
+from happyaccidentsapi import ClientAPI
+
+from .fixtures import FIXTURES_DIR
+
+
+async def record(token: str) -> None:
+    async with ClientAPI(token=token) as api:
+        history = await api._request("GET", "/inferences/", params={"page_size": 10})
+        history = api._loads(history)
+        inference_id = history["items"][0]["inferenceId"]
+        metadata_items = api._loads(
+            await api._request("GET", "/models/metadata-items", params={"pageSize": 10})
+        )
+        metadata_item_id = metadata_items["items"][0]["id"]
+
+        responses = {
+            "inferences": history,
+            "inference": f"/inferences/{inference_id}",
+            "metadata_items": metadata_items,
+            "metadata_item": f"/models/metadata-items/{metadata_item_id}",
+            "models": ("/models/models", {"page_size": 10}),
+            "max_queue_depth": "/max_queue_depth",
+        }
+        FIXTURES_DIR.mkdir(exist_ok=True)
+        for name, response in responses.items():
+            if isinstance(response, (str, tuple)):
+                path, params = (
+                    response if isinstance(response, tuple) else (response, None)
+                )
+                response = api._loads(await api._request("GET", path, params=params))
+
+            (FIXTURES_DIR / f"{name}.json").write_text(json.dumps(response, indent=2))
+            print(f"Recorded {name}")
+
+
+if __name__ == "__main__":
+    token = getenv("TOKEN")
+    if token is None:
+        sys.exit("Set TOKEN to record fixtures from the live API")
+    asyncio.run(record(token))
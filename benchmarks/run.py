@@ -0,0 +1,276 @@
+"""
+Run the offline benchmark suite.
+
+    python -m benchmarks.run                  # print results
+    python -m benchmarks.run --save-baseline  # store them as the baseline
+    python -m benchmarks.run --compare        # exit 1 on regressions
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+from unittest import mock
+
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import (
+    ApiPaginatedListResponseInferenceHistoricalResult,
+    ClientAPI,
+    CreateInferenceParams,
+    ImageRecord,
+    MetadataItems,
+)
+
+from . import fixtures, importtime
+from .server import MockClientAPI, create_app, image_url
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+Results = Dict[str, Dict[str, float]]
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    index = min(int(round(q / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+async def measure(
+    call: Callable[[], Awaitable[Any]],
+    requests: int,
+    concurrency: int,
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with slots:
+            started = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - started)
+
+    await call()  # warm up connections and caches
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def endpoint_calls(api: ClientAPI, page_size: int) -> Dict[str, Callable]:
+    inference_id = fixtures.load("inference")["inferenceId"]
+    params = CreateInferenceParams(modelId="model", prompt="beach")
+    return {
+        "fetch_inference": lambda: api.fetch_inference(inference_id),
+        "fetch_inferences": lambda: api.fetch_inferences(page_size=page_size),
+        "fetch_community_inferences": lambda: api.fetch_community_inferences(
+            page_size=page_size
+        ),
+        "create_inference": lambda: api.create_inference(
+            params, wait_for_response=False
+        ),
+        "fetch_max_queue_depth": api.fetch_max_queue_depth,
+        "fetch_models": lambda: api.fetch_models(page_size=page_size),
+        "fetch_metadata_items": lambda: api.fetch_metadata_items(page_size=page_size),
+        "fetch_metadata_item": lambda: api.fetch_metadata_item("model"),
+        "fetch_inference_result_by_image_id": lambda: (
+            api.fetch_inference_result_by_image_id("image")
+        ),
+    }
+
+
+def measure_memory(func: Callable[[], Any]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        if asyncio.iscoroutine(result):
+            raise TypeError("use measure_memory_async for coroutines")
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+async def measure_memory_async(call: Callable[[], Awaitable[Any]]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        await call()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def bench_parsing(sizes: List[int], repeat: int) -> Results:
+    results: Results = {}
+    api = ClientAPI()
+    payloads = {
+        "inferences": (
+            ApiPaginatedListResponseInferenceHistoricalResult,
+            lambda size: fixtures.load("inferences", size),
+        ),
+        "metadata_items": (
+            MetadataItems,
+            lambda size: fixtures.load("metadata_items", size),
+        ),
+    }
+    for name, (model, load) in payloads.items():
+        for size in sizes:
+            body = json.dumps(load(size)).encode()
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                api._validate(model, body)
+                timings.append(time.perf_counter() - started)
+
+            seconds = statistics.median(timings)
+            results[f"parse_{name}_{size}"] = {
+                "payload_kib": len(body) / 1024,
+                "ms": seconds * 1000,
+                "mib_per_s": len(body) / seconds / 1024 / 1024,
+                "peak_kib": measure_memory(lambda: api._validate(model, body)),
+            }
+    return results
+
+
+async def bench_endpoints(
+    server: TestServer,
+    requests: int,
+    concurrency: int,
+    page_size: int,
+) -> Results:
+    results: Results = {}
+    async with MockClientAPI(server, token="benchmark", coalesce_requests=False) as api:
+        for name, call in endpoint_calls(api, page_size).items():
+            results[name] = await measure(call, requests, concurrency)
+    return results
+
+
+class NullWriter:
+    """
+    Stands in for a proxied HTTP response
+    """
+
+    def write(self, chunk: bytes) -> None:
+        pass
+
+
+async def bench_images(server: TestServer, requests: int, concurrency: int) -> Results:
+    image = ImageRecord.model_validate(fixtures.load("inference")["images"][0])
+    with mock.patch.object(
+        ImageRecord, "get_url", lambda self: image_url(server, self)
+    ):
+        async with MockClientAPI(server, token="benchmark") as api:
+            image._client = api
+            results = {
+                "image_save": await measure(
+                    lambda: image.save(BytesIO()), requests, concurrency
+                )
+            }
+            results["image_save"]["peak_kib"] = await measure_memory_async(
+                lambda: asyncio.gather(*(image.save(BytesIO()) for _ in range(8)))
+            )
+            results["image_stream_to"] = await measure(
+                lambda: image.stream_to(NullWriter()), requests, concurrency
+            )
+            results["image_stream_to"]["peak_kib"] = await measure_memory_async(
+                lambda: asyncio.gather(
+                    *(image.stream_to(NullWriter()) for _ in range(8))
+                )
+            )
+    return results
+
+
+async def run(args: argparse.Namespace) -> Results:
+    server = TestServer(create_app(args.image_size))
+    await server.start_server()
+    try:
+        results = await bench_endpoints(
+            server, args.requests, args.concurrency, args.page_size
+        )
+        results.update(await bench_images(server, args.requests, args.concurrency))
+    finally:
+        await server.close()
+
+    results.update(bench_parsing(args.sizes, args.repeat))
+    results.update(importtime.bench_import(args.repeat))
+    return results
+
+
+# Metrics where a higher value is better; every other metric must not grow
+HIGHER_IS_BETTER = {"rps", "mib_per_s"}
+IGNORED = {"payload_kib"}
+
+
+def compare(results: Results, baseline: Results, tolerance: float) -> List[str]:
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(name, {}).get(metric)
+            if expected is None or metric in IGNORED or expected == 0:
+                continue
+
+            change = (value - expected) / expected
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > tolerance:
+                regressions.append(
+                    f"{name}.{metric}: {expected:.2f} -> {value:.2f} "
+                    f"({change:+.0%} worse)"
+                )
+    return regressions
+
+
+def report(results: Results) -> None:
+    for name, metrics in results.items():
+        values = "  ".join(f"{key}={value:.2f}" for key, value in metrics.items())
+        print(f"{name:<40} {values}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--image-size", type=int, default=512 * 1024)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    report(results)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True))
+        print(f"Baseline saved to {args.baseline}")
+    if args.compare:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Local aiohttp server replaying fixtures for every ClientAPI endpoint and
+for image downloads
+"""
+
+import json
+from functools import lru_cache
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import ClientAPI, ImageRecord
+
+from . import fixtures
+
+
+@lru_cache(maxsize=None)
+def _body(name: str, size: int = 0) -> bytes:
+    # Serialized once, so the server side stays cheap compared to the client
+    return json.dumps(fixtures.load(name, size)).encode()
+
+
+def _json(name: str, size: int = 0) -> web.Response:
+    return web.Response(body=_body(name, size), content_type="application/json")
+
+
+def _page_size(request: web.Request, key: str) -> int:
+    return int(request.query.get(key, 10))
+
+
+def create_app(image_size: int = 512 * 1024) -> web.Application:
+    image = fixtures.image_bytes(image_size)
+
+    async def inference(request):
+        return _json("inference")
+
+    async def inferences(request):
+        return _json("inferences", _page_size(request, "page_size"))
+
+    async def create_inference(request):
+        await request.read()
+        return _json("created_inference")
+
+    async def max_queue_depth(request):
+        return _json("max_queue_depth")
+
+    async def models(request):
+        return _json("models", _page_size(request, "page_size"))
+
+    async def metadata_items(request):
+        return _json("metadata_items", _page_size(request, "pageSize"))
+
+    async def metadata_item(request):
+        return _json("metadata_item")
+
+    async def image_file(request):
+        start = request.http_range.start or 0
+        return web.Response(
+            status=206 if start else 200,
+            body=image[start:],
+            content_type="image/png",
+            headers={"ETag": '"fixture"'},
+        )
+
+    app = web.Application()
+    app.router.add_get("/v1/inferences/{id}", inference)
+    app.router.add_get("/v1/inferences/", inferences)
+    app.router.add_get("/v1/community/inferences/", inferences)
+    app.router.add_post("/v1/inference/", create_inference)
+    app.router.add_get("/v1/max_queue_depth", max_queue_depth)
+    app.router.add_get("/v1/models/models", models)
+    app.router.add_get("/v1/models/metadata-items", metadata_items)
+    app.router.add_get("/v1/models/metadata-items/{id}", metadata_item)
+    app.router.add_get("/v1/images/{id}", inference)
+    app.router.add_get("/images/{path:.*}", image_file)
+    return app
+
+
+class MockClientAPI(ClientAPI):
+    """
+    ClientAPI pointed at a running mock server
+    """
+
+    def __init__(self, server: TestServer, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._server = server
+
+    def _get_url(self):
+        return str(self._server.make_url("/v1"))
+
+
+def image_url(server: TestServer, image: ImageRecord) -> str:
+    return str(server.make_url(f"/images/{image.folderPath}/{image.filename}"))
@@ -9,6 +9,133 @@ __author__ = "hoopengo"
 __license__ = "Apache License 2.0"
 __version__ = "0.0.0"
 
-from ._happyaccidentsapi import *
-from .enums import *
-from .models import *
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# Public name -> submodule defining it. Submodules (and aiohttp / pydantic
+# with them) are imported on first access, so short-lived processes only pay
+# for what they use.
+_exports = {
+    "ClientAPI": "_happyaccidentsapi",
+    "export_history": "archive",
+    "iter_history": "archive",
+    "read_history": "archive",
+    "CacheEntry": "cache",
+    "MemoryCache": "cache",
+    "ResponseCache": "cache",
+    "SqliteCache": "cache",
+    "ModelCatalog": "catalog",
+    "AccountStatus": "enums",
+    "CivitAiBaseModelType": "enums",
+    "CivitAiModelType": "enums",
+    "CivitAiSortByType": "enums",
+    "DownloadStatus": "enums",
+    "InferenceStatus": "enums",
+    "InferenceType": "enums",
+    "JobState": "enums",
+    "NotificationStatus": "enums",
+    "PreprocessingTechnique": "enums",
+    "QueuePriority": "enums",
+    "SamplingMethod": "enums",
+    "VariationalAutoEncoder": "enums",
+    "UserRole": "enums",
+    "InferenceTimeout": "errors",
+    "PoolExhausted": "errors",
+    "ExportStats": "export",
+    "save_all": "export",
+    "HistorySync": "history",
+    "CallbackSink": "instrumentation",
+    "MetricsSink": "instrumentation",
+    "OpenTelemetrySink": "instrumentation",
+    "PrometheusSink": "instrumentation",
+    "RequestTiming": "instrumentation",
+    "Job": "jobs",
+    "JobQueue": "jobs",
+    "ModelCreator": "models",
+    "ModelFileMetadata": "models",
+    "ModelImage": "models",
+    "ModelFile": "models",
+    "ModelVersion": "models",
+    "ModelStats": "models",
+    "MetadataItemVersion": "models",
+    "MetadataItem": "models",
+    "MetadataItems": "models",
+    "Model": "models",
+    "ModelsMetadata": "models",
+    "Models": "models",
+    "CannyEdgesPayload": "models",
+    "Esrgan4xUpscalingParams": "models",
+    "FaceRestoreParams": "models",
+    "HedPayload": "models",
+    "HighResFixParams": "models",
+    "ImageRecord": "models",
+    "LoraParams": "models",
+    "MidasDepthPayload": "models",
+    "MlsdPayload": "models",
+    "ModelDownloadRequestParams": "models",
+    "OpenposePayload": "models",
+    "PreprocessingResult": "models",
+    "RangePaginationMetadata": "models",
+    "UpdateImageParams": "models",
+    "WebhookEvent": "models",
+    "PreprocessingParams": "models",
+    "User": "models",
+    "CreateInferenceParams": "models",
+    "Inference": "models",
+    "InferenceHistoricalResult": "models",
+    "UpdateInferenceParams": "models",
+    "ApiPaginatedListResponseInferenceHistoricalResult": "models",
+    "CompletionEstimator": "polling",
+    "PollingStrategy": "polling",
+    "ClientPool": "pool",
+    "DuplicateFilter": "processing",
+    "ProcessedImage": "processing",
+    "ProcessingPipeline": "processing",
+    "Thumbnail": "processing",
+    "perceptual_hash": "processing",
+    "sha256": "processing",
+    "Projection": "projection",
+    "SyncClientAPI": "sync",
+    "RateLimiter": "throttling",
+    "RetryPolicy": "throttling",
+    "ThrottleMetrics": "throttling",
+    "TokenBucket": "throttling",
+    "WebhookReceiver": "webhooks",
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name: str) -> Any:
+    module = _exports.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from ._happyaccidentsapi import *
+    from .archive import *
+    from .cache import *
+    from .catalog import *
+    from .enums import *
+    from .errors import InferenceTimeout, PoolExhausted
+    from .export import *
+    from .history import *
+    from .instrumentation import *
+    from .jobs import *
+    from .models import *
+    from .polling import *
+    from .pool import *
+    from .processing import *
+    from .projection import *
+    from .sync import *
+    from .throttling import *
+    from .webhooks import *
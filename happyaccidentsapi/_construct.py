@@ -0,0 +1,102 @@
+import inspect
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Any, List, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+
+__all__ = []
+
+_NONE = type(None)
+_DATETIME = TypeAdapter(datetime)
+
+
+def _is_model(annotation: Any) -> bool:
+    return inspect.isclass(annotation) and issubclass(annotation, BaseModel)
+
+
+def _plan(annotation: Any) -> Any:
+    """
+    Describe how to build a field value: ("model", cls), ("list", plan),
+    ("union", classes), ("enum", cls), ("datetime", None) or None to keep
+    the raw value
+    """
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not _NONE]
+        if len(args) == 1:
+            return _plan(args[0])
+        models = tuple(arg for arg in args if _is_model(arg))
+        return ("union", models) if models else None
+
+    if origin in (list, List):
+        args = get_args(annotation)
+        item = _plan(args[0]) if args else None
+        return ("list", item) if item is not None else None
+
+    if _is_model(annotation):
+        return ("model", annotation)
+    if annotation is datetime:
+        return ("datetime", None)
+    if inspect.isclass(annotation) and issubclass(annotation, Enum):
+        return ("enum", annotation)
+    return None
+
+
+@lru_cache(maxsize=None)
+def _fields(model: Type[BaseModel]) -> Tuple[Tuple[str, Any], ...]:
+    # Resolve forward references to models defined later in the module
+    model.model_rebuild()
+    return tuple(
+        (name, _plan(field.annotation)) for name, field in model.model_fields.items()
+    )
+
+
+def _pick(models: Tuple[Type[BaseModel], ...], data: dict) -> Type[BaseModel]:
+    # Same idea as pydantic's smart union: the model whose required fields
+    # are all present and that knows most of the keys
+    def score(model: Type[BaseModel]) -> Tuple[bool, int]:
+        fields = model.model_fields
+        required = all(
+            name in data for name, field in fields.items() if field.is_required()
+        )
+        return required, sum(key in fields for key in data)
+
+    return max(models, key=score)
+
+
+def _build(plan: Any, value: Any, client: Any) -> Any:
+    if plan is None or value is None:
+        return value
+
+    kind, arg = plan
+    if kind == "list":
+        return [_build(arg, item, client) for item in value]
+    if kind == "enum":
+        return arg(value)
+    if kind == "datetime":
+        return _DATETIME.validate_python(value)
+    if not isinstance(value, dict):
+        return value
+    if kind == "union":
+        arg = _pick(arg, value)
+    return construct(arg, value, client)
+
+
+def construct(model: Type[BaseModel], data: dict, client: Any = None) -> BaseModel:
+    """
+    Recursively build ``model`` from trusted data without validation.
+
+    Only nested models, enums and datetimes are built: other values such as
+    UUIDs stay as the API sent them.
+    """
+    values = {
+        name: _build(plan, data[name], client)
+        for name, plan in _fields(model)
+        if name in data
+    }
+    obj = model.model_construct(**values)
+    if "_client" in model.__private_attributes__:
+        obj._client = client
+    return obj
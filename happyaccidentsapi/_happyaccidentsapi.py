@@ -1,10 +1,23 @@
 import asyncio
-from typing import List, Union
+import functools
+import itertools
+import time
+from typing import AsyncIterator, Iterable, List, Sequence, Tuple, Union
 
-from aiohttp import ClientResponse, ClientSession
+from aiohttp import (
+    ClientError,
+    ClientResponse,
+    ClientSession,
+    TCPConnector,
+    web_exceptions,
+)
 
 from . import __version__
+from ._construct import construct
+from ._json import JSONLoads, default_loads
+from ._singleflight import SingleFlight
 from ._token import validate_token
+from .cache import CacheEntry, ResponseCache, cache_key, result_key
 from .enums import (
     CivitAiBaseModelType,
     CivitAiModelType,
@@ -13,6 +26,13 @@ from .enums import (
     InferenceStatus,
 )
 from .errors import TokenRequired, handle_error
+from .instrumentation import (
+    MetricsSink,
+    RequestTiming,
+    current_endpoint,
+    endpoint_name,
+    trace_config,
+)
 from .models import (
     ApiPaginatedListResponseInferenceHistoricalResult,
     CreateInferenceParams,
@@ -20,15 +40,29 @@ from .models import (
     InferenceHistoricalResult,
     MetadataItem,
     MetadataItems,
+    Model,
     Models,
 )
+from .pagination import models_total_pages, paginate, range_total_pages
+from .polling import BatchPoller, ErrorCallback, PollingStrategy, queued_ahead
+from .projection import Projection, projection
+from .throttling import RateLimiter, RetryPolicy, ThrottleMetrics
+from .webhooks import WebhookReceiver
 
 __all__ = [
     "ClientAPI",
 ]
 
+# Large list responses that ClientAPI(trusted=True) builds without validation
+TRUSTED_MODELS = (
+    ApiPaginatedListResponseInferenceHistoricalResult,
+    MetadataItems,
+    Models,
+)
+
 
 def token_required(func):
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         token = args[0]._token
         if token is None:
@@ -42,15 +76,54 @@ def token_required(func):
 class ClientAPI:
     _api_version = "v1"
     _api_host = "easel-fgiw.onrender.com"
+    _image_host = "ik.imagekit.io"
 
     def __init__(
         self,
         token: Union[str, None] = None,
         skip_token_validation: bool = False,
+        connection_limit: int = 100,
+        connection_limit_per_host: int = 20,
+        dns_cache_ttl: Union[int, None] = 300,
+        keepalive_timeout: float = 30.0,
+        cache: Union[ResponseCache, None] = None,
+        coalesce_requests: bool = True,
+        rate_limiter: Union[RateLimiter, None] = None,
+        retry_policy: Union[RetryPolicy, None] = RetryPolicy(),
+        json_loads: Union[JSONLoads, None] = None,
+        trusted: bool = False,
+        metrics_sink: Union[MetricsSink, None] = None,
+        webhook_receiver: Union[WebhookReceiver, None] = None,
+        result_cache: Union[ResponseCache, None] = None,
+        eager: bool = False,
+        keepalive_interval: Union[float, None] = None,
     ) -> None:
         if token is not None and not skip_token_validation:
             validate_token(token)
 
+        self._connection_limit = connection_limit
+        self._connection_limit_per_host = connection_limit_per_host
+        self._dns_cache_ttl = dns_cache_ttl
+        self._keepalive_timeout = keepalive_timeout
+        self._session: Union[ClientSession, None] = None
+        self._session_loop: Union[asyncio.AbstractEventLoop, None] = None
+        self._session_owner: Union[asyncio.Task, None] = None
+        self._cache = cache
+        self._inflight = SingleFlight() if coalesce_requests else None
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy
+        self.throttle_metrics = ThrottleMetrics()
+        self._loads = json_loads or default_loads()
+        self._trusted = trusted
+        self._metrics_sink = metrics_sink
+        self._webhook_receiver = webhook_receiver
+        self._result_cache = result_cache
+        self._max_queue_depth: Union[int, None] = None
+        self._pending_inferences = 0
+        self._eager = eager
+        self._keepalive_interval = keepalive_interval
+        self._keepalive_task: Union[asyncio.Task, None] = None
+
         self._token = token
         self._base_headers = {
             "Content-Type": "application/json",
@@ -61,27 +134,302 @@ class ClientAPI:
         if self._token is not None:
             self._base_headers.update({"Authorization": "Bearer " + self._token})
 
-    def _resolve_session(self, **kwargs):
-        return ClientSession(headers=self._base_headers, **kwargs)
+    async def __aenter__(self) -> "ClientAPI":
+        self._resolve_session()
+        if self._eager:
+            await self.warm_up()
+        if self._keepalive_interval is not None:
+            self.start_keepalive(self._keepalive_interval)
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Close the pooled session and all of its keep-alive connections
+        """
+        self.stop_keepalive()
+        session = self._detach_session()
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _detach_session(self) -> Union[ClientSession, None]:
+        # Returns the session if it can still be closed from the running loop
+        session, self._session = self._session, None
+        owner, self._session_owner = self._session_owner, None
+        if self._session_loop is not asyncio.get_running_loop():
+            # Closed by its owner task, now if its loop still runs in another
+            # thread (SyncClientAPI) or else when that loop shut down
+            if owner is not None and self._session_loop.is_running():
+                try:
+                    self._session_loop.call_soon_threadsafe(owner.cancel)
+                except RuntimeError:  # closed in the meantime
+                    pass
+            return None
+        if owner is not None:
+            owner.cancel()
+        return session
+
+    @staticmethod
+    async def _close_with_loop(session: ClientSession) -> None:
+        # asyncio.run cancels pending tasks before closing its loop, so a
+        # session of a client never closed explicitly is closed here
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            if not session.closed:
+                await session.close()
+
+    def _resolve_session(self) -> ClientSession:
+        # One session (and one connector) per client, shared by every endpoint
+        # and by image downloads of the models it returned. Auth headers are
+        # sent per request so they never leak to the image CDN.
+        loop = asyncio.get_running_loop()
+        if self._session_loop is not loop:
+            # A session can't outlive its event loop: a client reused across
+            # asyncio.run() calls gets a new one per loop
+            self._detach_session()
+        if self._session is None or self._session.closed:
+            connector = TCPConnector(
+                limit=self._connection_limit,
+                limit_per_host=self._connection_limit_per_host,
+                use_dns_cache=self._dns_cache_ttl is not None,
+                ttl_dns_cache=self._dns_cache_ttl,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            trace_configs = None
+            if self._metrics_sink is not None:
+                trace_configs = [trace_config()]
+            self._session = ClientSession(
+                connector=connector,
+                trace_configs=trace_configs,
+            )
+            self._session_loop = loop
+            if self._session_owner is not None:
+                self._session_owner.cancel()  # its session was closed
+            self._session_owner = loop.create_task(self._close_with_loop(self._session))
+
+        return self._session
 
     def _get_url(self):
         return f"https://{self._api_host}/{self._api_version}"
 
+    def _get_image_url(self):
+        return f"https://{self._image_host}/"
+
+    async def _probe(self, session: ClientSession, url: str) -> bool:
+        try:
+            async with session.get(url, allow_redirects=False) as response:
+                await response.read()
+        except (ClientError, asyncio.TimeoutError):
+            return False
+        return True
+
+    async def warm_up(self, connections: int = 4, image_connections: int = 2) -> int:
+        """
+        Resolve DNS and open pooled keep-alive connections to the API and
+        image hosts, waking a cold API instance on the way; returns how many
+        connections answered
+        """
+        session = self._resolve_session()
+        # Concurrent probes can't share a connection, so each opens its own
+        urls = [self._get_url() + "/"] * connections
+        urls += [self._get_image_url()] * image_connections
+        results = await asyncio.gather(*(self._probe(session, url) for url in urls))
+        return sum(results)
+
+    def start_keepalive(
+        self,
+        interval: float,
+        connections: int = 4,
+        image_connections: int = 2,
+    ) -> asyncio.Task:
+        """
+        Re-run ``warm_up`` every ``interval`` seconds so pooled connections
+        are not closed as idle and the API instance is not scaled down; keep
+        ``interval`` below ``keepalive_timeout``
+        """
+
+        async def keepalive() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                await self.warm_up(connections, image_connections)
+
+        self.stop_keepalive()
+        self._keepalive_task = asyncio.ensure_future(keepalive())
+        return self._keepalive_task
+
+    def stop_keepalive(self) -> None:
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+
     async def _proceed_response(self, response: ClientResponse):
-        data = await response.json()
+        # Successful bodies are returned as raw bytes and parsed once, by
+        # pydantic's JSON validator (see _validate)
+        body = await response.read()
         if response.status >= 400:
+            try:
+                data = self._loads(body)
+            except ValueError:
+                # Proxies and throttling layers may answer with plain text
+                data = {"detail": body.decode(errors="replace")}
+            if not isinstance(data, dict):
+                data = {"detail": data}
             handle_error(response, data)
 
+        return body
+
+    async def _exchange(self, method: str, path: str, headers=None, **kwargs):
+        """
+        Send a request through the rate limiter and retry policy and return
+        its status, headers and decoded body (None for 304 Not Modified)
+        """
+        metrics = self.throttle_metrics
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                waited = await self._rate_limiter.acquire(path)
+                if waited:
+                    metrics.limiter_waits += 1
+                    metrics.limiter_wait_seconds += waited
+
+            timing = None
+            if self._metrics_sink is not None:
+                timing = RequestTiming(endpoint_name(method, path))
+                current_endpoint.set(timing.endpoint)
+
+            try:
+                session = self._resolve_session()
+                async with session.request(
+                    method,
+                    f"{self._get_url()}{path}",
+                    headers={**self._base_headers, **(headers or {})},
+                    trace_request_ctx=timing,
+                    **kwargs,
+                ) as response:
+                    if timing is not None:
+                        timing.status = response.status
+                    if response.status == 304:
+                        return response.status, response.headers, None
+
+                    if timing is not None:
+                        timing.mark("read_start")
+                    data = await self._proceed_response(response)
+                    return response.status, response.headers, data
+            except Exception as exc:
+                throttled = isinstance(exc, web_exceptions.HTTPTooManyRequests)
+                if throttled:
+                    metrics.throttled_responses += 1
+                elif (
+                    isinstance(exc, web_exceptions.HTTPException) and exc.status >= 500
+                ):
+                    metrics.server_errors += 1
+
+                delay = None
+                if self._retry_policy is not None:
+                    delay = self._retry_policy.delay(method, exc, attempt)
+                if delay is None:
+                    raise
+            finally:
+                if timing is not None:
+                    timing.phase("read", "read_start")
+                    timing.finish()
+                    self._metrics_sink.record(timing)
+
+            if throttled and self._rate_limiter is not None:
+                self._rate_limiter.pause(path, delay)
+            metrics.retries += 1
+            metrics.retry_wait_seconds += delay
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _request(self, method: str, path: str, headers=None, **kwargs):
+        _, _, data = await self._exchange(method, path, headers, **kwargs)
         return data
 
+    def _validate(self, model, data):
+        if self._metrics_sink is None:
+            return self._build(model, data)
+
+        started = time.perf_counter()
+        try:
+            return self._build(model, data)
+        finally:
+            self._metrics_sink.observe(
+                current_endpoint.get() or getattr(model, "__name__", str(model)),
+                "validate",
+                time.perf_counter() - started,
+            )
+
+    def _build(self, model, data):
+        if isinstance(model, Projection):
+            return model.validate(data)
+
+        if self._trusted and model in TRUSTED_MODELS:
+            if isinstance(data, (bytes, str)):
+                data = self._loads(data)
+            return construct(model, data, self)
+
+        if isinstance(data, (bytes, str)):
+            return model.model_validate_json(data, context={"client": self})
+        return model.model_validate(data, context={"client": self})
+
+    async def _fetch(self, model, path: str, params=None, cached: bool = False):
+        # Identical GETs in flight at the same time share one request and
+        # one validation
+        fetch = self._fetch_cached if cached else self._fetch_uncached
+        if self._inflight is None:
+            return await fetch(model, path, params)
+
+        key = (model, cache_key("GET", path, params))
+        return await self._inflight.do(key, lambda: fetch(model, path, params))
+
+    async def _fetch_uncached(self, model, path: str, params=None):
+        data = await self._request("GET", path, params=params)
+        return self._validate(model, data)
+
+    async def _fetch_cached(self, model, path: str, params=None):
+        # Catalog endpoints: serve fresh entries locally and revalidate
+        # stale ones with the server before using them again
+        if self._cache is None:
+            return await self._fetch_uncached(model, path, params)
+
+        key = cache_key("GET", path, params, self._token)
+        entry = await self._cache.get(key)
+        if entry is not None and entry.age < self._cache.ttl:
+            return entry.model(model, self._validate)
+
+        headers = {}
+        if entry is not None and entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        status, response_headers, data = await self._exchange(
+            "GET", path, headers, params=params
+        )
+        if status == 304 and entry is not None:
+            entry.stored_at = time.time()
+        else:
+            entry = CacheEntry(
+                data,
+                response_headers.get("ETag"),
+                response_headers.get("Last-Modified"),
+            )
+
+        await self._cache.set(key, entry)
+        return entry.model(model, self._validate)
+
     async def fetch_inference(
         self,
         inference_id: int,
     ) -> InferenceHistoricalResult:
-        async with self._resolve_session() as session:
-            response = await session.get(f"{self._get_url()}/inferences/{inference_id}")
-            data = await self._proceed_response(response)
-            return InferenceHistoricalResult.model_validate(data)
+        return await self._fetch(
+            InferenceHistoricalResult,
+            f"/inferences/{inference_id}",
+        )
 
     @token_required
     async def fetch_inferences(
@@ -89,18 +437,31 @@ class ClientAPI:
         current_page: int = 0,
         page_size: int = 10,
     ) -> ApiPaginatedListResponseInferenceHistoricalResult:
-        async with self._resolve_session() as session:
-            response = await session.get(
-                f"{self._get_url()}/inferences/",
-                params={
-                    "current_page": current_page,
-                    "page_size": page_size,
-                },
-            )
-            data = await self._proceed_response(response)
-            return ApiPaginatedListResponseInferenceHistoricalResult.model_validate(
-                data
-            )
+        return await self._fetch(
+            ApiPaginatedListResponseInferenceHistoricalResult,
+            "/inferences/",
+            params={
+                "current_page": current_page,
+                "page_size": page_size,
+            },
+        )
+
+    @token_required
+    async def iter_inferences(
+        self,
+        page_size: int = 100,
+        concurrency: int = 4,
+        prefetch: bool = True,
+    ) -> AsyncIterator[InferenceHistoricalResult]:
+        async for item in paginate(
+            lambda page: self.fetch_inferences(page, page_size),
+            first_page=0,
+            page_size=page_size,
+            total_pages=lambda page: range_total_pages(page.paginationMetadata),
+            concurrency=concurrency,
+            prefetch=prefetch,
+        ):
+            yield item
 
     @token_required
     async def fetch_community_inferences(
@@ -111,58 +472,216 @@ class ClientAPI:
         nsfw: bool = False,
         query: str = "",
     ) -> ApiPaginatedListResponseInferenceHistoricalResult:
-        async with self._resolve_session() as session:
-            response = await session.get(
-                f"{self._get_url()}/community/inferences/",
-                params={
-                    "current_page": current_page,
-                    "page_size": page_size,
-                    "favorites_only": str(favorites_only),
-                    "nsfw": str(nsfw),
-                    "search": query,
-                },
-            )
-            data = await self._proceed_response(response)
-            return ApiPaginatedListResponseInferenceHistoricalResult.model_validate(
-                data
-            )
+        return await self._fetch(
+            ApiPaginatedListResponseInferenceHistoricalResult,
+            "/community/inferences/",
+            params={
+                "current_page": current_page,
+                "page_size": page_size,
+                "favorites_only": str(favorites_only),
+                "nsfw": str(nsfw),
+                "search": query,
+            },
+        )
+
+    @token_required
+    async def iter_community_inferences(
+        self,
+        page_size: int = 100,
+        favorites_only: bool = True,
+        nsfw: bool = False,
+        query: str = "",
+        concurrency: int = 4,
+    ) -> AsyncIterator[InferenceHistoricalResult]:
+        async for item in paginate(
+            lambda page: self.fetch_community_inferences(
+                page, page_size, favorites_only, nsfw, query
+            ),
+            first_page=0,
+            page_size=page_size,
+            total_pages=lambda page: range_total_pages(page.paginationMetadata),
+            concurrency=concurrency,
+        ):
+            yield item
 
     @token_required
     async def create_inference(
         self,
         inference_params: CreateInferenceParams,
         wait_for_response: bool = True,
+        polling_strategy: Union[PollingStrategy, None] = None,
     ) -> Union[InferenceHistoricalResult, Inference]:
-        async with self._resolve_session() as session:
-            response = await session.post(
-                f"{self._get_url()}/inference/",
-                json=inference_params.model_dump(),
-            )
-            data = await self._proceed_response(response)
-            inference = Inference.model_validate(data)
+        """
+        With ``wait_for_response=False`` the created ``Inference`` is returned
+        without polling, or the ``InferenceHistoricalResult`` itself when the
+        result cache has it
+        """
+        started = time.monotonic()
+        key, inference = await self._submit_inference(inference_params)
+        if not wait_for_response or isinstance(inference, InferenceHistoricalResult):
+            return inference
 
-            if not wait_for_response:
-                return inference
+        inference_result = await self._wait_for_inference(
+            inference,
+            polling_strategy or PollingStrategy(),
+            started,
+        )
+        await self._store_result(key, inference_result)
+        return inference_result
 
-            while True:
-                await asyncio.sleep(5)
+    async def _submit_inference(
+        self,
+        inference_params: CreateInferenceParams,
+    ) -> Tuple[Union[str, None], Union[InferenceHistoricalResult, Inference]]:
+        # The result cache key, and either the cached result or the
+        # submitted inference
+        key = await self._result_key(inference_params)
+        if key is not None:
+            inference_result = await self._cached_result(key)
+            if inference_result is not None:
+                return key, inference_result
+
+        data = await self._request(
+            "POST",
+            "/inference/",
+            data=inference_params.model_dump_json(),
+        )
+        return key, self._validate(Inference, data)
+
+    async def _result_key(
+        self,
+        inference_params: CreateInferenceParams,
+    ) -> Union[str, None]:
+        # Only seeded inferences are deterministic. The key includes the
+        # active version of the model, so a new version invalidates it.
+        if self._result_cache is None or inference_params.seed is None:
+            return None
+
+        try:
+            item = await self.fetch_metadata_item(inference_params.modelId)
+        except (ClientError, web_exceptions.HTTPException):
+            return None
+        return result_key(inference_params, item.activeVersionId)
+
+    async def _cached_result(self, key: str) -> Union[InferenceHistoricalResult, None]:
+        entry = await self._result_cache.get(key)
+        if entry is None or entry.age >= self._result_cache.ttl:
+            return None
+        return entry.model(InferenceHistoricalResult, self._validate)
+
+    async def _store_result(
+        self,
+        key: Union[str, None],
+        inference_result: InferenceHistoricalResult,
+    ) -> None:
+        if key is not None and inference_result.status == InferenceStatus.COMPLETED:
+            data = inference_result.model_dump_json().encode()
+            await self._result_cache.set(key, CacheEntry(data))
 
+    async def _queued_ahead(self) -> int:
+        # Our own inferences that are still polling are queued in front
+        ahead = self._pending_inferences
+        if ahead == 0:
+            return 0
+
+        if self._max_queue_depth is None:
+            self._max_queue_depth = await self.fetch_max_queue_depth()
+        return queued_ahead(ahead, self._max_queue_depth)
+
+    async def _await_webhook(self, inference: Inference, timeout: float) -> None:
+        # Sleep for ``timeout`` unless a webhook about the inference comes
+        # first. The endpoint is unauthenticated, so the event only wakes us
+        # up: the result always comes from the API.
+        receiver = self._webhook_receiver
+        if receiver is None:
+            await asyncio.sleep(timeout)
+            return
+
+        event = receiver.register(inference.inferenceId)
+        await asyncio.wait({event}, timeout=timeout)
+
+    async def _wait_for_inference(
+        self,
+        inference: Inference,
+        polling_strategy: PollingStrategy,
+        started: float,
+    ) -> InferenceHistoricalResult:
+        receiver = self._webhook_receiver
+        if receiver is not None:
+            receiver.register(inference.inferenceId)
+
+        ahead = await self._queued_ahead()
+        self._pending_inferences += 1
+        try:
+            elapsed = time.monotonic() - started
+            delays = polling_strategy.delays(ahead, elapsed)
+            deadline = polling_strategy.deadline(elapsed)
+            if receiver is not None:
+                # Rely on the webhook until it is late, then poll as usual;
+                # the wait counts against the polling timeout
+                wait = receiver.fallback_after
+                if deadline is not None:
+                    wait = min(wait, max(deadline - time.monotonic(), 0.0))
+                delays = itertools.chain([wait], delays)
+
+            inference_result = None
+            while not self._is_finished(inference_result):
+                delay = next(delays, None)
+                if delay is None:
+                    raise polling_strategy.timeout_error(inference.inferenceId)
+
+                await self._await_webhook(inference, delay)
                 inference_result = await self.fetch_inference(inference.inferenceId)
-                if inference_result is None:
-                    continue
+        finally:
+            self._pending_inferences -= 1
+            if receiver is not None:
+                receiver.unregister(inference.inferenceId)
 
-                if inference_result.status in (
-                    InferenceStatus.FAILED,
-                    InferenceStatus.COMPLETED,
-                ):
-                    return inference_result
+        polling_strategy.observe(
+            inference,
+            inference_result,
+            time.monotonic() - started,
+        )
+        return inference_result
+
+    @staticmethod
+    def _is_finished(inference_result: Union[InferenceHistoricalResult, None]) -> bool:
+        return inference_result is not None and inference_result.status in (
+            InferenceStatus.FAILED,
+            InferenceStatus.COMPLETED,
+        )
+
+    @token_required
+    async def create_inferences(
+        self,
+        inference_params: Iterable[CreateInferenceParams],
+        concurrency: Union[int, None] = None,
+        polling_strategy: Union[PollingStrategy, None] = None,
+        on_error: Union[ErrorCallback, None] = None,
+    ) -> AsyncIterator[InferenceHistoricalResult]:
+        """
+        Submit many inferences and yield their results as they complete.
+
+        An inference that can't be submitted or polled is passed to
+        ``on_error(params, exc)`` and the others go on; without a callback
+        the first such error is raised after the last result.
+        """
+        if self._max_queue_depth is None:
+            self._max_queue_depth = await self.fetch_max_queue_depth()
+
+        limit = max(self._max_queue_depth, 1)
+        if concurrency is not None:
+            limit = min(limit, concurrency)
+
+        poller = BatchPoller(
+            self, polling_strategy or PollingStrategy(), limit, on_error
+        )
+        async for inference_result in poller.run(inference_params):
+            yield inference_result
 
     @token_required
     async def fetch_max_queue_depth(self) -> int:
-        async with self._resolve_session() as session:
-            response = await session.get(f"{self._get_url()}/max_queue_depth")
-            data = await self._proceed_response(response)
-            return data
+        return self._loads(await self._request("GET", "/max_queue_depth"))
 
     async def fetch_models(
         self,
@@ -172,21 +691,45 @@ class ClientAPI:
         nsfw: bool = False,
         current_page: int = 1,
         page_size: int = 10,
+        fields: Union[Sequence[str], None] = None,
     ) -> Models:
-        async with self._resolve_session() as session:
-            response = await session.get(
-                f"{self._get_url()}/models/models",
-                params={
-                    "searchQuery": query,
-                    "modelType": model_types,
-                    "sortBy": sort_by,
-                    "nsfw": str(nsfw),
-                    "current_page": current_page,
-                    "page_size": page_size,
-                },
-            )
-            data = await self._proceed_response(response)
-            return Models.model_validate(data)
+        """
+        With ``fields``, items are named tuples holding only those fields
+        """
+        return await self._fetch(
+            Models if fields is None else projection(Models, tuple(fields)),
+            "/models/models",
+            params={
+                "searchQuery": query,
+                "modelType": model_types,
+                "sortBy": sort_by,
+                "nsfw": str(nsfw),
+                "current_page": current_page,
+                "page_size": page_size,
+            },
+            cached=True,
+        )
+
+    async def iter_models(
+        self,
+        query: str = "",
+        model_types: List[CivitAiModelType] = ["Checkpoint"],
+        sort_by: CivitAiSortByType = "Highest Rated",
+        nsfw: bool = False,
+        page_size: int = 100,
+        concurrency: int = 4,
+        fields: Union[Sequence[str], None] = None,
+    ) -> AsyncIterator[Model]:
+        async for item in paginate(
+            lambda page: self.fetch_models(
+                query, model_types, sort_by, nsfw, page, page_size, fields
+            ),
+            first_page=1,
+            page_size=page_size,
+            total_pages=models_total_pages,
+            concurrency=concurrency,
+        ):
+            yield item
 
     async def fetch_metadata_items(
         self,
@@ -199,46 +742,82 @@ class ClientAPI:
         model_types: List[CivitAiModelType] = ["Checkpoint"],
         base_models: List[CivitAiBaseModelType] = [],
         user: Union[str, None] = None,
+        fields: Union[Sequence[str], None] = None,
     ) -> MetadataItems:
-        async with self._resolve_session() as session:
-            params = {
-                "search": query,
-                "sortBy": sort_by,
-                "nsfw": str(nsfw),
-                "currentPage": current_page,
-                "pageSize": page_size,
-                "downloadStatus": download_status,
-                "modelType": model_types,
-                "baseModel": base_models,
-            }
-            if user is not None:
-                params["user"] = user
-
-            response = await session.get(
-                f"{self._get_url()}/models/metadata-items",
-                params=params,
-            )
-            data = await self._proceed_response(response)
-            return MetadataItems.model_validate(data)
+        """
+        With ``fields``, items are named tuples holding only those fields
+        """
+        params = {
+            "search": query,
+            "sortBy": sort_by,
+            "nsfw": str(nsfw),
+            "currentPage": current_page,
+            "pageSize": page_size,
+            "downloadStatus": download_status,
+            "modelType": model_types,
+            "baseModel": base_models,
+        }
+        if user is not None:
+            params["user"] = user
+
+        return await self._fetch(
+            (
+                MetadataItems
+                if fields is None
+                else projection(MetadataItems, tuple(fields))
+            ),
+            "/models/metadata-items",
+            params=params,
+            cached=True,
+        )
+
+    async def iter_metadata_items(
+        self,
+        query: str = "",
+        sort_by: CivitAiSortByType = "Highest Rated",
+        nsfw: bool = False,
+        page_size: int = 100,
+        download_status: DownloadStatus = "COMPLETED",
+        model_types: List[CivitAiModelType] = ["Checkpoint"],
+        base_models: List[CivitAiBaseModelType] = [],
+        user: Union[str, None] = None,
+        concurrency: int = 4,
+        fields: Union[Sequence[str], None] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[MetadataItem]:
+        async for item in paginate(
+            lambda page: self.fetch_metadata_items(
+                query,
+                sort_by,
+                nsfw,
+                page,
+                page_size,
+                download_status,
+                model_types,
+                base_models,
+                user,
+                fields,
+            ),
+            first_page=1,
+            page_size=page_size,
+            total_pages=lambda page: range_total_pages(page.paginationMetadata),
+            concurrency=concurrency,
+            prefetch=prefetch,
+        ):
+            yield item
 
     async def fetch_metadata_item(
         self,
         model_metadata_id: str,
     ) -> MetadataItem:
-        async with self._resolve_session() as session:
-            response = await session.get(
-                f"{self._get_url()}/models/metadata-items/{model_metadata_id}",
-            )
-            data = await self._proceed_response(response)
-            return MetadataItem.model_validate(data)
+        return await self._fetch(
+            MetadataItem,
+            f"/models/metadata-items/{model_metadata_id}",
+            cached=True,
+        )
 
     async def fetch_inference_result_by_image_id(
         self,
         image_uuid: str,
     ) -> InferenceHistoricalResult:
-        async with self._resolve_session() as session:
-            response = await session.get(
-                f"{self._get_url()}/images/{image_uuid}",
-            )
-            data = await self._proceed_response(response)
-            return InferenceHistoricalResult.model_validate(data)
+        return await self._fetch(InferenceHistoricalResult, f"/images/{image_uuid}")
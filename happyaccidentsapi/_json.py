@@ -0,0 +1,20 @@
+import json
+from typing import Any, Callable, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+__all__ = []
+
+JSONLoads = Callable[[Union[bytes, str]], Any]
+
+
+def default_loads() -> JSONLoads:
+    """
+    orjson when it is installed (``happyaccidentsapi[speedups]``), else json
+    """
+    if orjson is not None:
+        return orjson.loads
+    return json.loads
@@ -0,0 +1,316 @@
+import asyncio
+import csv
+import json
+from array import array
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Optional, Sequence, Union
+
+from .errors import TokenRequired
+from .models import RangePaginationMetadata
+from .pagination import paginate, range_total_pages
+
+__all__ = [
+    "export_history",
+    "iter_history",
+    "read_history",
+]
+
+# Columns of an exported history row and their Arrow types
+COLUMNS = {
+    "inferenceId": "string",
+    "userId": "string",
+    "status": "string",
+    "inferenceType": "string",
+    "createdAt": "string",
+    "completedAt": "string",
+    "modelId": "string",
+    "prompt": "string",
+    "negativePrompt": "string",
+    "seed": "int64",
+    "outputWpx": "int64",
+    "outputHpx": "int64",
+    "numInferenceSteps": "int64",
+    "guidanceScale": "float64",
+    "samplingMethod": "string",
+    "images": "string",
+}
+PAYLOAD_COLUMNS = (
+    "modelId",
+    "prompt",
+    "negativePrompt",
+    "seed",
+    "outputWpx",
+    "outputHpx",
+    "numInferenceSteps",
+    "guidanceScale",
+    "samplingMethod",
+)
+TYPECODES = {"int64": "q", "float64": "d"}
+
+FORMATS = {
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:  # pragma: no cover
+        raise ImportError("Parquet and Arrow files require pyarrow") from exc
+    return pyarrow
+
+
+def _format(path: Path, format: Optional[str]) -> str:
+    format = format or FORMATS.get(path.suffix.lower())
+    if format not in FORMATS.values():
+        raise ValueError(f"Unknown history format for {path.name}: {format!r}")
+    return format
+
+
+def _parse(kind: str, value: str) -> Any:
+    if kind == "string":
+        return value
+    if not value:
+        return None
+    return int(value) if kind == "int64" else float(value)
+
+
+def _row(item: Dict[str, Any]) -> Dict[str, Any]:
+    payload = item.get("inferencePayload") or {}
+    row = {name: item.get(name) for name in COLUMNS if name not in PAYLOAD_COLUMNS}
+    row.update({name: payload.get(name) for name in PAYLOAD_COLUMNS})
+    row["images"] = " ".join(
+        f"{image['folderPath']}/{image['filename']}" for image in item["images"]
+    )
+    return row
+
+
+class _ColumnBuffer:
+    """
+    One page of rows stored column by column; numbers live in typed arrays
+    with a validity byte per row instead of Python objects
+    """
+
+    def __init__(self) -> None:
+        self.columns: Dict[str, Any] = {}
+        self.valid: Dict[str, bytearray] = {}
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self.columns["inferenceId"])
+
+    def clear(self) -> None:
+        for name, kind in COLUMNS.items():
+            if kind in TYPECODES:
+                self.columns[name] = array(TYPECODES[kind])
+                self.valid[name] = bytearray()
+            else:
+                self.columns[name] = []
+
+    def append(self, row: Dict[str, Any]) -> None:
+        for name, values in self.columns.items():
+            value = row[name]
+            if name in self.valid:
+                self.valid[name].append(value is not None)
+                value = 0 if value is None else value
+            values.append(value)
+
+    def value(self, name: str, index: int) -> Any:
+        if name in self.valid and not self.valid[name][index]:
+            return None
+        return self.columns[name][index]
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield {name: self.value(name, index) for name in COLUMNS}
+
+    def record_batch(self) -> Any:
+        pa = _pyarrow()
+        arrays = []
+        for name, kind in COLUMNS.items():
+            values = self.columns[name]
+            if name in self.valid:
+                # Typed arrays are handed to Arrow through the buffer protocol,
+                # the validity bytes become its null bitmap
+                bitmap = pa.array(self.valid[name], pa.uint8()).cast(pa.bool_())
+                values = pa.Array.from_buffers(
+                    getattr(pa, kind)(),
+                    len(values),
+                    [bitmap.buffers()[1], pa.py_buffer(values)],
+                )
+            else:
+                values = pa.array(values, pa.string())
+            arrays.append(values)
+        return pa.RecordBatch.from_arrays(arrays, names=list(COLUMNS))
+
+
+class _NdjsonWriter:
+    def __init__(self, path: Path) -> None:
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, buffer: _ColumnBuffer) -> None:
+        self._file.writelines(
+            json.dumps(row, ensure_ascii=False) + "\n" for row in buffer.rows()
+        )
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _CsvWriter:
+    def __init__(self, path: Path) -> None:
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=list(COLUMNS))
+        self._writer.writeheader()
+
+    def write(self, buffer: _ColumnBuffer) -> None:
+        self._writer.writerows(buffer.rows())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ArrowWriter:
+    def __init__(self, path: Path, format: str) -> None:
+        pa = _pyarrow()
+        self._format = format
+        self._schema = pa.schema(
+            [(name, getattr(pa, kind)()) for name, kind in COLUMNS.items()]
+        )
+        if format == "parquet":
+            import pyarrow.parquet
+
+            self._writer = pyarrow.parquet.ParquetWriter(str(path), self._schema)
+        else:
+            import pyarrow.ipc
+
+            self._writer = pyarrow.ipc.new_file(str(path), self._schema)
+
+    def write(self, buffer: _ColumnBuffer) -> None:
+        batch = buffer.record_batch()
+        if self._format == "parquet":
+            self._writer.write_batch(batch)
+        else:
+            self._writer.write(batch)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def _writer(path: Path, format: str) -> Any:
+    if format == "ndjson":
+        return _NdjsonWriter(path)
+    if format == "csv":
+        return _CsvWriter(path)
+    return _ArrowWriter(path, format)
+
+
+async def export_history(
+    client: Any,
+    destination: Union[str, Path],
+    format: Optional[str] = None,
+    page_size: int = 100,
+    concurrency: int = 4,
+) -> int:
+    """
+    Write the whole inference history of the account to an NDJSON, CSV,
+    Parquet or Arrow file, page by page; returns the number of rows.
+
+    Pages are decoded to plain dicts and flattened to one row per inference
+    (prompt, seed, model, ...) without building pydantic models, so memory
+    stays flat however long the history is. The format defaults to the one
+    of the file suffix; Parquet and Arrow require ``pyarrow``.
+    """
+    if client._token is None:
+        raise TokenRequired("This function need a token.")
+
+    destination = Path(destination)
+    format = _format(destination, format)
+
+    async def fetch_page(page: int) -> SimpleNamespace:
+        data = client._loads(
+            await client._request(
+                "GET",
+                "/inferences/",
+                params={"current_page": page, "page_size": page_size},
+            )
+        )
+        metadata = RangePaginationMetadata.model_validate(data["paginationMetadata"])
+        return SimpleNamespace(items=data["items"], metadata=metadata)
+
+    loop = asyncio.get_running_loop()
+    writer = await loop.run_in_executor(None, _writer, destination, format)
+    buffer = _ColumnBuffer()
+    rows = 0
+    try:
+        async for item in paginate(
+            fetch_page,
+            first_page=0,
+            page_size=page_size,
+            total_pages=lambda page: range_total_pages(page.metadata),
+            concurrency=concurrency,
+        ):
+            buffer.append(_row(item))
+            if len(buffer) >= page_size:
+                # Encoding and disk I/O overlap with fetching the next pages
+                await loop.run_in_executor(None, writer.write, buffer)
+                rows += len(buffer)
+                buffer.clear()
+
+        if len(buffer):
+            await loop.run_in_executor(None, writer.write, buffer)
+            rows += len(buffer)
+    finally:
+        await loop.run_in_executor(None, writer.close)
+
+    return rows
+
+
+def iter_history(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the rows of an NDJSON or CSV history file
+    """
+    path = Path(path)
+    format = _format(path, None)
+    if format not in ("ndjson", "csv"):
+        raise ValueError("iter_history reads NDJSON and CSV files, use read_history")
+
+    with open(path, encoding="utf-8", newline="") as file:
+        if format == "ndjson":
+            for line in file:
+                yield json.loads(line)
+            return
+
+        for row in csv.DictReader(file):
+            yield {name: _parse(kind, row[name]) for name, kind in COLUMNS.items()}
+
+
+def read_history(
+    path: Union[str, Path],
+    columns: Optional[Sequence[str]] = None,
+) -> Any:
+    """
+    Load a Parquet or Arrow history file as a ``pyarrow.Table``.
+
+    Arrow files are memory-mapped, so the table references the file pages
+    directly and only the columns that are used are ever read from disk.
+    """
+    pa = _pyarrow()
+    path = Path(path)
+    format = _format(path, None)
+    if format == "parquet":
+        import pyarrow.parquet
+
+        return pyarrow.parquet.read_table(str(path), columns=columns, memory_map=True)
+    if format == "arrow":
+        import pyarrow.ipc
+
+        table = pyarrow.ipc.open_file(pa.memory_map(str(path))).read_all()
+        return table.select(list(columns)) if columns else table
+    raise ValueError("read_history reads Parquet and Arrow files, use iter_history")
@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Union
+
+__all__ = [
+    "CacheEntry",
+    "MemoryCache",
+    "ResponseCache",
+    "SqliteCache",
+]
+
+
+def cache_key(
+    method: str,
+    path: str,
+    params: Optional[Mapping[str, Any]] = None,
+    token: Optional[str] = None,
+) -> str:
+    def normalize(value: Any) -> Any:
+        if isinstance(value, Enum):
+            return value.value
+        if isinstance(value, (list, tuple)):
+            return [normalize(item) for item in value]
+        return value
+
+    params = {key: normalize(value) for key, value in (params or {}).items()}
+    key = f"{method.upper()} {path} {json.dumps(params, sort_keys=True)}"
+    if token is not None:
+        # Responses may depend on the account, never store the token itself
+        key = f"{hashlib.sha256(token.encode()).hexdigest()[:16]} {key}"
+    return key
+
+
+def result_key(inference_params: Any, model_version: Optional[str] = None) -> str:
+    """
+    Content address of an inference: the hash of its canonical parameters and
+    of the model version they run on
+    """
+    params = json.dumps(
+        inference_params.model_dump(mode="json", warnings=False),
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(f"{model_version} {params}".encode()).hexdigest()
+
+
+class CacheEntry:
+    """
+    Cached response body with the validators needed to revalidate it
+    """
+
+    __slots__ = ("data", "etag", "last_modified", "stored_at", "_models")
+
+    def __init__(
+        self,
+        data: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        stored_at: Optional[float] = None,
+    ) -> None:
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = time.time() if stored_at is None else stored_at
+        self._models: Dict[type, Any] = {}
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def model(self, model: type, validate: Callable[[type, Any], Any]) -> Any:
+        # Entries kept in memory validate their payload only once; the
+        # returned model is shared between callers and must be treated as
+        # read-only
+        if model not in self._models:
+            self._models[model] = validate(model, self.data)
+        return self._models[model]
+
+
+class ResponseCache:
+    """
+    Base class of ``ClientAPI`` response caches.
+
+    Entries older than ``ttl`` seconds are revalidated with the server using
+    ``If-None-Match`` / ``If-Modified-Since`` before they are used again.
+    """
+
+    def __init__(self, ttl: float = 300.0, maxsize: int = 1024) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCache(ResponseCache):
+    def __init__(self, ttl: float = 300.0, maxsize: int = 1024) -> None:
+        super().__init__(ttl, maxsize)
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class SqliteCache(ResponseCache):
+    """
+    On-disk cache shared between processes, storing raw response bodies.
+    Queries run in the default executor so the event loop is never blocked
+    on disk I/O.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        ttl: float = 300.0,
+        maxsize: int = 10000,
+    ) -> None:
+        super().__init__(ttl, maxsize)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, data BLOB NOT NULL, etag TEXT, "
+                "last_modified TEXT, stored_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at "
+                "ON responses (accessed_at)"
+            )
+
+    async def _run(self, func: Callable, *args) -> Any:
+        def locked():
+            with self._lock, self._db:
+                return func(*args)
+
+        return await asyncio.get_running_loop().run_in_executor(None, locked)
+
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        row = self._db.execute(
+            "SELECT data, etag, last_modified, stored_at FROM responses WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        self._db.execute(
+            "UPDATE responses SET accessed_at = ? WHERE key = ?",
+            (time.time(), key),
+        )
+        return CacheEntry(*row)
+
+    def _set(self, key: str, entry: CacheEntry) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                entry.data,
+                entry.etag,
+                entry.last_modified,
+                entry.stored_at,
+                time.time(),
+            ),
+        )
+        self._db.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+            "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.maxsize,),
+        )
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        return await self._run(self._get, key)
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        await self._run(self._set, key, entry)
+
+    async def delete(self, key: str) -> None:
+        await self._run(self._db.execute, "DELETE FROM responses WHERE key = ?", (key,))
+
+    async def clear(self) -> None:
+        await self._run(self._db.execute, "DELETE FROM responses")
+
+    def close(self) -> None:
+        self._db.close()
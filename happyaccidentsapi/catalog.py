@@ -0,0 +1,294 @@
+import asyncio
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+from .enums import (
+    CivitAiBaseModelType,
+    CivitAiModelType,
+    CivitAiSortByType,
+    DownloadStatus,
+)
+from .models import MetadataItem
+
+__all__ = [
+    "ModelCatalog",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    base_models TEXT NOT NULL,
+    nsfw INTEGER NOT NULL,
+    download_status TEXT NOT NULL,
+    created_at TEXT,
+    data BLOB NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS models_fts USING fts5(
+    id UNINDEXED, name, author, tags, trained_words, description
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    key TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reconciled (
+    key TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+def _value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def _match_query(query: str) -> str:
+    # Every word must match as a prefix; quoting keeps FTS syntax inert
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class ModelCatalog:
+    """
+    Local full-text index of metadata items, kept in sync with the API.
+
+    Lookups with ``find_model`` / ``search`` never touch the network.
+    ``sync`` pages through the newest items and stops at the first one
+    already seen, so refreshes usually fetch a single page. Edits and
+    deletions of older items only show up in a full walk, which ``sync``
+    runs every ``reconcile_after`` seconds.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:") -> None:
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._items: Dict[str, MetadataItem] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM models").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _cursor(self, key: str) -> Optional[str]:
+        row = self._db.execute(
+            "SELECT created_at FROM cursors WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _reconcile_due(self, key: str, reconcile_after: Optional[float]) -> bool:
+        if reconcile_after is None:
+            return False
+        row = self._db.execute(
+            "SELECT synced_at FROM reconciled WHERE key = ?", (key,)
+        ).fetchone()
+        return row is None or time.time() - row[0] >= reconcile_after
+
+    def _drop_unseen(
+        self,
+        key: str,
+        download_status: str,
+        model_types: List[str],
+        seen: Set[str],
+    ) -> None:
+        rows = self._db.execute(
+            "SELECT id FROM models WHERE download_status = ? AND type IN "
+            f"({', '.join('?' * len(model_types))})",
+            (download_status, *model_types),
+        ).fetchall()
+        with self._db:
+            for (item_id,) in rows:
+                if item_id not in seen:
+                    self._delete(item_id)
+            self._db.execute(
+                "INSERT OR REPLACE INTO reconciled VALUES (?, ?)", (key, time.time())
+            )
+
+    def _delete(self, item_id: str) -> None:
+        self._db.execute("DELETE FROM models WHERE id = ?", (item_id,))
+        self._db.execute("DELETE FROM models_fts WHERE id = ?", (item_id,))
+        self._items.pop(item_id, None)
+
+    def upsert(self, item: MetadataItem) -> None:
+        self._delete(item.id)
+        if item.datetimeDeleted is not None:
+            return
+
+        base_models = {version.baseModel for version in item.versionMetadataItems}
+        if item.activeVersion is not None:
+            base_models.add(item.activeVersion.baseModel)
+
+        self._db.execute(
+            "INSERT INTO models VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                item.id,
+                item.name,
+                _value(item.type),
+                "|" + "|".join(sorted(_value(base) for base in base_models)) + "|",
+                int(item.nsfw),
+                _value(item.downloadStatus),
+                item.createdAt.isoformat() if item.createdAt else None,
+                item.model_dump_json(),
+            ),
+        )
+        self._db.execute(
+            "INSERT INTO models_fts VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                item.id,
+                item.name,
+                item.author or "",
+                " ".join(item.tags),
+                " ".join(item.trainedWords),
+                item.description or "",
+            ),
+        )
+
+    async def sync(
+        self,
+        client: Any,
+        download_statuses: Iterable[DownloadStatus] = (DownloadStatus.COMPLETED,),
+        model_types: Iterable[CivitAiModelType] = tuple(CivitAiModelType),
+        full: bool = False,
+        page_size: int = 100,
+        reconcile_after: Optional[float] = 86400.0,
+    ) -> int:
+        """
+        Fetch items created since the last sync; returns how many were seen.
+
+        With ``full``, or when the last full walk is older than
+        ``reconcile_after`` seconds, every item is fetched instead: changed
+        items are updated and items no longer listed are dropped.
+        """
+        seen = 0
+        model_types = [_value(model_type) for model_type in model_types]
+        for status in download_statuses:
+            key = f"{_value(status)}:{','.join(sorted(model_types))}"
+            reconcile = full or self._reconcile_due(key, reconcile_after)
+            cursor = None if reconcile else self._cursor(key)
+            newest = cursor
+            seen_ids: Set[str] = set()
+            batch: List[MetadataItem] = []
+
+            def flush() -> None:
+                # One transaction per page rather than per item
+                with self._db:
+                    for item in batch:
+                        self.upsert(item)
+                batch.clear()
+
+            items = client.iter_metadata_items(
+                sort_by=CivitAiSortByType.NEWEST,
+                nsfw=True,
+                page_size=page_size,
+                download_status=_value(status),
+                model_types=model_types,
+                prefetch=cursor is None,
+            )
+            try:
+                async for item in items:
+                    created_at = item.createdAt.isoformat() if item.createdAt else None
+                    if cursor is not None and created_at and created_at < cursor:
+                        break
+
+                    batch.append(item)
+                    if len(batch) >= page_size:
+                        flush()
+                    seen_ids.add(item.id)
+                    seen += 1
+                    if created_at and (newest is None or created_at > newest):
+                        newest = created_at
+            finally:
+                await items.aclose()
+            flush()
+
+            if reconcile:
+                self._drop_unseen(key, _value(status), model_types, seen_ids)
+            if newest is not None:
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO cursors VALUES (?, ?)", (key, newest)
+                    )
+
+        return seen
+
+    def start_refresh(
+        self,
+        client: Any,
+        interval: float = 600.0,
+        **sync_kwargs,
+    ) -> asyncio.Task:
+        """
+        Keep the catalog current by syncing every ``interval`` seconds
+        """
+
+        async def refresh() -> None:
+            while True:
+                try:
+                    await self.sync(client, **sync_kwargs)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    pass  # keep serving the last good snapshot
+                await asyncio.sleep(interval)
+
+        self.stop_refresh()
+        self._refresh_task = asyncio.ensure_future(refresh())
+        return self._refresh_task
+
+    def stop_refresh(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def _item(self, item_id: str, data: bytes) -> MetadataItem:
+        item = self._items.get(item_id)
+        if item is None:
+            item = self._items[item_id] = MetadataItem.model_validate_json(data)
+        return item
+
+    def search(
+        self,
+        query: str = "",
+        model_type: Optional[CivitAiModelType] = None,
+        base_model: Optional[CivitAiBaseModelType] = None,
+        nsfw: Optional[bool] = None,
+        download_status: Optional[DownloadStatus] = DownloadStatus.COMPLETED,
+        limit: int = 10,
+    ) -> List[MetadataItem]:
+        conditions, params = [], []
+        match = _match_query(query)
+        if match:
+            conditions.append(
+                "models.id IN (SELECT id FROM models_fts WHERE models_fts MATCH ?)"
+            )
+            params.append(match)
+        if model_type is not None:
+            conditions.append("type = ?")
+            params.append(_value(model_type))
+        if base_model is not None:
+            conditions.append("instr(base_models, ?) > 0")
+            params.append(f"|{_value(base_model)}|")
+        if nsfw is not None:
+            conditions.append("nsfw = ?")
+            params.append(int(nsfw))
+        if download_status is not None:
+            conditions.append("download_status = ?")
+            params.append(_value(download_status))
+
+        where = " AND ".join(conditions) or "1"
+        # Exact name matches first, then shorter names
+        rows = self._db.execute(
+            f"SELECT id, data FROM models WHERE {where} "
+            "ORDER BY lower(name) = lower(?) DESC, length(name), name LIMIT ?",
+            (*params, query, limit),
+        ).fetchall()
+        return [self._item(item_id, data) for item_id, data in rows]
+
+    def find_model(self, query: str = "", **filters) -> Optional[MetadataItem]:
+        items = self.search(query, limit=1, **filters)
+        return items[0] if items else None
@@ -61,6 +61,15 @@ class InferenceType(str, Enum):
     CONTROLNET_INPAINTING = "CONTROLNET_INPAINTING"
 
 
+class JobState(str, Enum):
+    QUEUED = "QUEUED"
+    SUBMITTED = "SUBMITTED"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+    EXPIRED = "EXPIRED"
+
+
 class NotificationStatus(str, Enum):
     PENDING = "PENDING"
     APPROVED = "APPROVED"
@@ -1,12 +1,19 @@
-from aiohttp import ClientResponse, web_exceptions
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from aiohttp import ClientResponse
 
 __all__ = [
+    "InferenceTimeout",
+    "PoolExhausted",
     "TokenRequired",
     "TokenValidationError",
 ]
 
 
-def handle_error(response: ClientResponse, data: dict):
+def handle_error(response: "ClientResponse", data: dict):
+    from aiohttp import web_exceptions
+
     base = {
         "headers": response.headers,
         "reason": str(data),
@@ -30,3 +37,11 @@ class TokenRequired(Exception):
 
 class TokenValidationError(Exception):
     pass
+
+
+class InferenceTimeout(Exception):
+    pass
+
+
+class PoolExhausted(Exception):
+    pass
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from aiohttp import ClientSession, TCPConnector
+
+from .models import ImageRecord, InferenceHistoricalResult
+from .throttling import is_transient
+
+__all__ = [
+    "ExportStats",
+    "save_all",
+]
+
+MANIFEST_NAME = ".etags.json"
+
+
+class ExportStats:
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self.downloaded = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes = 0
+        self.started = time.monotonic()
+        self.errors: List[Tuple[ImageRecord, Exception]] = []
+
+    @property
+    def done(self) -> int:
+        return self.downloaded + self.skipped + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.downloaded / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"<ExportStats {self.done}/{self.total} downloaded={self.downloaded} "
+            f"skipped={self.skipped} failed={self.failed} "
+            f"{self.bytes_per_second / 1024:.1f} KiB/s>"
+        )
+
+
+def _load_manifest(directory: Path) -> Dict[str, str]:
+    try:
+        return json.loads((directory / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _dump_manifest(directory: Path, manifest: Dict[str, str]) -> None:
+    path = directory / MANIFEST_NAME
+    partial = path.with_name(path.name + ".part")
+    partial.write_text(json.dumps(manifest))
+    os.replace(partial, path)
+
+
+async def _is_current(
+    session: ClientSession,
+    image: ImageRecord,
+    path: Path,
+    etag: Optional[str],
+) -> bool:
+    if not path.exists():
+        return False
+
+    async with session.head(image.get_url()) as res:
+        if res.status != 200:
+            return False
+        if etag is not None and res.headers.get("ETag") == etag:
+            return True
+        return res.content_length == path.stat().st_size
+
+
+async def save_all(
+    results: Iterable[InferenceHistoricalResult],
+    directory: Union[str, Path],
+    concurrency: int = 8,
+    retries: int = 3,
+    chunk_size: int = 64 * 1024,
+    progress: Optional[Callable[[ExportStats], Any]] = None,
+) -> ExportStats:
+    """
+    Download every image of ``results`` into ``directory`` in parallel.
+
+    Images already on disk with the same ETag or size are skipped, transient
+    failures are retried with backoff. Failed images are reported in
+    ``ExportStats.errors`` instead of aborting the export.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    images = [image for result in results for image in result.images]
+    manifest = _load_manifest(directory)
+    stats = ExportStats(len(images))
+
+    # Reuse the pool of the client that returned the results when possible
+    client = next((image._client for image in images if image._client), None)
+    own_session = None
+    if client is not None:
+        session = client._resolve_session()
+    else:
+        own_session = session = ClientSession(
+            connector=TCPConnector(limit_per_host=concurrency)
+        )
+
+    slots = asyncio.Semaphore(concurrency)
+
+    async def export(image: ImageRecord) -> None:
+        filename = f"{image.id}-{image.filename}"
+        path = directory / filename
+
+        async with slots:
+            for attempt in range(retries + 1):
+                try:
+                    if await _is_current(session, image, path, manifest.get(filename)):
+                        stats.skipped += 1
+                        break
+
+                    etag = await image._download(path, chunk_size, True, session)
+                    if etag is not None:
+                        manifest[filename] = etag
+                    stats.downloaded += 1
+                    stats.bytes += path.stat().st_size
+                    break
+                except Exception as exc:
+                    if attempt < retries and is_transient(exc):
+                        await asyncio.sleep(2**attempt * random.uniform(0.5, 1.0))
+                        continue
+
+                    stats.failed += 1
+                    stats.errors.append((image, exc))
+                    break
+
+        if progress is not None:
+            progress(stats)
+
+    try:
+        await asyncio.gather(*(export(image) for image in images))
+    finally:
+        _dump_manifest(directory, manifest)
+        if own_session is not None:
+            await own_session.close()
+
+    return stats
@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import sqlite3
+from pathlib import Path
+from typing import Any, AsyncIterator, List, Optional, Tuple, Union
+
+from aiohttp import web_exceptions
+
+from .enums import InferenceStatus
+from .models import InferenceHistoricalResult
+
+__all__ = [
+    "HistorySync",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cursors (
+    account TEXT PRIMARY KEY,
+    inference_id TEXT NOT NULL,
+    created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS pending (
+    account TEXT NOT NULL,
+    inference_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (account, inference_id)
+);
+"""
+
+FINISHED = (InferenceStatus.COMPLETED, InferenceStatus.FAILED)
+
+
+def _account(client: Any) -> str:
+    token = client._token or ""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+def _created_at(result: InferenceHistoricalResult) -> Optional[str]:
+    return result.createdAt.isoformat() if result.createdAt else None
+
+
+class HistorySync:
+    """
+    Incremental sync of the inference history of an account.
+
+    ``sync`` yields inferences created since the last sync, and those that
+    were unfinished then and have since completed or failed. It pages only
+    until the newest inference of the previous sync (the cursor), then
+    refreshes the few unfinished ones one by one. The cursor moves once a
+    sync is fully consumed, so an interrupted sync is repeated.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:") -> None:
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def cursor(self, client: Any) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        ``(inferenceId, createdAt)`` of the newest inference synced so far
+        """
+        row = self._db.execute(
+            "SELECT inference_id, created_at FROM cursors WHERE account = ?",
+            (_account(client),),
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def _pending(self, account: str) -> List[Tuple[str, str]]:
+        return self._db.execute(
+            "SELECT inference_id, status FROM pending WHERE account = ?", (account,)
+        ).fetchall()
+
+    def _untrack(self, account: str, inference_id: str) -> None:
+        with self._db:
+            self._db.execute(
+                "DELETE FROM pending WHERE account = ? AND inference_id = ?",
+                (account, inference_id),
+            )
+
+    def _track(self, account: str, result: InferenceHistoricalResult) -> None:
+        if result.status in FINISHED:
+            self._untrack(account, str(result.inferenceId))
+            return
+
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pending VALUES (?, ?, ?)",
+                (account, str(result.inferenceId), result.status.value),
+            )
+
+    def _is_synced(
+        self,
+        result: InferenceHistoricalResult,
+        cursor: Optional[Tuple[str, Optional[str]]],
+    ) -> bool:
+        if cursor is None:
+            return False
+        inference_id, created_at = cursor
+        if str(result.inferenceId) == inference_id:
+            return True
+        created = _created_at(result)
+        return created is not None and created_at is not None and created < created_at
+
+    async def sync(
+        self,
+        client: Any,
+        page_size: int = 100,
+        concurrency: int = 4,
+    ) -> AsyncIterator[InferenceHistoricalResult]:
+        account = _account(client)
+        cursor = self.cursor(client)
+        newest = None
+        seen = set()
+
+        # New inferences, newest first, up to the cursor
+        # Past the first sync, stop at the cursor without fetching ahead
+        results = client.iter_inferences(
+            page_size=page_size,
+            concurrency=concurrency,
+            prefetch=cursor is None,
+        )
+        try:
+            async for result in results:
+                if self._is_synced(result, cursor):
+                    break
+
+                newest = newest or result
+                seen.add(str(result.inferenceId))
+                yield result
+                self._track(account, result)
+        finally:
+            await results.aclose()
+
+        # Inferences that were unfinished at the previous sync
+        pending = dict(row for row in self._pending(account) if row[0] not in seen)
+        slots = asyncio.Semaphore(concurrency)
+
+        async def refresh(inference_id: str) -> Optional[InferenceHistoricalResult]:
+            async with slots:
+                try:
+                    return await client.fetch_inference(inference_id)
+                except web_exceptions.HTTPException as exc:
+                    if exc.status != 404:
+                        raise
+            # Deleted since the previous sync: stop tracking it
+            self._untrack(account, inference_id)
+            return None
+
+        tasks = [
+            asyncio.ensure_future(refresh(inference_id)) for inference_id in pending
+        ]
+        try:
+            for future in asyncio.as_completed(tasks):
+                result = await future
+                if result is None:
+                    continue
+                if result.status.value != pending[str(result.inferenceId)]:
+                    yield result
+                    self._track(account, result)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if newest is not None:
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cursors VALUES (?, ?, ?)",
+                    (account, str(newest.inferenceId), _created_at(newest)),
+                )
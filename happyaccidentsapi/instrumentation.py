@@ -0,0 +1,174 @@
+import re
+import time
+from contextvars import ContextVar
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Optional
+
+from aiohttp import ClientSession, TraceConfig
+
+__all__ = [
+    "CallbackSink",
+    "MetricsSink",
+    "OpenTelemetrySink",
+    "PrometheusSink",
+    "RequestTiming",
+]
+
+# Endpoint of the request the current task sent last, so the validation that
+# follows it is reported under the same endpoint
+current_endpoint: ContextVar[Optional[str]] = ContextVar(
+    "happyaccidentsapi_endpoint", default=None
+)
+
+_ID_SEGMENT = re.compile(r"^(?=.*\d)[0-9a-fA-F-]{8,}$|^\d+$")
+
+
+def endpoint_name(method: str, path: str) -> str:
+    """
+    ``GET /inferences/425ef8f4-...`` -> ``GET /inferences/{id}``
+    """
+    segments = ["{id}" if _ID_SEGMENT.match(part) else part for part in path.split("/")]
+    return f"{method.upper()} {'/'.join(segments)}"
+
+
+class RequestTiming:
+    """
+    Phases of one HTTP request, in seconds. ``connect`` includes the TLS
+    handshake; aiohttp does not report it separately.
+    """
+
+    __slots__ = ("endpoint", "status", "phases", "_marks")
+
+    def __init__(self, endpoint: str) -> None:
+        self.endpoint = endpoint
+        self.status: Optional[int] = None
+        self.phases: Dict[str, float] = {}
+        self._marks: Dict[str, float] = {"start": time.perf_counter()}
+
+    def mark(self, name: str) -> None:
+        self._marks[name] = time.perf_counter()
+
+    def phase(self, name: str, since: str) -> None:
+        started = self._marks.get(since)
+        if started is not None:
+            self.phases[name] = time.perf_counter() - started
+
+    def finish(self) -> None:
+        self.phase("total", "start")
+
+
+class MetricsSink:
+    """
+    Receives request phase timings from ``ClientAPI(metrics_sink=...)``
+    """
+
+    def observe(
+        self,
+        endpoint: str,
+        phase: str,
+        seconds: float,
+        status: Optional[int] = None,
+    ) -> None:
+        raise NotImplementedError
+
+    def record(self, timing: RequestTiming) -> None:
+        for phase, seconds in timing.phases.items():
+            self.observe(timing.endpoint, phase, seconds, timing.status)
+
+
+class CallbackSink(MetricsSink):
+    def __init__(self, callback: Callable[[str, str, float, Optional[int]], Any]):
+        self.callback = callback
+
+    def observe(self, endpoint, phase, seconds, status=None) -> None:
+        self.callback(endpoint, phase, seconds, status)
+
+
+class PrometheusSink(MetricsSink):
+    """
+    Histogram ``<namespace>_request_phase_seconds{endpoint, phase}``;
+    requires ``prometheus_client``
+    """
+
+    def __init__(self, registry: Any = None, namespace: str = "happyaccidentsapi"):
+        try:
+            from prometheus_client import REGISTRY, Histogram
+        except ImportError as exc:  # pragma: no cover
+            raise ImportError("PrometheusSink requires prometheus_client") from exc
+
+        self._histogram = Histogram(
+            "request_phase_seconds",
+            "Time spent in each phase of a HappyAccidents API request",
+            ["endpoint", "phase"],
+            namespace=namespace,
+            registry=registry if registry is not None else REGISTRY,
+        )
+
+    def observe(self, endpoint, phase, seconds, status=None) -> None:
+        self._histogram.labels(endpoint=endpoint, phase=phase).observe(seconds)
+
+
+class OpenTelemetrySink(MetricsSink):
+    """
+    Histogram ``happyaccidentsapi.request.phase.duration``; requires
+    ``opentelemetry-api``
+    """
+
+    def __init__(self, meter: Any = None) -> None:
+        try:
+            from opentelemetry import metrics
+        except ImportError as exc:  # pragma: no cover
+            raise ImportError("OpenTelemetrySink requires opentelemetry-api") from exc
+
+        meter = meter if meter is not None else metrics.get_meter("happyaccidentsapi")
+        self._histogram = meter.create_histogram(
+            "happyaccidentsapi.request.phase.duration",
+            unit="s",
+            description="Time spent in each phase of a HappyAccidents API request",
+        )
+
+    def observe(self, endpoint, phase, seconds, status=None) -> None:
+        attributes = {"endpoint": endpoint, "phase": phase}
+        if status is not None:
+            attributes["status"] = status
+        self._histogram.record(seconds, attributes)
+
+
+def _timing(context: SimpleNamespace) -> Optional[RequestTiming]:
+    timing = context.trace_request_ctx
+    return timing if isinstance(timing, RequestTiming) else None
+
+
+def _marker(name: str) -> Callable:
+    async def callback(session: ClientSession, context: SimpleNamespace, params):
+        timing = _timing(context)
+        if timing is not None:
+            timing.mark(name)
+
+    return callback
+
+
+def _phase(name: str, since: str) -> Callable:
+    async def callback(session: ClientSession, context: SimpleNamespace, params):
+        timing = _timing(context)
+        if timing is not None:
+            timing.phase(name, since)
+            timing.mark(name)
+
+    return callback
+
+
+def trace_config() -> TraceConfig:
+    """
+    aiohttp hooks filling the RequestTiming passed as ``trace_request_ctx``
+    """
+    config = TraceConfig()
+    config.on_connection_queued_start.append(_marker("queue_start"))
+    config.on_connection_queued_end.append(_phase("queue", "queue_start"))
+    config.on_dns_resolvehost_start.append(_marker("dns_start"))
+    config.on_dns_resolvehost_end.append(_phase("dns", "dns_start"))
+    config.on_connection_create_start.append(_marker("connect_start"))
+    config.on_connection_create_end.append(_phase("connect", "connect_start"))
+    config.on_request_headers_sent.append(_marker("sent"))
+    config.on_request_end.append(_phase("ttfb", "sent"))
+    return config
@@ -0,0 +1,363 @@
+import asyncio
+import sqlite3
+import time
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, List, Optional, Union
+
+from .enums import InferenceStatus, JobState, QueuePriority
+from .models import CreateInferenceParams, InferenceHistoricalResult
+from .polling import PollingStrategy, _PollSchedule
+from .throttling import is_transient
+
+__all__ = [
+    "Job",
+    "JobQueue",
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    priority INTEGER NOT NULL,
+    params TEXT NOT NULL,
+    state TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    deadline REAL,
+    inference_id TEXT,
+    submitted_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_by_state ON jobs (state, priority, created_at);
+"""
+
+COLUMNS = "id, priority, params, state, deadline, inference_id, result, error"
+
+# Jobs of a lower rank are submitted first
+PRIORITIES = {
+    QueuePriority.ONE_SECOND: 0,
+    QueuePriority.TEN_SECONDS: 1,
+    QueuePriority.ONE_MINUTE: 2,
+    QueuePriority.TEN_MINUTES: 3,
+}
+RANKS = {rank: priority for priority, rank in PRIORITIES.items()}
+
+ACTIVE = (JobState.QUEUED.value, JobState.SUBMITTED.value)
+
+
+class Job:
+    __slots__ = (
+        "id",
+        "params",
+        "priority",
+        "state",
+        "deadline",
+        "inference_id",
+        "result",
+        "error",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        params: CreateInferenceParams,
+        priority: QueuePriority,
+        state: JobState,
+        deadline: Optional[float] = None,
+        inference_id: Optional[str] = None,
+        result: Optional[InferenceHistoricalResult] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        self.id = id
+        self.params = params
+        self.priority = priority
+        self.state = state
+        self.deadline = deadline
+        self.inference_id = inference_id
+        self.result = result
+        self.error = error
+
+    @property
+    def done(self) -> bool:
+        return self.state.value not in ACTIVE
+
+    def __repr__(self) -> str:
+        return f"<Job {self.id} {self.state.value}>"
+
+
+def _job(row: tuple) -> Job:
+    job_id, rank, params, state, deadline, inference_id, result, error = row
+    return Job(
+        job_id,
+        CreateInferenceParams.model_validate_json(params),
+        RANKS[rank],
+        JobState(state),
+        deadline,
+        inference_id,
+        InferenceHistoricalResult.model_validate_json(result) if result else None,
+        error,
+    )
+
+
+class JobQueue:
+    """
+    Durable local queue of inferences, journaled to sqlite.
+
+    ``run`` submits queued jobs by priority (``QueuePriority.ONE_SECOND``
+    first), never more at once than the account's max queue depth, and polls
+    them until they finish. The inferenceId of a job is journaled as soon as
+    it is submitted, so after a restart ``run`` resumes polling it instead of
+    submitting it again. Jobs still queued or polling past their deadline
+    expire; cancelled jobs are no longer submitted or polled.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        polling_strategy: Optional[PollingStrategy] = None,
+        max_in_flight: Optional[int] = None,
+    ) -> None:
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._polling_strategy = polling_strategy or PollingStrategy()
+        self._max_in_flight = max_in_flight
+        self._polls = _PollSchedule(self._polling_strategy)
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM jobs WHERE state IN (?, ?)", ACTIVE
+        ).fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def submit(
+        self,
+        params: CreateInferenceParams,
+        priority: Union[QueuePriority, str] = QueuePriority.ONE_MINUTE,
+        deadline: Optional[float] = None,
+    ) -> str:
+        """
+        Journal a job and return its id; ``deadline`` is in seconds from now
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._db:
+            self._db.execute(
+                "INSERT INTO jobs (id, priority, params, state, created_at, deadline)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    PRIORITIES[QueuePriority(priority)],
+                    params.model_dump_json(warnings=False),
+                    JobState.QUEUED.value,
+                    now,
+                    None if deadline is None else now + deadline,
+                ),
+            )
+        self._wake()
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel an unfinished job. A submitted inference still runs on the
+        server, its result is just no longer polled.
+        """
+        with self._db:
+            cursor = self._db.execute(
+                "UPDATE jobs SET state = ? WHERE id = ? AND state IN (?, ?)",
+                (JobState.CANCELLED.value, job_id, *ACTIVE),
+            )
+        self._polls.discard(job_id)
+        self._wake()
+        return cursor.rowcount > 0
+
+    def get(self, job_id: str) -> Optional[Job]:
+        row = self._db.execute(
+            f"SELECT {COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return _job(row) if row else None
+
+    def jobs(self, state: Optional[JobState] = None) -> List[Job]:
+        query = f"SELECT {COLUMNS} FROM jobs"
+        params: tuple = ()
+        if state is not None:
+            query += " WHERE state = ?"
+            params = (JobState(state).value,)
+        rows = self._db.execute(query + " ORDER BY priority, created_at", params)
+        return [_job(row) for row in rows]
+
+    def _finish(
+        self,
+        job_id: str,
+        state: JobState,
+        result: Optional[InferenceHistoricalResult] = None,
+        error: Optional[str] = None,
+    ) -> Optional[Job]:
+        self._polls.discard(job_id)
+        with self._db:
+            cursor = self._db.execute(
+                "UPDATE jobs SET state = ?, result = ?, error = ?"
+                " WHERE id = ? AND state IN (?, ?)",
+                (
+                    state.value,
+                    None if result is None else result.model_dump_json(warnings=False),
+                    error,
+                    job_id,
+                    *ACTIVE,
+                ),
+            )
+        if cursor.rowcount == 0:  # cancelled meanwhile
+            return None
+
+        self._wake()  # a slot is free for the next queued job
+
+        job = self.get(job_id)
+        job.result = result  # keep the instance bound to the client
+        return job
+
+    def _expire(self) -> List[Job]:
+        rows = self._db.execute(
+            "SELECT id FROM jobs WHERE state IN (?, ?) AND deadline <= ?",
+            (*ACTIVE, time.time()),
+        ).fetchall()
+        expired = [self._finish(job_id, JobState.EXPIRED) for job_id, in rows]
+        return [job for job in expired if job is not None]
+
+    def _in_flight(self) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM jobs WHERE state = ?", (JobState.SUBMITTED.value,)
+        ).fetchone()[0]
+
+    async def _submit(self, client: Any, limit: int) -> List[Job]:
+        rows = self._db.execute(
+            f"SELECT {COLUMNS} FROM jobs WHERE state = ?"
+            " ORDER BY priority, created_at LIMIT ?",
+            (JobState.QUEUED.value, max(limit - self._in_flight(), 0)),
+        ).fetchall()
+        jobs = [_job(row) for row in rows]
+        if not jobs:
+            return []
+
+        async def submit(job: Job) -> Optional[Job]:
+            # Journaled as soon as this one is accepted, so a crash while
+            # other submissions are in flight can't submit it twice
+            try:
+                response = await client.create_inference(
+                    job.params, wait_for_response=False
+                )
+            except Exception as exc:
+                return self._finish(job.id, JobState.FAILED, error=repr(exc))
+            if isinstance(response, InferenceHistoricalResult):  # result cache hit
+                return self._finish(job.id, JobState.COMPLETED, response)
+
+            with self._db:
+                cursor = self._db.execute(
+                    "UPDATE jobs SET state = ?, inference_id = ?, submitted_at = ?"
+                    " WHERE id = ? AND state = ?",
+                    (
+                        JobState.SUBMITTED.value,
+                        str(response.inferenceId),
+                        time.time(),
+                        job.id,
+                        JobState.QUEUED.value,
+                    ),
+                )
+            if cursor.rowcount:
+                self._polls.add(job.id, self._in_flight() - 1)
+            return None
+
+        finished = await asyncio.gather(*(submit(job) for job in jobs))
+        return [job for job in finished if job is not None]
+
+    async def _poll_due(self, client: Any) -> List[Job]:
+        rows = self._db.execute(
+            "SELECT id, inference_id, submitted_at FROM jobs WHERE state = ?",
+            (JobState.SUBMITTED.value,),
+        ).fetchall()
+        inference_ids = {}
+        for job_id, inference_id, submitted_at in rows:
+            inference_ids[job_id] = inference_id
+            if job_id not in self._polls:
+                # Submitted before a restart: poll right away
+                elapsed = max(time.time() - submitted_at, 0.0)
+                self._polls.add(job_id, elapsed=elapsed, immediately=True)
+
+        due = [job_id for job_id in self._polls.due() if job_id in inference_ids]
+        if not due:
+            return []
+
+        results = await asyncio.gather(
+            *(client.fetch_inference(inference_ids[job_id]) for job_id in due),
+            return_exceptions=True,
+        )
+
+        finished = []
+        for job_id, result in zip(due, results):
+            if job_id not in self._polls:
+                continue  # cancelled meanwhile
+            if isinstance(result, Exception) and not is_transient(result):
+                finished.append(
+                    self._finish(job_id, JobState.FAILED, error=repr(result))
+                )
+            elif result is not None and not isinstance(result, Exception):
+                if result.status == InferenceStatus.COMPLETED:
+                    finished.append(self._finish(job_id, JobState.COMPLETED, result))
+                    continue
+                if result.status == InferenceStatus.FAILED:
+                    finished.append(self._finish(job_id, JobState.FAILED, result))
+                    continue
+
+            # Still running, or a transient error: poll again on a later tick
+            if not self._polls.reschedule(job_id):
+                error = str(self._polling_strategy.timeout_error(inference_ids[job_id]))
+                finished.append(self._finish(job_id, JobState.FAILED, error=error))
+        return [job for job in finished if job is not None]
+
+    def _next_wakeup(self) -> Optional[float]:
+        # Seconds until a poll or a deadline is due
+        times = []
+        if len(self._polls):
+            times.append(self._polls.next_due())
+        deadline = self._db.execute(
+            "SELECT MIN(deadline) FROM jobs WHERE state IN (?, ?)", ACTIVE
+        ).fetchone()[0]
+        if deadline is not None:
+            times.append(deadline - time.time())
+        return max(min(times), 0.0) if times else None
+
+    async def run(self, client: Any) -> AsyncIterator[Job]:
+        """
+        Submit and poll jobs until none is left, yielding each one as it
+        finishes, fails or expires
+        """
+        limit = max(await client.fetch_max_queue_depth(), 1)
+        if self._max_in_flight is not None:
+            limit = min(limit, self._max_in_flight)
+
+        self._wakeup = asyncio.Event()
+        try:
+            while True:
+                for job in self._expire():
+                    yield job
+                for job in await self._submit(client, limit):
+                    yield job
+                for job in await self._poll_due(client):
+                    yield job
+                if not len(self):
+                    return
+
+                timeout = self._next_wakeup()
+                if timeout is None or timeout > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                self._wakeup.clear()
+        finally:
+            self._wakeup = None
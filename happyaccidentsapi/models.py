@@ -1,31 +1,50 @@
 from __future__ import annotations
 
+import inspect
+import os
+import re
+from contextlib import asynccontextmanager
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Union
 from uuid import UUID
 
-import aiofiles
-from aiohttp import ClientSession
-from pydantic import AnyUrl, BaseModel, Field, HttpUrl
+from pydantic import (
+    AnyUrl,
+    BaseModel,
+    ConfigDict,
+    Field,
+    HttpUrl,
+    PrivateAttr,
+    ValidationInfo,
+    model_validator,
+)
 
 from .enums import *
 from .errors import handle_error
 
+if TYPE_CHECKING:
+    from aiohttp import ClientResponse, ClientSession
 
-class ModelCreator(BaseModel):
+
+class _Model(BaseModel):
+    # Core schemas are built on first validation instead of at import time
+    model_config = ConfigDict(defer_build=True)
+
+
+class ModelCreator(_Model):
     username: str
     image: Optional[AnyUrl]
 
 
-class ModelFileMetadata(BaseModel):
+class ModelFileMetadata(_Model):
     format: Optional[str] = None
     fp: Optional[str] = None
     size: Optional[str] = None
 
 
-class ModelImage(BaseModel):
+class ModelImage(_Model):
     url: AnyUrl
     nsfw: Union[bool, str]
     width: int
@@ -33,7 +52,7 @@ class ModelImage(BaseModel):
     generationProcess: Optional[str] = None
 
 
-class ModelFile(BaseModel):
+class ModelFile(_Model):
     name: str
     id: int
     sizeKb: float
@@ -47,7 +66,7 @@ class ModelFile(BaseModel):
     metadata: Optional[ModelFileMetadata] = None
 
 
-class ModelVersion(BaseModel):
+class ModelVersion(_Model):
     id: int
     modelId: int
     name: str
@@ -59,7 +78,7 @@ class ModelVersion(BaseModel):
     images: List[ModelImage]
 
 
-class ModelStats(BaseModel):
+class ModelStats(_Model):
     downloadCount: Optional[int] = None
     favoriteCount: Optional[int] = None
     commentCount: Optional[int] = None
@@ -67,7 +86,7 @@ class ModelStats(BaseModel):
     rating: Optional[float] = None
 
 
-class MetadataItemVersion(BaseModel):
+class MetadataItemVersion(_Model):
     name: str
     id: str
     createdAt: Optional[datetime] = None
@@ -80,7 +99,7 @@ class MetadataItemVersion(BaseModel):
     files: List[ModelFile]
 
 
-class MetadataItem(BaseModel):
+class MetadataItem(_Model):
     id: str
     name: str
     activeVersionId: Optional[str] = None
@@ -109,7 +128,7 @@ class MetadataItem(BaseModel):
     datetimeDeleted: Optional[datetime] = None
 
 
-class MetadataItems(BaseModel):
+class MetadataItems(_Model):
     items: List[MetadataItem]
     paginationMetadata: RangePaginationMetadata
 
@@ -117,7 +136,7 @@ class MetadataItems(BaseModel):
         return self.items[0]
 
 
-class Model(BaseModel):
+class Model(_Model):
     id: int
     name: str
     description: str
@@ -133,7 +152,7 @@ class Model(BaseModel):
     tags: List[str]
 
 
-class ModelsMetadata(BaseModel):
+class ModelsMetadata(_Model):
     totalItems: int
     currentPage: int
     pageSize: int
@@ -141,7 +160,7 @@ class ModelsMetadata(BaseModel):
     nextPage: Optional[AnyUrl] = None
 
 
-class Models(BaseModel):
+class Models(_Model):
     items: List[Model]
     metadata: ModelsMetadata
 
@@ -149,19 +168,19 @@ class Models(BaseModel):
         return self.items[0]
 
 
-class CannyEdgesPayload(BaseModel):
+class CannyEdgesPayload(_Model):
     lowThreshold: int = Field(ge=1, le=255, title="Lowthreshold")
     upperThreshold: int = Field(ge=1, le=255, title="Upperthreshold")
 
 
-class Esrgan4xUpscalingParams(BaseModel):
+class Esrgan4xUpscalingParams(_Model):
     parentInferenceId: Optional[str] = Field(None, title="Parentinferenceid")
     imageUrl: str = Field(title="Imageurl")
     scale: Optional[float] = Field(4.0, title="Scale")
     faceEnhance: Optional[bool] = Field(False, title="Faceenhance")
 
 
-class FaceRestoreParams(BaseModel):
+class FaceRestoreParams(_Model):
     parentInferenceId: Optional[str] = Field(None, title="Parentinferenceid")
     imageUrl: str = Field(title="Imageurl")
     fidelity: Optional[float] = Field(0.5, title="Fidelity")
@@ -170,17 +189,17 @@ class FaceRestoreParams(BaseModel):
     upscale: Optional[int] = Field(2, title="Upscale")
 
 
-class HedPayload(BaseModel):
+class HedPayload(_Model):
     scribble: bool = Field(title="Scribble")
 
 
-class HighResFixParams(BaseModel):
+class HighResFixParams(_Model):
     enabled: Optional[bool] = Field(False, title="Enabled")
     imageStrength: Optional[float] = Field(0.2, ge=0.0, le=0.9, title="Imagestrength")
     steps: Optional[int] = Field(25, ge=1, le=75, title="Steps")
 
 
-class ImageRecord(BaseModel):
+class ImageRecord(_Model):
     id: str = Field(title="Id")
     folderPath: str = Field(title="Folderpath")
     filename: str = Field(title="Filename")
@@ -190,100 +209,270 @@ class ImageRecord(BaseModel):
     favorite: bool = Field(title="Favorite")
     nsfw: bool = Field(title="Nsfw")
 
+    _client: Any = PrivateAttr(None)
+
+    @model_validator(mode="after")
+    def _bind_client(self, info: ValidationInfo) -> ImageRecord:
+        # Records returned by a ClientAPI download through its pooled session
+        if info.context:
+            self._client = info.context.get("client")
+        return self
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        # The client holds sessions and tasks of its event loop: not pickled
+        state = super().__getstate__()
+        private = {**state["__pydantic_private__"], "_client": None}
+        return {**state, "__pydantic_private__": private}
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> ImageRecord:
+        # Copies keep downloading through the same client
+        memo = {} if memo is None else memo
+        memo[id(self._client)] = self._client
+        return super().__deepcopy__(memo)
+
+    @asynccontextmanager
+    async def _session(self, session: Optional[ClientSession] = None):
+        if session is not None:
+            yield session
+            return
+
+        if self._client is not None:
+            yield self._client._resolve_session()
+            return
+
+        from aiohttp import ClientSession
+
+        async with ClientSession() as session:
+            yield session
+
+    @asynccontextmanager
+    async def _response(self):
+        async with self._session() as session, session.get(self.get_url()) as res:
+            if not res.status == 200:
+                handle_error(res, await res.json())
+            yield res
+
     @classmethod
-    async def _download_file_bytes_io(
+    async def _stream_to_writer(
         cls,
-        destination: BytesIO,
-        seek: bool,
-        bytes_: bytes,
-    ) -> BytesIO:
-        destination.write(bytes_)
-        destination.flush()
-        if seek is True:
-            destination.seek(0)
-        return destination
+        destination: Any,
+        response: ClientResponse,
+        chunk_size: Optional[int],
+    ) -> int:
+        # Without a chunk size, chunks are forwarded as they arrive
+        if chunk_size is None:
+            chunks = response.content.iter_any()
+        else:
+            chunks = response.content.iter_chunked(chunk_size)
+
+        size = 0
+        async for chunk in chunks:
+            written = destination.write(chunk)
+            if inspect.isawaitable(written):
+                await written
+            size += len(chunk)
+        return size
 
     @classmethod
-    async def _download_file(
+    async def _stream_to_file(
         cls,
-        destination: Union[str, Path],
-        bytes_: bytes,
+        destination: Path,
+        response: ClientResponse,
+        chunk_size: int,
+        append: bool,
     ) -> None:
-        async with aiofiles.open(destination, "wb") as f:
-            await f.write(bytes_)
+        import aiofiles
+
+        async with aiofiles.open(destination, "ab" if append else "wb") as f:
+            await cls._stream_to_writer(f, response, chunk_size)
+
+    @staticmethod
+    def _range_start(response: ClientResponse) -> Optional[int]:
+        match = re.match(r"bytes (\d+)-", response.headers.get("Content-Range", ""))
+        return int(match.group(1)) if match else None
+
+    @staticmethod
+    def _validator(response: ClientResponse) -> Optional[str]:
+        # If-Range needs a strong ETag or a Last-Modified date
+        etag = response.headers.get("ETag")
+        if etag is not None and not etag.startswith("W/"):
+            return etag
+        return response.headers.get("Last-Modified")
+
+    async def _download(
+        self,
+        destination: Path,
+        chunk_size: int,
+        resume: bool,
+        session: Optional[ClientSession] = None,
+    ) -> Optional[str]:
+        # Write next to the destination and rename once complete, so readers
+        # never see a half-written image and an interrupted download resumes.
+        # The validator of the partial file is kept beside it: the rest is
+        # only appended if the image is unchanged (If-Range), otherwise the
+        # server sends it whole and the download starts over.
+        partial = destination.with_name(destination.name + ".part")
+        validator_path = destination.with_name(destination.name + ".part.validator")
+        offset = 0
+        validator = None
+        if resume and partial.exists() and validator_path.exists():
+            offset = partial.stat().st_size
+            validator = validator_path.read_text(encoding="utf-8").strip()
+
+        headers = None
+        if offset and validator:
+            headers = {"Range": f"bytes={offset}-", "If-Range": validator}
+
+        async with self._session(session) as session, session.get(
+            self.get_url(), headers=headers
+        ) as res:
+            if res.status == 416 and headers:
+                partial.unlink()
+                return await self._download(destination, chunk_size, False, session)
+            if res.status not in (200, 206):
+                return handle_error(res, await res.json())
+
+            append = res.status == 206 and headers is not None
+            if append and self._range_start(res) != offset:
+                partial.unlink()
+                return await self._download(destination, chunk_size, False, session)
+
+            if not append:
+                new_validator = self._validator(res)
+                if new_validator is None:
+                    validator_path.unlink(missing_ok=True)
+                else:
+                    validator_path.write_text(new_validator, encoding="utf-8")
+
+            await self._stream_to_file(partial, res, chunk_size, append)
+            etag = res.headers.get("ETag")
+
+        os.replace(partial, destination)
+        validator_path.unlink(missing_ok=True)
+        return etag
 
     async def save(
         self,
-        destination: Optional[Union[BytesIO, Path, str]] = None,
+        destination: Optional[Union[BytesIO, Path, str, Any]] = None,
         seek: bool = True,
+        chunk_size: int = 64 * 1024,
+        resume: bool = True,
     ) -> Optional[BytesIO]:
+        """
+        Download the image to a path or into a writer (BytesIO or any object
+        with a sync or async ``write``), ``chunk_size`` bytes at a time
+        """
         if destination is None:
             destination = BytesIO()
 
-        async with ClientSession() as session:
-            res = await session.get(self.get_url())
-            if not res.status == 200:
-                return handle_error(res, await res.json())
+        if isinstance(destination, (str, Path)):
+            await self._download(Path(destination), chunk_size, resume)
+            return None
+
+        async with self._response() as res:
+            await self._stream_to_writer(destination, res, chunk_size)
+
+        if isinstance(destination, BytesIO):
+            destination.flush()
+            if seek is True:
+                destination.seek(0)
+        return destination
 
-            bytes_ = await res.read()
-            if isinstance(destination, (str, Path)):
-                await self._download_file(destination, bytes_)
-                return None
-            return await self._download_file_bytes_io(destination, seek, bytes_)
+    async def iter_chunks(
+        self, chunk_size: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield the image as it arrives from the CDN, without buffering it
+        """
+        async with self._response() as res:
+            if chunk_size is None:
+                chunks = res.content.iter_any()
+            else:
+                chunks = res.content.iter_chunked(chunk_size)
+            async for chunk in chunks:
+                yield chunk
+
+    async def stream_to(
+        self,
+        writer: Any,
+        request: Any = None,
+        chunk_size: Optional[int] = None,
+    ) -> int:
+        """
+        Forward the image chunk by chunk into an aiohttp ``StreamResponse`` or
+        any object with a sync or async ``write``; returns the bytes written.
+        An unprepared response is prepared for ``request`` with the content
+        type, length and ETag of the image.
+        """
+        async with self._response() as res:
+            if hasattr(writer, "prepare") and not writer.prepared:
+                if request is None:
+                    raise ValueError("request is required to prepare the response")
+
+                writer.content_type = res.content_type
+                if res.content_length is not None and not res.headers.get(
+                    "Content-Encoding"
+                ):
+                    writer.content_length = res.content_length
+                if "ETag" in res.headers:
+                    writer.headers["ETag"] = res.headers["ETag"]
+                await writer.prepare(request)
+
+            return await self._stream_to_writer(writer, res, chunk_size)
 
     def get_url(self) -> HttpUrl:
         return f"https://ik.imagekit.io/hb42m9hh0/{self.folderPath}/{self.filename}"
 
 
-class LoraParams(BaseModel):
+class LoraParams(_Model):
     id: str = Field(title="Id")
     weight: float = Field(ge=0, le=1, title="Weight")
 
 
-class MidasDepthPayload(BaseModel):
+class MidasDepthPayload(_Model):
     surfaceNormalAngleRadians: float = Field(title="Surfacenormalangleradians")
     backgroundThreshold: float = Field(ge=0.0, le=1.0, title="Backgroundthreshold")
     depthAndNormal: bool = Field(title="Depthandnormal")
 
 
-class MlsdPayload(BaseModel):
+class MlsdPayload(_Model):
     valueThreshold: float = Field(ge=0.0, le=2.0, title="Valuethreshold")
     distanceThreshold: float = Field(ge=1, le=20, title="Distancethreshold")
 
 
-class ModelDownloadRequestParams(BaseModel):
+class ModelDownloadRequestParams(_Model):
     externalId: str = Field(title="Externalid")
     modelVersionExternalId: Optional[str] = Field(None, title="Modelversionexternalid")
 
 
-class OpenposePayload(BaseModel):
+class OpenposePayload(_Model):
     includeFace: bool = Field(title="Includeface")
     includeBody: bool = Field(title="Includebody")
     includeHands: bool = Field(title="Includehands")
 
 
-class PreprocessingResult(BaseModel):
+class PreprocessingResult(_Model):
     imageDataUri: str = Field(title="Imagedatauri")
 
 
-class RangePaginationMetadata(BaseModel):
+class RangePaginationMetadata(_Model):
     currentPage: int = Field(title="Currentpage")
     pageSize: int = Field(title="Pagesize")
     totalItems: Optional[int] = Field(None, title="Totalitems")
 
 
-class UpdateImageParams(BaseModel):
+class UpdateImageParams(_Model):
     favorite: Optional[bool] = Field(None, title="Favorite")
     nsfw: Optional[bool] = Field(None, title="Nsfw")
 
 
-class WebhookEvent(BaseModel):
+class WebhookEvent(_Model):
     id: str = Field(title="Id")
     type: str = Field(title="Type")
     data: Optional[Dict[str, Any]] = Field({}, title="Data")
 
 
-class PreprocessingParams(BaseModel):
+class PreprocessingParams(_Model):
     preprocessingTechnique: PreprocessingTechnique  # noqa: F405
     baseImageUrl: Optional[str] = Field(None, title="Baseimageurl")
     preprocessingPayload: Optional[
@@ -307,7 +496,7 @@ class PreprocessingParams(BaseModel):
     preprocessedImageUrl: Optional[str] = Field(None, title="Preprocessedimageurl")
 
 
-class User(BaseModel):
+class User(_Model):
     id: str = Field(title="Id")
     username: Optional[str] = Field(None, title="Username")
     fullName: Optional[str] = Field(None, title="Fullname")
@@ -324,7 +513,7 @@ class User(BaseModel):
     contentDeletedAt: Optional[datetime] = Field(None, title="Contentdeletedat")
 
 
-class CreateInferenceParams(BaseModel):
+class CreateInferenceParams(_Model):
     parentInferenceId: Optional[str] = Field(None, title="Parentinferenceid")
     modelId: str = Field(title="Modelid")
     prompt: str = Field(title="Prompt")
@@ -352,7 +541,7 @@ class CreateInferenceParams(BaseModel):
     highResFix: Optional[HighResFixParams] = None
 
 
-class Inference(BaseModel):
+class Inference(_Model):
     inferenceId: UUID = Field(title="Inferenceid")
     userId: UUID = Field(title="Userid")
     inferenceType: InferenceType  # noqa: F405
@@ -370,7 +559,7 @@ class Inference(BaseModel):
     parentInferenceId: Optional[UUID] = Field(None, title="Parentinferenceid")
 
 
-class InferenceHistoricalResult(BaseModel):
+class InferenceHistoricalResult(_Model):
     inferenceId: UUID = Field(title="Inferenceid")
     userId: UUID = Field(title="Userid")
     inferencePayload: Union[
@@ -382,9 +571,12 @@ class InferenceHistoricalResult(BaseModel):
     status: InferenceStatus  # noqa: F405
     inferenceType: InferenceType  # noqa: F405
     parentInferenceId: Optional[UUID] = Field(None, title="Parentinferenceid")
+    createdAt: Optional[datetime] = Field(None, title="CreatedAt")
+    dequeuedAt: Optional[datetime] = Field(None, title="DequeuedAt")
+    completedAt: Optional[datetime] = Field(None, title="CompletedAt")
 
 
-class UpdateInferenceParams(BaseModel):
+class UpdateInferenceParams(_Model):
     violatesTos: Optional[bool] = Field(None, title="Violatestos")
     status: Optional[InferenceStatus] = None  # noqa: F405
     inferencePayload: Optional[
@@ -392,6 +584,6 @@ class UpdateInferenceParams(BaseModel):
     ] = Field(None, title="Inferencepayload")
 
 
-class ApiPaginatedListResponseInferenceHistoricalResult(BaseModel):
+class ApiPaginatedListResponseInferenceHistoricalResult(_Model):
     items: List[InferenceHistoricalResult] = Field(title="Items")
     paginationMetadata: RangePaginationMetadata
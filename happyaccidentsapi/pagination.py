@@ -0,0 +1,71 @@
+import asyncio
+import math
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Optional
+
+from .models import Models, RangePaginationMetadata
+
+__all__ = []
+
+
+def range_total_pages(metadata: RangePaginationMetadata) -> Optional[int]:
+    if metadata.totalItems is None or metadata.pageSize <= 0:
+        return None
+    return math.ceil(metadata.totalItems / metadata.pageSize)
+
+
+def models_total_pages(page: Models) -> Optional[int]:
+    return page.metadata.totalPages
+
+
+async def paginate(
+    fetch_page: Callable[[int], Awaitable[Any]],
+    first_page: int,
+    page_size: int,
+    total_pages: Callable[[Any], Optional[int]],
+    concurrency: int = 4,
+    prefetch: bool = True,
+) -> AsyncIterator[Any]:
+    """
+    Yield items of every page in order.
+
+    The next page is always fetched while the current one is consumed. Once
+    the first page tells how many pages there are, up to ``concurrency``
+    pages are fetched in parallel. With ``prefetch=False`` a page is only
+    fetched once the previous one is consumed, so a walk that stops early
+    (e.g. at a sync cursor) requests no page it doesn't use.
+    """
+    page = await fetch_page(first_page)
+    total = total_pages(page)
+    last_page = None if total is None else first_page + total - 1
+    window = 1 if last_page is None else max(concurrency, 1)
+
+    next_page = first_page + 1
+    tasks: Deque[asyncio.Future] = deque()
+
+    def fill(window: int) -> None:
+        nonlocal next_page
+        while len(tasks) < window and (last_page is None or next_page <= last_page):
+            tasks.append(asyncio.ensure_future(fetch_page(next_page)))
+            next_page += 1
+
+    try:
+        while True:
+            # Without a known total a short page is the last one
+            done = last_page is None and len(page.items) < page_size
+            if not done and prefetch:
+                fill(window)
+
+            for item in page.items:
+                yield item
+
+            if not done and not prefetch:
+                fill(1)
+
+            if done or not tasks:
+                return
+            page = await tasks.popleft()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
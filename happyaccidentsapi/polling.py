@@ -0,0 +1,459 @@
+import asyncio
+import random
+import time
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from uuid import UUID
+
+from .enums import InferenceStatus
+from .errors import InferenceTimeout
+from .models import CreateInferenceParams, Inference, InferenceHistoricalResult
+from .throttling import is_transient
+
+__all__ = [
+    "CompletionEstimator",
+    "PollingStrategy",
+]
+
+
+def queued_ahead(ahead: int, max_queue_depth: Optional[int]) -> int:
+    """Cap ``ahead`` own inferences by what the server queues at once"""
+    if max_queue_depth is None:
+        return ahead
+    return min(ahead, max(max_queue_depth - 1, 0))
+
+
+def _seconds_between(
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> Optional[float]:
+    if start is None or end is None:
+        return None
+    try:
+        return max((end - start).total_seconds(), 0.0)
+    except TypeError:  # naive and aware timestamps can't be compared
+        return None
+
+
+class CompletionEstimator:
+    """
+    Running estimate (EWMA) of how long an inference waits in the queue
+    and how long it takes to run once dequeued
+    """
+
+    def __init__(
+        self,
+        queue_wait: float = 2.0,
+        run_time: float = 8.0,
+        smoothing: float = 0.3,
+    ) -> None:
+        self.queue_wait = queue_wait
+        self.run_time = run_time
+        self.smoothing = smoothing
+        self.observations = 0
+
+    def _update(self, current: float, value: float) -> float:
+        if self.observations == 0:
+            return value
+        return current + self.smoothing * (value - current)
+
+    def observe(
+        self,
+        total: float,
+        queue_wait: Optional[float] = None,
+        run_time: Optional[float] = None,
+    ) -> None:
+        if queue_wait is None:
+            queue_wait = min(self.queue_wait, total)
+        if run_time is None:
+            run_time = max(total - queue_wait, 0.0)
+
+        self.queue_wait = self._update(self.queue_wait, queue_wait)
+        self.run_time = self._update(self.run_time, run_time)
+        self.observations += 1
+
+    def observe_inference(
+        self,
+        inference: Inference,
+        result: Union[InferenceHistoricalResult, Inference],
+        elapsed: float,
+    ) -> None:
+        created_at = result.createdAt or inference.createdAt
+        queue_wait = _seconds_between(created_at, result.dequeuedAt)
+        run_time = _seconds_between(result.dequeuedAt, result.completedAt)
+        total = _seconds_between(created_at, result.completedAt)
+        self.observe(total if total is not None else elapsed, queue_wait, run_time)
+
+    def estimate(self, ahead: int = 0) -> float:
+        """
+        Expected seconds until completion with ``ahead`` jobs of the same
+        account queued in front of this one
+        """
+        return self.queue_wait + self.run_time * (ahead + 1)
+
+
+default_estimator = CompletionEstimator()
+
+
+class PollingStrategy:
+    """
+    Decides when ``ClientAPI.create_inference`` polls for the result.
+
+    The first poll is scheduled at the estimated completion time, then the
+    delay grows exponentially (with jitter) until ``timeout`` is reached.
+    Completed inferences are fed back into the estimator, which is shared
+    by all strategies in the process unless one is passed explicitly.
+    """
+
+    def __init__(
+        self,
+        min_delay: float = 0.5,
+        max_delay: float = 15.0,
+        factor: float = 1.5,
+        jitter: float = 0.2,
+        timeout: Optional[float] = 600.0,
+        estimator: Optional[CompletionEstimator] = None,
+    ) -> None:
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter = jitter
+        self.timeout = timeout
+        self.estimator = estimator if estimator is not None else default_estimator
+
+    def _clamp(self, delay: float) -> float:
+        return min(max(delay, self.min_delay), self.max_delay)
+
+    def _jittered(self, delay: float) -> float:
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def first_delay(self, ahead: int = 0) -> float:
+        return self._clamp(self.estimator.estimate(ahead))
+
+    def deadline(self, elapsed: float = 0.0) -> Optional[float]:
+        """
+        ``time.monotonic()`` at which polling gives up, ``elapsed`` seconds
+        after the inference was submitted
+        """
+        if self.timeout is None:
+            return None
+        return time.monotonic() + self.timeout - elapsed
+
+    def delays(self, ahead: int = 0, elapsed: float = 0.0) -> Iterator[float]:
+        """
+        Yield the sleep before each poll, stopping once the deadline passed.
+        The deadline is fixed by this call, not by the first ``next()``.
+        """
+        return self._delays(ahead, self.deadline(elapsed))
+
+    def _delays(self, ahead: int, deadline: Optional[float]) -> Iterator[float]:
+        delay = self.first_delay(ahead)
+        backoff = self.min_delay
+        while True:
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                delay = min(delay, remaining)
+
+            yield delay
+
+            delay = self._clamp(self._jittered(backoff))
+            backoff = min(backoff * self.factor, self.max_delay)
+
+    def observe(
+        self,
+        inference: Inference,
+        result: Union[InferenceHistoricalResult, Inference],
+        elapsed: float,
+    ) -> None:
+        self.estimator.observe_inference(inference, result, elapsed)
+
+    def timeout_error(self, inference_id: Any) -> InferenceTimeout:
+        return InferenceTimeout(
+            f"Inference {inference_id} did not finish in {self.timeout} seconds."
+        )
+
+
+class _Poll:
+    __slots__ = ("delays", "due")
+
+    def __init__(self, delays: Iterator[float], due: float) -> None:
+        self.delays = delays
+        self.due = due
+
+
+class _PollSchedule:
+    """
+    When each pending inference is polled next, following the delays of a
+    ``PollingStrategy``. Polls due within ``min_delay`` of each other are
+    due together, so they share one tick.
+    """
+
+    def __init__(self, polling_strategy: PollingStrategy) -> None:
+        self.polling_strategy = polling_strategy
+        self._polls: Dict[Hashable, _Poll] = {}
+
+    def __len__(self) -> int:
+        return len(self._polls)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._polls
+
+    def add(
+        self,
+        key: Hashable,
+        ahead: int = 0,
+        elapsed: float = 0.0,
+        immediately: bool = False,
+    ) -> None:
+        """
+        Schedule the first poll of an inference submitted ``elapsed`` seconds
+        ago, or poll it on the next tick (e.g. after a restart)
+        """
+        poll = _Poll(
+            self.polling_strategy.delays(ahead, elapsed),
+            time.monotonic(),
+        )
+        if not immediately:
+            poll.due += next(poll.delays, 0.0)
+        self._polls[key] = poll
+
+    def reschedule(self, key: Hashable) -> bool:
+        """
+        Schedule the next poll; False, and ``key`` is dropped, once the
+        deadline passed
+        """
+        poll = self._polls[key]
+        delay = next(poll.delays, None)
+        if delay is None:
+            del self._polls[key]
+            return False
+
+        poll.due = time.monotonic() + delay
+        return True
+
+    def discard(self, key: Hashable) -> None:
+        self._polls.pop(key, None)
+
+    def due(self) -> List[Hashable]:
+        horizon = time.monotonic() + self.polling_strategy.min_delay
+        return [key for key, poll in self._polls.items() if poll.due <= horizon]
+
+    def next_due(self) -> Optional[float]:
+        """
+        Seconds until the next poll is due, None when nothing is scheduled
+        """
+        if not self._polls:
+            return None
+        due = min(poll.due for poll in self._polls.values())
+        return max(due - time.monotonic(), 0.0)
+
+
+class _PendingInference:
+    __slots__ = ("params", "inference", "key", "started")
+
+    def __init__(
+        self,
+        params: CreateInferenceParams,
+        inference: Inference,
+        key: Optional[str],
+        started: float,
+    ) -> None:
+        self.params = params
+        self.inference = inference
+        self.key = key
+        self.started = started
+
+
+ErrorCallback = Callable[[CreateInferenceParams, Exception], Any]
+
+
+class BatchPoller:
+    """
+    Submits inferences under a concurrency limit and polls every pending
+    one from a single loop. Inferences that are due within ``min_delay`` of
+    each other are fetched together on the same tick.
+
+    A failed submission or poll only fails its own inference: it is passed
+    to ``on_error``, or, without a callback, the first failure is raised
+    once the rest of the batch is done. Polls failing with a transient error
+    (429, 5xx, connection errors) are retried on a later tick.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        polling_strategy: PollingStrategy,
+        limit: int,
+        on_error: Optional[ErrorCallback] = None,
+    ) -> None:
+        self._client = client
+        self._polling_strategy = polling_strategy
+        self._slots = asyncio.Semaphore(limit)
+        self._on_error = on_error
+        self._errors: List[Exception] = []
+        self._pending: Dict[UUID, _PendingInference] = {}
+        self._polls = _PollSchedule(polling_strategy)
+        self._results: asyncio.Queue = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._submitted_all = False
+
+    async def _create(
+        self,
+        params: CreateInferenceParams,
+    ) -> Tuple[Optional[str], Union[InferenceHistoricalResult, Inference]]:
+        return await self._client._submit_inference(params)
+
+    async def _fetch(self, pending: _PendingInference) -> InferenceHistoricalResult:
+        return await self._client.fetch_inference(pending.inference.inferenceId)
+
+    async def _store(
+        self,
+        pending: _PendingInference,
+        result: InferenceHistoricalResult,
+    ) -> None:
+        await self._client._store_result(pending.key, result)
+
+    def _ahead(self) -> int:
+        # Our own inferences queued in front of the one just submitted
+        return queued_ahead(len(self._pending) - 1, self._client._max_queue_depth)
+
+    def _fail(self, params: CreateInferenceParams, exc: Exception) -> None:
+        if self._on_error is not None:
+            self._on_error(params, exc)
+        else:
+            self._errors.append(exc)
+
+    def _finish(self, pending: _PendingInference, item: Any) -> None:
+        self._pending.pop(pending.inference.inferenceId, None)
+        self._polls.discard(pending.inference.inferenceId)
+        self._slots.release()
+        if isinstance(item, Exception):
+            self._fail(pending.params, item)
+        else:
+            self._results.put_nowait(item)
+
+    async def _submit(self, params_iterable: Iterable[CreateInferenceParams]) -> None:
+        try:
+            for params in params_iterable:
+                await self._slots.acquire()
+                started = time.monotonic()
+                try:
+                    key, inference = await self._create(params)
+                except Exception as exc:
+                    self._slots.release()
+                    self._fail(params, exc)
+                    continue
+
+                if isinstance(inference, InferenceHistoricalResult):
+                    # A hit of the result cache, nothing to poll
+                    self._slots.release()
+                    self._results.put_nowait(inference)
+                    continue
+
+                pending = _PendingInference(params, inference, key, started)
+                self._pending[inference.inferenceId] = pending
+                self._polls.add(
+                    inference.inferenceId,
+                    self._ahead(),
+                    time.monotonic() - started,
+                )
+                self._wakeup.set()
+        except Exception as exc:
+            self._results.put_nowait(exc)
+        finally:
+            self._submitted_all = True
+            self._wakeup.set()
+
+    async def _sleep_until_due(self) -> None:
+        timeout = self._polls.next_due()
+        if timeout == 0:
+            return
+
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _poll_due(self) -> None:
+        due = [self._pending[inference_id] for inference_id in self._polls.due()]
+        if not due:
+            return
+
+        results = await asyncio.gather(
+            *(self._fetch(pending) for pending in due),
+            return_exceptions=True,
+        )
+
+        now = time.monotonic()
+        for pending, result in zip(due, results):
+            if isinstance(result, Exception) and not is_transient(result):
+                self._finish(pending, result)
+            elif isinstance(result, Exception):
+                # Transient error: poll again on a later tick
+                if not self._polls.reschedule(pending.inference.inferenceId):
+                    self._finish(pending, result)
+            elif result is not None and result.status in (
+                InferenceStatus.FAILED,
+                InferenceStatus.COMPLETED,
+            ):
+                self._polling_strategy.observe(
+                    pending.inference,
+                    result,
+                    now - pending.started,
+                )
+                await self._store(pending, result)
+                self._finish(pending, result)
+            elif not self._polls.reschedule(pending.inference.inferenceId):
+                self._finish(
+                    pending,
+                    self._polling_strategy.timeout_error(pending.inference.inferenceId),
+                )
+
+    async def _poll(self) -> None:
+        try:
+            while self._pending or not self._submitted_all:
+                await self._sleep_until_due()
+                await self._poll_due()
+        except Exception as exc:
+            self._results.put_nowait(exc)
+        finally:
+            self._results.put_nowait(None)
+
+    async def run(
+        self,
+        params_iterable: Iterable[CreateInferenceParams],
+    ) -> AsyncIterator[InferenceHistoricalResult]:
+        tasks = [
+            asyncio.ensure_future(self._submit(params_iterable)),
+            asyncio.ensure_future(self._poll()),
+        ]
+        try:
+            while True:
+                item = await self._results.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self._errors:
+            raise self._errors[0]
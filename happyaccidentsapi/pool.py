@@ -0,0 +1,366 @@
+import asyncio
+import inspect
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from uuid import UUID
+
+from aiohttp import web_exceptions
+
+from ._happyaccidentsapi import ClientAPI
+from .errors import PoolExhausted
+from .models import CreateInferenceParams, Inference, InferenceHistoricalResult
+from .polling import (
+    BatchPoller,
+    ErrorCallback,
+    PollingStrategy,
+    _PendingInference,
+    queued_ahead,
+)
+from .throttling import RetryPolicy, parse_retry_after
+
+__all__ = [
+    "ClientPool",
+]
+
+# Errors after which an account takes no new calls; neither was processed,
+# so the call is safe to send to another account
+DRAINING_ERRORS = (
+    web_exceptions.HTTPUnauthorized,
+    web_exceptions.HTTPTooManyRequests,
+)
+
+
+class _Member:
+    __slots__ = ("client", "in_flight", "drained_until", "error")
+
+    def __init__(self, client: ClientAPI) -> None:
+        self.client = client
+        self.in_flight = 0
+        self.drained_until = 0.0
+        self.error: Optional[Exception] = None
+
+    def available(self, now: float) -> bool:
+        return now >= self.drained_until
+
+    def load(self) -> tuple:
+        return self.in_flight, self.client.throttle_metrics.throttled_responses
+
+
+class ClientPool:
+    """
+    ``ClientAPI`` spread over several accounts.
+
+    Every call goes to the healthy account with the fewest calls in flight
+    (inferences still polling included). An account answering 401 is drained
+    until ``restore``; one answering 429 is drained for its ``Retry-After``
+    (or ``drain_for`` seconds) and the call moves on to another account.
+    Calls about an inference, like ``fetch_inference``, stay on the account
+    that created it.
+    """
+
+    client_class = ClientAPI
+
+    def __init__(
+        self,
+        tokens: Sequence[str],
+        drain_for: float = 30.0,
+        max_owners: int = 10000,
+        **client_kwargs,
+    ) -> None:
+        if not tokens:
+            raise ValueError("ClientPool needs at least one token")
+
+        # Throttled requests come back to the pool instead of waiting out
+        # Retry-After on the same account
+        client_kwargs.setdefault("retry_policy", RetryPolicy(max_retry_after=0.0))
+        self.drain_for = drain_for
+        self.max_owners = max_owners
+        self._members = [
+            _Member(self.client_class(token, **client_kwargs)) for token in tokens
+        ]
+        self._owners: "OrderedDict[str, _Member]" = OrderedDict()
+
+    async def __aenter__(self) -> "ClientPool":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(member.client.aclose() for member in self._members))
+
+    async def warm_up(self, *args, **kwargs) -> int:
+        """
+        ``ClientAPI.warm_up`` on every account
+        """
+        results = await asyncio.gather(
+            *(member.client.warm_up(*args, **kwargs) for member in self._members)
+        )
+        return sum(results)
+
+    @property
+    def clients(self) -> List[ClientAPI]:
+        return [member.client for member in self._members]
+
+    @property
+    def healthy(self) -> List[ClientAPI]:
+        now = time.monotonic()
+        return [member.client for member in self._members if member.available(now)]
+
+    def _member(self, client: ClientAPI) -> _Member:
+        for member in self._members:
+            if member.client is client:
+                return member
+        raise ValueError("client is not part of this pool")
+
+    def drain(self, client: ClientAPI, seconds: Optional[float] = None) -> None:
+        """
+        Stop sending new calls to ``client``, forever if ``seconds`` is None
+        """
+        member = self._member(client)
+        until = float("inf") if seconds is None else time.monotonic() + seconds
+        member.drained_until = max(member.drained_until, until)
+
+    def restore(self, client: ClientAPI) -> None:
+        member = self._member(client)
+        member.drained_until = 0.0
+        member.error = None
+
+    def _drain_on(self, member: _Member, exc: Exception) -> None:
+        member.error = exc
+        if isinstance(exc, web_exceptions.HTTPUnauthorized):
+            self.drain(member.client)
+        else:
+            retry_after = parse_retry_after(exc.headers.get("Retry-After"))
+            self.drain(
+                member.client,
+                retry_after if retry_after is not None else self.drain_for,
+            )
+
+    async def _acquire(self) -> _Member:
+        while True:
+            now = time.monotonic()
+            available = [member for member in self._members if member.available(now)]
+            if available:
+                return min(available, key=_Member.load)
+
+            resume = min(member.drained_until for member in self._members)
+            if resume == float("inf"):
+                errors = [member.error for member in self._members]
+                raise PoolExhausted("Every account of the pool is drained.") from next(
+                    (error for error in errors if error is not None), None
+                )
+            await asyncio.sleep(resume - now)
+
+    def _owner(self, args: tuple, kwargs: Dict[str, Any]) -> Optional[_Member]:
+        inference_id = kwargs.get("inference_id", args[0] if args else None)
+        if inference_id is None:
+            return None
+        try:
+            return self._owners.get(str(inference_id))
+        except TypeError:
+            return None
+
+    def _remember(self, member: _Member, result: Any) -> None:
+        items = getattr(result, "items", None)
+        for item in items if isinstance(items, list) else [result]:
+            inference_id = getattr(item, "inferenceId", None)
+            if inference_id is None:
+                continue
+            key = str(inference_id)
+            self._owners[key] = member
+            self._owners.move_to_end(key)
+        while len(self._owners) > self.max_owners:
+            self._owners.popitem(last=False)
+
+    async def _call(self, name: str, *args, **kwargs) -> Any:
+        _, result = await self._dispatch(name, *args, **kwargs)
+        return result
+
+    async def _dispatch(self, name: str, *args, **kwargs) -> Tuple[_Member, Any]:
+        # Like ``_call``, but also tells which account answered
+        owner = self._owner(args, kwargs)
+        attempts = 0
+        while True:
+            member = owner or await self._acquire()
+            member.in_flight += 1
+            try:
+                result = await getattr(member.client, name)(*args, **kwargs)
+            except DRAINING_ERRORS as exc:
+                self._drain_on(member, exc)
+                attempts += 1
+                if owner is not None or attempts >= len(self._members):
+                    raise
+                continue
+            finally:
+                member.in_flight -= 1
+
+            self._remember(member, result)
+            return member, result
+
+    async def _iterate(self, name: str, *args, **kwargs) -> AsyncIterator:
+        member = self._owner(args, kwargs) or await self._acquire()
+        member.in_flight += 1
+        try:
+            async for item in getattr(member.client, name)(*args, **kwargs):
+                self._remember(member, item)
+                yield item
+        except DRAINING_ERRORS as exc:
+            self._drain_on(member, exc)
+            raise
+        finally:
+            member.in_flight -= 1
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.client_class, name, None)
+        if name.startswith("_") or not callable(attr):
+            raise AttributeError(name)
+
+        func = inspect.unwrap(attr)
+        if inspect.isasyncgenfunction(func):
+
+            def method(*args, **kwargs):
+                return self._iterate(name, *args, **kwargs)
+
+        elif inspect.iscoroutinefunction(func):
+
+            async def method(*args, **kwargs):
+                return await self._call(name, *args, **kwargs)
+
+        else:
+            raise AttributeError(name)
+
+        method.__name__ = name
+        method.__doc__ = attr.__doc__
+        return method
+
+    async def create_inference(
+        self,
+        inference_params: CreateInferenceParams,
+        wait_for_response: bool = True,
+        polling_strategy: Union[PollingStrategy, None] = None,
+    ) -> Union[InferenceHistoricalResult, Inference]:
+        started = time.monotonic()
+        # Only the submission is rerouted; once accepted, the inference is
+        # polled on its own account
+        inference = await self._call(
+            "create_inference", inference_params, wait_for_response=False
+        )
+        if not wait_for_response or isinstance(inference, InferenceHistoricalResult):
+            return inference  # the latter is a hit of the result cache
+
+        member = self._owners[str(inference.inferenceId)]
+        member.in_flight += 1
+        try:
+            inference_result = await member.client._wait_for_inference(
+                inference,
+                polling_strategy or PollingStrategy(),
+                started,
+            )
+        finally:
+            member.in_flight -= 1
+
+        key = await member.client._result_key(inference_params)
+        await member.client._store_result(key, inference_result)
+        return inference_result
+
+    async def create_inferences(
+        self,
+        inference_params: Iterable[CreateInferenceParams],
+        concurrency: Union[int, None] = None,
+        polling_strategy: Union[PollingStrategy, None] = None,
+        on_error: Union[ErrorCallback, None] = None,
+    ) -> AsyncIterator[InferenceHistoricalResult]:
+        """
+        Submit many inferences over every account and yield their results as
+        they complete. Each submission goes to the least loaded account, and
+        every pending inference is polled on its own account from one shared
+        loop, as in ``ClientAPI.create_inferences``.
+        """
+        if concurrency is None:
+            healthy = self.healthy
+            depths = await asyncio.gather(
+                *(client.fetch_max_queue_depth() for client in healthy)
+            )
+            for client, depth in zip(healthy, depths):
+                client._max_queue_depth = depth
+            concurrency = max(sum(depths), 1)
+
+        poller = _PoolPoller(
+            self, polling_strategy or PollingStrategy(), concurrency, on_error
+        )
+        async for inference_result in poller.run(inference_params):
+            yield inference_result
+
+
+class _PoolPoller(BatchPoller):
+    """
+    ``BatchPoller`` routing each submission through the pool and each poll
+    to the account owning the inference
+    """
+
+    def __init__(self, pool: ClientPool, *args, **kwargs) -> None:
+        super().__init__(pool, *args, **kwargs)
+        self._members: Dict[UUID, _Member] = {}
+
+    async def _create(
+        self,
+        params: CreateInferenceParams,
+    ) -> Tuple[Optional[str], Union[InferenceHistoricalResult, Inference]]:
+        member, (key, inference) = await self._client._dispatch(
+            "_submit_inference", params
+        )
+        if isinstance(inference, Inference):
+            self._client._remember(member, inference)
+            # Polling inferences count towards the load of their account
+            member.in_flight += 1
+            self._members[inference.inferenceId] = member
+        return key, inference
+
+    def _ahead(self) -> int:
+        # The inference just submitted is the last one added
+        member = next(reversed(self._members.values()))
+        ahead = sum(owner is member for owner in self._members.values()) - 1
+        return queued_ahead(ahead, member.client._max_queue_depth)
+
+    async def _fetch(self, pending: _PendingInference) -> InferenceHistoricalResult:
+        member = self._members[pending.inference.inferenceId]
+        return await member.client.fetch_inference(pending.inference.inferenceId)
+
+    async def _store(
+        self,
+        pending: _PendingInference,
+        result: InferenceHistoricalResult,
+    ) -> None:
+        member = self._members[pending.inference.inferenceId]
+        await member.client._store_result(pending.key, result)
+
+    def _finish(self, pending: _PendingInference, item: Any) -> None:
+        member = self._members.pop(pending.inference.inferenceId, None)
+        if member is not None:
+            member.in_flight -= 1
+        super()._finish(pending, item)
+
+    async def run(
+        self,
+        params_iterable: Iterable[CreateInferenceParams],
+    ) -> AsyncIterator[InferenceHistoricalResult]:
+        try:
+            async for inference_result in super().run(params_iterable):
+                yield inference_result
+        finally:
+            # The batch was abandoned with inferences still pending
+            for member in self._members.values():
+                member.in_flight -= 1
+            self._members.clear()
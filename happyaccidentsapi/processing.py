@@ -0,0 +1,309 @@
+import asyncio
+import hashlib
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .models import ImageRecord, InferenceHistoricalResult
+
+__all__ = [
+    "DuplicateFilter",
+    "ProcessedImage",
+    "ProcessingPipeline",
+    "Thumbnail",
+    "perceptual_hash",
+    "sha256",
+]
+
+Hook = Callable[[Path], Any]
+Source = Union[
+    Iterable[Union[ImageRecord, InferenceHistoricalResult]],
+    AsyncIterable[Union[ImageRecord, InferenceHistoricalResult]],
+]
+
+_DONE = object()
+
+
+def _pillow():
+    try:
+        from PIL import Image
+    except ImportError as exc:  # pragma: no cover
+        raise ImportError("Image hooks require Pillow") from exc
+    return Image
+
+
+def sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def perceptual_hash(path: Path, hash_size: int = 8) -> int:
+    """
+    Difference hash: similar images differ in only a few bits; requires
+    ``Pillow``
+    """
+    Image = _pillow()
+    with Image.open(path) as image:
+        pixels = list(image.convert("L").resize((hash_size + 1, hash_size)).getdata())
+
+    value = 0
+    for row in range(hash_size):
+        for column in range(hash_size):
+            index = row * (hash_size + 1) + column
+            value = value << 1 | (pixels[index] > pixels[index + 1])
+    return value
+
+
+class Thumbnail:
+    """
+    Hook writing a thumbnail next to the image and returning its path;
+    requires ``Pillow``
+    """
+
+    def __init__(
+        self,
+        size: Tuple[int, int] = (256, 256),
+        suffix: str = ".thumb.jpg",
+        format: str = "JPEG",
+    ) -> None:
+        self.size = size
+        self.suffix = suffix
+        self.format = format
+
+    def __call__(self, path: Path) -> Path:
+        Image = _pillow()
+        destination = path.with_name(path.stem + self.suffix)
+        with Image.open(path) as image:
+            image.thumbnail(self.size)
+            image.convert("RGB").save(destination, self.format)
+        return destination
+
+
+class DuplicateFilter:
+    """
+    Finds images whose perceptual hash is at most ``threshold`` bits away
+    from one seen before.
+
+    Hashes are indexed by ``threshold + 1`` bands: two hashes that close
+    share at least one band exactly, so only those candidates are compared.
+    """
+
+    def __init__(self, hook: str = "phash", threshold: int = 4, bits: int = 64):
+        self.hook = hook
+        self.threshold = threshold
+        self._bands = threshold + 1
+        self._width = -(-bits // self._bands)
+        self._index: List[Dict[int, List[Tuple[int, Path]]]] = [
+            defaultdict(list) for _ in range(self._bands)
+        ]
+
+    def _keys(self, value: int) -> List[int]:
+        mask = (1 << self._width) - 1
+        return [(value >> (band * self._width)) & mask for band in range(self._bands)]
+
+    def check(self, value: int, path: Path) -> Optional[Path]:
+        """
+        Path of the earlier duplicate of ``path``, or None after remembering it
+        """
+        keys = self._keys(value)
+        for band, key in enumerate(keys):
+            for other, other_path in self._index[band].get(key, ()):
+                if bin(value ^ other).count("1") <= self.threshold:
+                    return other_path
+
+        for band, key in enumerate(keys):
+            self._index[band][key].append((value, path))
+        return None
+
+
+class ProcessedImage:
+    __slots__ = ("image", "path", "results", "errors", "duplicate_of")
+
+    def __init__(self, image: ImageRecord, path: Path) -> None:
+        self.image = image
+        self.path = path
+        self.results: Dict[str, Any] = {}
+        self.errors: Dict[str, Exception] = {}
+        self.duplicate_of: Optional[Path] = None
+
+    def __repr__(self) -> str:
+        return f"<ProcessedImage {self.path.name} results={list(self.results)}>"
+
+
+async def _images(source: Source) -> AsyncIterator[ImageRecord]:
+    async def iterate(items: Iterable) -> AsyncIterator:
+        for item in items:
+            yield item
+
+    if not hasattr(source, "__aiter__"):
+        source = iterate(source)
+
+    async for item in source:
+        if isinstance(item, InferenceHistoricalResult):
+            for image in item.images:
+                yield image
+        else:
+            yield item
+
+
+class ProcessingPipeline:
+    """
+    Downloads images and runs CPU-bound ``hooks`` on the saved files in a
+    thread or process pool, off the event loop.
+
+    Downloads, hooks and the consumer overlap; bounded queues between them
+    apply backpressure, so a slow stage pauses the ones before it instead of
+    buffering. Hooks take the path of the image and must be picklable for a
+    process pool. Hook errors are reported in ``ProcessedImage.errors``.
+    """
+
+    def __init__(
+        self,
+        hooks: Mapping[str, Hook],
+        executor: Union[Executor, str] = "thread",
+        workers: int = 4,
+        download_concurrency: int = 8,
+        queue_size: int = 16,
+        duplicates: Optional[DuplicateFilter] = None,
+        chunk_size: int = 64 * 1024,
+    ) -> None:
+        self.hooks = dict(hooks)
+        self.workers = workers
+        self.download_concurrency = download_concurrency
+        self.queue_size = queue_size
+        self.duplicates = duplicates
+        self.chunk_size = chunk_size
+
+        self._own_executor = isinstance(executor, str)
+        if executor == "thread":
+            executor = ThreadPoolExecutor(workers)
+        elif executor == "process":
+            executor = ProcessPoolExecutor(workers)
+        elif isinstance(executor, str):
+            raise ValueError(f"Unknown executor {executor!r}")
+        self.executor: Executor = executor
+
+    def __enter__(self) -> "ProcessingPipeline":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._own_executor:
+            self.executor.shutdown()
+
+    async def _download(
+        self,
+        source: Source,
+        directory: Path,
+        downloaded: asyncio.Queue,
+        results: asyncio.Queue,
+    ) -> None:
+        slots = asyncio.Semaphore(self.download_concurrency)
+
+        async def download(image: ImageRecord) -> None:
+            try:
+                path = directory / f"{image.id}-{image.filename}"
+                try:
+                    await image._download(path, self.chunk_size, True)
+                except Exception as exc:
+                    processed = ProcessedImage(image, path)
+                    processed.errors["download"] = exc
+                    await results.put(processed)
+                else:
+                    await downloaded.put(ProcessedImage(image, path))
+            finally:
+                slots.release()
+
+        tasks = set()
+        try:
+            async for image in _images(source):
+                await slots.acquire()
+                task = asyncio.ensure_future(download(image))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            for _ in range(self.workers):
+                await downloaded.put(_DONE)
+
+    async def _process(self, downloaded: asyncio.Queue, results: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            processed = await downloaded.get()
+            if processed is _DONE:
+                await results.put(_DONE)
+                return
+
+            futures = {
+                name: loop.run_in_executor(self.executor, hook, processed.path)
+                for name, hook in self.hooks.items()
+            }
+            for name, future in futures.items():
+                try:
+                    processed.results[name] = await future
+                except Exception as exc:
+                    processed.errors[name] = exc
+
+            value = processed.results.get(getattr(self.duplicates, "hook", None))
+            if self.duplicates is not None and value is not None:
+                processed.duplicate_of = self.duplicates.check(value, processed.path)
+            await results.put(processed)
+
+    async def process(
+        self,
+        source: Source,
+        directory: Union[str, Path],
+    ) -> AsyncIterator[ProcessedImage]:
+        """
+        Download every image of ``source`` (images or inference results, sync
+        or async iterable) into ``directory`` and yield them processed, in
+        completion order
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        downloaded: asyncio.Queue = asyncio.Queue(self.queue_size)
+        results: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        tasks = [
+            asyncio.ensure_future(
+                self._download(source, directory, downloaded, results)
+            ),
+            *(
+                asyncio.ensure_future(self._process(downloaded, results))
+                for _ in range(self.workers)
+            ),
+        ]
+        try:
+            finished = 0
+            while finished < self.workers:
+                processed = await results.get()
+                if processed is _DONE:
+                    finished += 1
+                    continue
+                yield processed
+
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,81 @@
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Tuple, Type, Union, get_args
+
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
+
+__all__ = [
+    "Projection",
+]
+
+
+@lru_cache(maxsize=128)
+def projected_tuple(model: Type[BaseModel], fields: Tuple[str, ...]) -> type:
+    """
+    Tuple-backed record with only ``fields`` of ``model``; missing values
+    are None
+    """
+    return namedtuple(
+        f"{model.__name__}Projection", fields, defaults=(None,) * len(fields)
+    )
+
+
+class Projection:
+    """
+    Validates a page response keeping only ``fields`` of its items.
+
+    Items become lightweight named tuples; every other field of the item is
+    skipped by the JSON validator and never turned into Python objects.
+    """
+
+    def __init__(self, page_model: Type[BaseModel], fields: Iterable[str]) -> None:
+        self.page_model = page_model
+        self.item_model = get_args(page_model.model_fields["items"].annotation)[0]
+        self.fields = tuple(dict.fromkeys(fields))
+
+        unknown = set(self.fields) - set(self.item_model.model_fields)
+        if unknown:
+            raise ValueError(
+                f"Unknown {self.item_model.__name__} fields: {', '.join(sorted(unknown))}"
+            )
+
+        self.record = projected_tuple(self.item_model, self.fields)
+        item = TypedDict(
+            f"{self.item_model.__name__}Fields",
+            {
+                name: Optional[self.item_model.model_fields[name].annotation]
+                for name in self.fields
+            },
+            total=False,
+        )
+        page = {
+            name: field.annotation
+            for name, field in page_model.model_fields.items()
+            if name != "items"
+        }
+        page["items"] = List[item]
+        self._adapter = TypeAdapter(TypedDict(f"{page_model.__name__}Fields", page))
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Projection) and (self.page_model, self.fields) == (
+            other.page_model,
+            other.fields,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.page_model, self.fields))
+
+    def validate(self, data: Union[bytes, str, dict]) -> BaseModel:
+        if isinstance(data, (bytes, str)):
+            data = self._adapter.validate_json(data)
+        else:
+            data = self._adapter.validate_python(data)
+
+        data["items"] = [self.record(**item) for item in data["items"]]
+        return self.page_model.model_construct(**data)
+
+
+@lru_cache(maxsize=128)
+def projection(page_model: Type[BaseModel], fields: Tuple[str, ...]) -> Projection:
+    return Projection(page_model, fields)
@@ -0,0 +1,164 @@
+import asyncio
+import functools
+import inspect
+import os
+import threading
+from typing import Any, AsyncIterator, Awaitable, Iterator, Optional
+
+from ._happyaccidentsapi import ClientAPI
+from .models import ImageRecord
+
+__all__ = [
+    "SyncClientAPI",
+]
+
+
+class _LoopThread:
+    """
+    Event loop running forever in a daemon thread
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self.loop.run_forever,
+            name="happyaccidentsapi-loop",
+            daemon=True,
+        )
+        self.thread.start()
+
+    def run(self, awaitable: Awaitable) -> Any:
+        if threading.current_thread() is self.thread:
+            raise RuntimeError("SyncClientAPI can't be used from its own event loop")
+
+        async def wrapper():
+            return await awaitable
+
+        return asyncio.run_coroutine_threadsafe(wrapper(), self.loop).result()
+
+
+_loop_lock = threading.Lock()
+_loop_thread: Optional[_LoopThread] = None
+_loop_pid: Optional[int] = None
+
+
+def background_loop() -> _LoopThread:
+    """
+    The process-wide loop thread; a forked worker starts its own
+    """
+    global _loop_thread, _loop_pid
+    with _loop_lock:
+        if _loop_thread is None or _loop_pid != os.getpid():
+            _loop_thread = _LoopThread()
+            _loop_pid = os.getpid()
+        return _loop_thread
+
+
+class SyncClientAPI:
+    """
+    Blocking facade of ``ClientAPI`` for synchronous code (Django, Flask,
+    scripts).
+
+    Every call runs on one background event loop per process, so the pooled
+    keep-alive connections are reused between calls and threads. Methods
+    mirror ``ClientAPI``: coroutines block until they finish and async
+    iterators (``iter_*``, ``create_inferences``) become plain iterators.
+    It is safe to share one instance between threads.
+
+    ``eager`` warm-up and ``keepalive_interval`` take effect on construction,
+    as ``async with ClientAPI(...)`` would on entering. A forked worker
+    builds a fresh client on first use, since the loop thread and sessions
+    of its parent don't exist in the child.
+    """
+
+    client_class = ClientAPI
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._args = args
+        self._kwargs = kwargs
+        self._lock = threading.Lock()
+        self._open()
+
+    def _open(self) -> None:
+        self._pid = os.getpid()
+        self._client = self.client_class(*self._args, **self._kwargs)
+        # The session and the keep-alive task belong to the background loop
+        background_loop().run(self._client.__aenter__())
+
+    def _check_fork(self) -> None:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._open()
+
+    @property
+    def _loop(self) -> _LoopThread:
+        self._check_fork()
+        return background_loop()
+
+    def __enter__(self) -> "SyncClientAPI":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._loop.run(self.client.aclose())
+
+    @property
+    def client(self) -> ClientAPI:
+        self._check_fork()
+        return self._client
+
+    def _iterate(self, iterator: AsyncIterator) -> Iterator:
+        try:
+            while True:
+                try:
+                    yield self._loop.run(iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._loop.run(iterator.aclose())
+
+    def _call(self, result: Any) -> Any:
+        if inspect.isasyncgen(result):
+            return self._iterate(result)
+        if inspect.isawaitable(result):
+            return self._loop.run(result)
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        attr = getattr(self.client, name)
+        if not callable(attr):
+            return attr
+
+        def method(*args, **kwargs):
+            return self._call(attr(*args, **kwargs))
+
+        method.__name__ = name
+        method.__doc__ = attr.__doc__
+        return method
+
+    def __dir__(self):
+        public = [name for name in dir(self.client) if not name.startswith("_")]
+        return sorted(set(super().__dir__()) | set(public))
+
+    def start_keepalive(self, *args, **kwargs) -> None:
+        """
+        ``ClientAPI.start_keepalive`` on the background loop
+        """
+        self._loop.loop.call_soon_threadsafe(
+            functools.partial(self.client.start_keepalive, *args, **kwargs)
+        )
+
+    def stop_keepalive(self) -> None:
+        self._loop.loop.call_soon_threadsafe(self.client.stop_keepalive)
+
+    def save(self, image: ImageRecord, *args, **kwargs) -> Any:
+        """
+        Blocking ``ImageRecord.save``
+        """
+        return self._loop.run(image.save(*args, **kwargs))
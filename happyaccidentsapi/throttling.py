@@ -0,0 +1,201 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from aiohttp import ClientConnectionError, ClientError, web_exceptions
+
+__all__ = [
+    "RateLimiter",
+    "RetryPolicy",
+    "ThrottleMetrics",
+    "TokenBucket",
+]
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class ThrottleMetrics:
+    """
+    Counters of client-side waits and server-side throttling
+    """
+
+    def __init__(self) -> None:
+        self.throttled_responses = 0
+        self.server_errors = 0
+        self.retries = 0
+        self.retry_wait_seconds = 0.0
+        self.limiter_waits = 0
+        self.limiter_wait_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(vars(self))
+
+    def __repr__(self) -> str:
+        fields = " ".join(f"{key}={value}" for key, value in vars(self).items())
+        return f"<ThrottleMetrics {fields}>"
+
+
+class TokenBucket:
+    """
+    Allows ``rate`` requests per second on average and bursts of up to
+    ``capacity`` requests
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        # Created on first use per event loop: a lock binds to a loop (before
+        # Python 3.10, to the one current at construction)
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def pause(self, delay: float) -> None:
+        """
+        Hold back every request for ``delay`` seconds, e.g. after a 429
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        self._tokens = 0.0
+
+    async def acquire(self) -> float:
+        """
+        Wait for a token and return how long that took
+        """
+        waited = 0.0
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+
+                await asyncio.sleep(delay)
+                waited += delay
+
+
+class RateLimiter:
+    """
+    Token buckets per endpoint. A request uses the bucket registered for the
+    longest matching path prefix (e.g. ``"/inference/"``), or ``default``.
+    """
+
+    def __init__(
+        self,
+        default: Optional[TokenBucket] = None,
+        endpoints: Optional[Dict[str, TokenBucket]] = None,
+    ) -> None:
+        self.default = default
+        self.endpoints = dict(endpoints or {})
+
+    def bucket_for(self, path: str) -> Optional[TokenBucket]:
+        prefixes = [prefix for prefix in self.endpoints if path.startswith(prefix)]
+        if not prefixes:
+            return self.default
+        return self.endpoints[max(prefixes, key=len)]
+
+    async def acquire(self, path: str) -> float:
+        bucket = self.bucket_for(path)
+        if bucket is None:
+            return 0.0
+        return await bucket.acquire()
+
+    def pause(self, path: str, delay: float) -> None:
+        bucket = self.bucket_for(path)
+        if bucket is not None:
+            bucket.pause(delay)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max((date - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def is_transient(exc: BaseException) -> bool:
+    """
+    Whether the same request may succeed later: throttling (429), server
+    errors (5xx), connection errors and timeouts
+    """
+    if isinstance(exc, web_exceptions.HTTPException):
+        return exc.status == 429 or exc.status >= 500
+    return isinstance(exc, (ClientError, asyncio.TimeoutError))
+
+
+class RetryPolicy:
+    """
+    Retries throttled requests (429) after ``Retry-After``, and idempotent
+    requests that failed with a 5xx or a connection error with jittered
+    exponential backoff
+    """
+
+    def __init__(
+        self,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        max_retry_after: float = 120.0,
+    ) -> None:
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.backoff * 2**attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    def delay(self, method: str, exc: Exception, attempt: int) -> Optional[float]:
+        """
+        Seconds to wait before retrying, or None if ``exc`` must be raised
+        """
+        if attempt >= self.retries:
+            return None
+
+        if isinstance(exc, web_exceptions.HTTPTooManyRequests):
+            # A throttled request was not processed, so even POSTs are safe
+            retry_after = parse_retry_after(exc.headers.get("Retry-After"))
+            if retry_after is None:
+                return self._backoff(attempt)
+            if retry_after > self.max_retry_after:
+                return None
+            return retry_after
+
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return None
+
+        if isinstance(exc, web_exceptions.HTTPException) and exc.status >= 500:
+            return self._backoff(attempt)
+        if isinstance(exc, (ClientConnectionError, asyncio.TimeoutError)):
+            return self._backoff(attempt)
+        return None
@@ -0,0 +1,104 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from aiohttp import web
+from pydantic import ValidationError
+
+from .models import WebhookEvent
+
+__all__ = [
+    "WebhookReceiver",
+]
+
+
+def _inference_data(event: WebhookEvent) -> Optional[Dict[str, Any]]:
+    data = event.data or {}
+    for candidate in (data, data.get("inference"), data.get("result")):
+        if isinstance(candidate, dict) and "inferenceId" in candidate:
+            return candidate
+    return None
+
+
+class WebhookReceiver:
+    """
+    aiohttp endpoint receiving ``WebhookEvent``s for inferences.
+
+    ``ClientAPI(webhook_receiver=...)`` registers every inference it waits
+    for; an event about it wakes ``create_inference``, which then fetches
+    the inference once, and polling only starts if no event arrives within
+    ``fallback_after`` seconds. Events are not authenticated, so their
+    payload is never returned as the result. The receiver must run on the
+    same event loop as the client.
+    """
+
+    def __init__(
+        self,
+        path: str = "/webhooks",
+        fallback_after: float = 30.0,
+        max_unclaimed: int = 1024,
+    ) -> None:
+        self.path = path
+        self.fallback_after = fallback_after
+        self.max_unclaimed = max_unclaimed
+        self._pending: Dict[str, asyncio.Future] = {}
+        # Events that arrived before their inference was registered
+        self._unclaimed: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def register(self, inference_id: Any) -> asyncio.Future:
+        key = str(inference_id)
+        future = self._pending.get(key)
+        if future is None or future.done():
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+
+            data = self._unclaimed.pop(key, None)
+            if data is not None:
+                future.set_result(data)
+        return future
+
+    def unregister(self, inference_id: Any) -> None:
+        self._unclaimed.pop(str(inference_id), None)
+        future = self._pending.pop(str(inference_id), None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    def dispatch(self, event: WebhookEvent) -> bool:
+        """
+        Wake the waiter of the inference ``event`` is about
+        """
+        data = _inference_data(event)
+        if data is None:
+            return False
+
+        try:
+            key = str(UUID(str(data["inferenceId"])))
+        except ValueError:
+            return False
+
+        future = self._pending.get(key)
+        if future is None or future.done():
+            self._unclaimed[key] = data
+            self._unclaimed.move_to_end(key)
+            while len(self._unclaimed) > self.max_unclaimed:
+                self._unclaimed.popitem(last=False)
+            return False
+
+        future.set_result(data)
+        return True
+
+    async def handle(self, request: web.Request) -> web.Response:
+        try:
+            event = WebhookEvent.model_validate_json(await request.read())
+        except ValidationError as exc:
+            return web.json_response({"detail": str(exc)}, status=400)
+
+        return web.json_response({"dispatched": self.dispatch(event)})
+
+    def setup(self, app: web.Application) -> web.Application:
+        app.router.add_post(self.path, self.handle)
+        return app
+
+    def create_app(self) -> web.Application:
+        return self.setup(web.Application())
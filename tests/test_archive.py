@@ -0,0 +1,91 @@
+import importlib.util
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import export_history, iter_history, read_history
+
+from .utils import INFERENCE, LocalClientAPI
+
+HISTORY = [
+    {
+        **INFERENCE,
+        "inferenceId": str(uuid.UUID(int=i)),
+        "inferencePayload": {
+            **INFERENCE["inferencePayload"],
+            "prompt": f"beach {i}",
+            "seed": i if i % 2 else None,
+        },
+    }
+    for i in range(5)
+]
+
+
+class TestExportHistory(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        async def inferences(request: web.Request):
+            page = int(request.query["current_page"])
+            size = int(request.query["page_size"])
+            return web.json_response(
+                {
+                    "items": HISTORY[page * size : (page + 1) * size],
+                    "paginationMetadata": {
+                        "currentPage": page,
+                        "pageSize": size,
+                        "totalItems": len(HISTORY),
+                    },
+                }
+            )
+
+        app = web.Application()
+        app.router.add_get("/v1/inferences/", inferences)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def export(self, name: str) -> Path:
+        path = Path(self.tmp.name) / name
+        async with LocalClientAPI(self.server, token="token") as api:
+            rows = await export_history(api, path, page_size=2)
+
+        self.assertEqual(rows, len(HISTORY))
+        return path
+
+    def check_rows(self, rows: list) -> None:
+        self.assertEqual(
+            [row["prompt"] for row in rows], [f"beach {i}" for i in range(5)]
+        )
+        self.assertEqual([row["seed"] for row in rows], [None, 1, None, 3, None])
+        self.assertEqual(rows[0]["images"], "folder/result-0.png")
+        self.assertEqual(rows[0]["outputWpx"], None)
+
+    async def test_ndjson(self):
+        self.check_rows(list(iter_history(await self.export("history.ndjson"))))
+
+    async def test_csv(self):
+        self.check_rows(list(iter_history(await self.export("history.csv"))))
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow")
+    async def test_columnar(self):  # pragma: no cover
+        for name in ("history.parquet", "history.arrow"):
+            table = read_history(await self.export(name), columns=["prompt", "seed"])
+
+            self.assertEqual(table.column_names, ["prompt", "seed"])
+            self.check_rows(
+                [
+                    {**row, "images": "folder/result-0.png", "outputWpx": None}
+                    for row in table.to_pylist()
+                ]
+            )
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            list(iter_history(Path(self.tmp.name) / "history.txt"))
@@ -0,0 +1,101 @@
+import unittest
+from unittest import mock
+
+from aiohttp import web
+
+from happyaccidentsapi import (
+    CompletionEstimator,
+    CreateInferenceParams,
+    PollingStrategy,
+)
+
+from .utils import FakeInferenceServer, LocalClientAPI
+
+
+class BatchServer(FakeInferenceServer):
+    async def on_create(self, request: web.Request, body: dict):
+        if body["prompt"] == "rejected":
+            return web.json_response({"detail": "rejected"}, status=422)
+        return None
+
+
+class TestCreateInferences(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake = BatchServer(
+            polls_to_complete=2, max_queue_depth=3, poll_latency=0.01
+        )
+        self.server = await self.fake.start()
+        self.strategy = PollingStrategy(
+            min_delay=0.01,
+            jitter=0.0,
+            estimator=CompletionEstimator(queue_wait=0.0, run_time=0.0),
+        )
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def create_inferences(self, prompts, **kwargs) -> list:
+        params = [CreateInferenceParams(modelId="id", prompt=p) for p in prompts]
+        async with LocalClientAPI(self.server, token="token", retry_policy=None) as api:
+            return [
+                result
+                async for result in api.create_inferences(
+                    params,
+                    polling_strategy=self.strategy,
+                    **kwargs,
+                )
+            ]
+
+    async def test_yields_all_results(self):
+        results = await self.create_inferences([f"beach {i}" for i in range(10)])
+
+        self.assertEqual(len({result.inferenceId for result in results}), 10)
+        self.assertLessEqual(self.fake.max_in_flight, 3)
+
+    async def test_polls_share_a_tick(self):
+        self.strategy.min_delay = 0.1
+        results = await self.create_inferences(
+            [f"beach {i}" for i in range(3)], concurrency=3
+        )
+
+        self.assertEqual(len(results), 3)
+        # Due within min_delay of each other, all three are fetched at once
+        self.assertEqual(self.fake.max_polling, 3)
+
+    async def test_schedules_by_own_inferences_ahead(self):
+        with mock.patch.object(
+            self.strategy, "delays", wraps=self.strategy.delays
+        ) as delays:
+            await self.create_inferences(["lone beach"])
+            self.assertEqual(delays.call_args.args[0], 0)
+
+            delays.reset_mock()
+            await self.create_inferences([f"beach {i}" for i in range(10)])
+            ahead = [call.args[0] for call in delays.call_args_list]
+            self.assertEqual((min(ahead), max(ahead)), (0, 2))
+
+    async def test_failures_do_not_abandon_the_batch(self):
+        self.fake.flaky_polls = 2
+        errors = []
+        results = await self.create_inferences(
+            ["beach 0", "rejected", "beach 1"],
+            on_error=lambda params, exc: errors.append(params.prompt),
+        )
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(errors, ["rejected"])
+
+    async def test_first_failure_raised_after_the_batch(self):
+        params = [
+            CreateInferenceParams(modelId="id", prompt=prompt)
+            for prompt in ("rejected", "beach 0", "beach 1")
+        ]
+        results = []
+        async with LocalClientAPI(self.server, token="token") as api:
+            with self.assertRaises(web.HTTPException):
+                async for result in api.create_inferences(
+                    params, polling_strategy=self.strategy
+                ):
+                    results.append(result)
+
+        self.assertEqual(len(results), 2)
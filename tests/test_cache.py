@@ -0,0 +1,165 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import (
+    CacheEntry,
+    CompletionEstimator,
+    CreateInferenceParams,
+    MemoryCache,
+    MetadataItem,
+    PollingStrategy,
+    SqliteCache,
+)
+
+from .utils import INFERENCE, METADATA_ITEM, FakeInferenceServer, LocalClientAPI
+
+
+class TestBackends(unittest.IsolatedAsyncioTestCase):
+    async def test_memory_lru_eviction(self):
+        cache = MemoryCache(maxsize=2)
+        await cache.set("a", CacheEntry(1))
+        await cache.set("b", CacheEntry(2))
+        await cache.get("a")
+        await cache.set("c", CacheEntry(3))
+
+        self.assertIsNone(await cache.get("b"))
+        self.assertEqual((await cache.get("a")).data, 1)
+
+    async def test_sqlite_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SqliteCache(Path(tmp) / "cache.db", maxsize=2)
+            await cache.set("a", CacheEntry(b'{"x": 1}', etag='"1"'))
+            await cache.set("b", CacheEntry(b'{"x": 2}'))
+            await cache.get("a")
+            await cache.set("c", CacheEntry(b'{"x": 3}'))
+
+            entry = await cache.get("a")
+            self.assertEqual((entry.data, entry.etag), (b'{"x": 1}', '"1"'))
+            self.assertIsNone(await cache.get("b"))
+            cache.close()
+
+
+class TestClientCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+
+        async def metadata_item(request: web.Request):
+            self.requests.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return web.Response(status=304)
+            return web.json_response(METADATA_ITEM, headers={"ETag": '"v1"'})
+
+        app = web.Application()
+        app.router.add_get("/v1/models/metadata-items/{id}", metadata_item)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_fresh_entries_skip_network(self):
+        async with LocalClientAPI(self.server, cache=MemoryCache()) as api:
+            first = await api.fetch_metadata_item("id")
+            second = await api.fetch_metadata_item("id")
+
+        self.assertIsInstance(first, MetadataItem)
+        self.assertIs(first, second)
+        self.assertEqual(self.requests, [None])
+
+    async def test_stale_entries_are_revalidated(self):
+        async with LocalClientAPI(self.server, cache=MemoryCache(ttl=0)) as api:
+            await api.fetch_metadata_item("id")
+            obj = await api.fetch_metadata_item("id")
+
+        self.assertIsInstance(obj, MetadataItem)
+        self.assertEqual(self.requests, [None, '"v1"'])
+
+
+class TestResultCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake = FakeInferenceServer(max_queue_depth=1, unique_ids=False)
+        self.version = "a1"
+
+        async def metadata_item(request: web.Request):
+            return web.json_response({**METADATA_ITEM, "activeVersionId": self.version})
+
+        app = web.Application()
+        app.router.add_get("/v1/models/metadata-items/{id}", metadata_item)
+        self.server = await self.fake.start(app)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    def client(self, result_cache) -> LocalClientAPI:
+        return LocalClientAPI(self.server, token="token", result_cache=result_cache)
+
+    def strategy(self) -> PollingStrategy:
+        estimator = CompletionEstimator(queue_wait=0.0, run_time=0.0)
+        return PollingStrategy(min_delay=0.01, estimator=estimator)
+
+    async def test_seeded_inference_is_reused(self):
+        params = CreateInferenceParams(modelId="id", prompt="beach", seed=42)
+
+        async with self.client(MemoryCache()) as api:
+            first = await api.create_inference(params, polling_strategy=self.strategy())
+            second = await api.create_inference(
+                params, polling_strategy=self.strategy()
+            )
+
+        self.assertEqual(len(self.fake.created), 1)
+        self.assertEqual(second.inferenceId, first.inferenceId)
+        self.assertIs(second.images[0]._client, api)
+
+    async def test_unseeded_inference_is_not_cached(self):
+        params = CreateInferenceParams(modelId="id", prompt="beach")
+
+        async with self.client(MemoryCache()) as api:
+            await api.create_inference(params, polling_strategy=self.strategy())
+            await api.create_inference(params, polling_strategy=self.strategy())
+
+        self.assertEqual(len(self.fake.created), 2)
+
+    async def test_new_model_version_invalidates(self):
+        params = CreateInferenceParams(modelId="id", prompt="beach", seed=42)
+
+        async with self.client(MemoryCache()) as api:
+            await api.create_inference(params, polling_strategy=self.strategy())
+            self.version = "a2"
+            await api.create_inference(params, polling_strategy=self.strategy())
+
+        self.assertEqual(len(self.fake.created), 2)
+
+    async def test_sqlite_results_survive_restart(self):
+        params = CreateInferenceParams(modelId="id", prompt="beach", seed=42)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for _ in range(2):
+                cache = SqliteCache(Path(tmp) / "results.db", ttl=3600)
+                async with self.client(cache) as api:
+                    obj = await api.create_inference(
+                        params, polling_strategy=self.strategy()
+                    )
+                cache.close()
+
+        self.assertEqual(len(self.fake.created), 1)
+        self.assertEqual(str(obj.inferenceId), INFERENCE["inferenceId"])
+
+    async def test_batch_uses_the_result_cache(self):
+        params = [CreateInferenceParams(modelId="id", prompt="beach", seed=42)]
+
+        async with self.client(MemoryCache()) as api:
+            for _ in range(2):
+                results = [
+                    result
+                    async for result in api.create_inferences(
+                        params, polling_strategy=self.strategy()
+                    )
+                ]
+
+        self.assertEqual(len(self.fake.created), 1)
+        self.assertEqual(str(results[0].inferenceId), INFERENCE["inferenceId"])
+        self.assertIs(results[0].images[0]._client, api)
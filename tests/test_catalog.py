@@ -0,0 +1,107 @@
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import ModelCatalog
+from happyaccidentsapi.enums import CivitAiBaseModelType, CivitAiModelType
+
+from .utils import METADATA_ITEM, LocalClientAPI
+
+
+def metadata_item(i: int, **overrides):
+    return {
+        **METADATA_ITEM,
+        "id": f"model-{i}",
+        "name": f"Model {i}",
+        "createdAt": f"2023-07-{i + 1:02d}T00:00:00",
+        **overrides,
+    }
+
+
+class TestModelCatalog(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.items = [
+            metadata_item(2, name="Stable Diffusion v1.5"),
+            metadata_item(1, name="Anything v3", type="LORA"),
+            metadata_item(0, name="Dreamshaper", tags=["anime"]),
+        ]
+        self.pages = []
+
+        async def metadata_items(request: web.Request):
+            page = int(request.query["currentPage"])
+            size = int(request.query["pageSize"])
+            self.pages.append(page)
+            items = self.items[(page - 1) * size : page * size]
+            return web.json_response(
+                {
+                    "items": items,
+                    "paginationMetadata": {
+                        "currentPage": page,
+                        "pageSize": size,
+                        "totalItems": len(self.items),
+                    },
+                }
+            )
+
+        app = web.Application()
+        app.router.add_get("/v1/models/metadata-items", metadata_items)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.catalog = ModelCatalog()
+
+    async def asyncTearDown(self):
+        self.catalog.close()
+        await self.server.close()
+
+    async def test_search_and_filters(self):
+        async with LocalClientAPI(self.server) as api:
+            self.assertEqual(await self.catalog.sync(api, page_size=2), 3)
+
+        self.assertEqual(self.catalog.find_model("stable diff").id, "model-2")
+        self.assertEqual(self.catalog.find_model("anime").id, "model-0")
+        self.assertEqual(
+            self.catalog.find_model("", model_type=CivitAiModelType.LORA).id,
+            "model-1",
+        )
+        self.assertEqual(
+            len(self.catalog.search(base_model=CivitAiBaseModelType.SD15)), 3
+        )
+        self.assertEqual(self.catalog.search(base_model=CivitAiBaseModelType.SD21), [])
+
+    async def test_trusted_client(self):
+        async with LocalClientAPI(self.server, trusted=True) as api:
+            items = [item async for item in api.iter_metadata_items(page_size=2)]
+            self.assertEqual(len(items), 3)
+            self.assertEqual(await self.catalog.sync(api, page_size=2), 3)
+
+        self.assertEqual(self.catalog.find_model("anime").id, "model-0")
+
+    async def test_incremental_sync_stops_at_known_items(self):
+        async with LocalClientAPI(self.server, coalesce_requests=False) as api:
+            await self.catalog.sync(api, page_size=1)
+            self.items.insert(0, metadata_item(3, name="Newest"))
+            self.pages.clear()
+            self.assertEqual(await self.catalog.sync(api, page_size=1), 2)
+
+        self.assertEqual(len(self.catalog), 4)
+        self.assertEqual(self.catalog.find_model("newest").id, "model-3")
+        # The known item sharing the newest cursor value is on page 3
+        self.assertEqual(self.pages, [1, 2, 3])
+
+    async def test_reconcile_updates_and_drops_older_items(self):
+        async with LocalClientAPI(self.server, coalesce_requests=False) as api:
+            await self.catalog.sync(api, page_size=2)
+            del self.items[2]  # Dreamshaper deleted
+            self.items[1] = metadata_item(1, name="Anything v4", type="LORA")
+
+            await self.catalog.sync(api, page_size=2)
+            # Incremental syncs only see new items
+            self.assertEqual(len(self.catalog), 3)
+            self.assertIsNone(self.catalog.find_model("anything v4"))
+
+            await self.catalog.sync(api, page_size=2, reconcile_after=0)
+
+        self.assertEqual(len(self.catalog), 2)
+        self.assertIsNone(self.catalog.find_model("dreamshaper"))
+        self.assertEqual(self.catalog.find_model("anything v4").id, "model-1")
@@ -0,0 +1,68 @@
+import json
+import unittest
+from datetime import datetime
+
+from happyaccidentsapi import (
+    ApiPaginatedListResponseInferenceHistoricalResult,
+    ClientAPI,
+    CreateInferenceParams,
+    ImageRecord,
+    InferenceStatus,
+    MetadataItems,
+    RangePaginationMetadata,
+)
+
+from .utils import INFERENCE, METADATA_ITEM
+
+PAGINATION = {"currentPage": 0, "pageSize": 10}
+
+
+class TestDecoding(unittest.TestCase):
+    def test_validates_raw_bytes(self):
+        api = ClientAPI()
+        body = json.dumps({"items": [INFERENCE], "paginationMetadata": PAGINATION})
+
+        obj = api._validate(
+            ApiPaginatedListResponseInferenceHistoricalResult, body.encode()
+        )
+
+        self.assertIs(obj.items[0].images[0]._client, api)
+
+    def test_trusted_mode_constructs_nested_models(self):
+        api = ClientAPI(trusted=True)
+        body = json.dumps(
+            {"items": [INFERENCE, INFERENCE], "paginationMetadata": PAGINATION}
+        )
+
+        obj = api._validate(
+            ApiPaginatedListResponseInferenceHistoricalResult, body.encode()
+        )
+        item = obj.items[1]
+
+        self.assertIsInstance(item.images[0], ImageRecord)
+        self.assertIs(item.images[0]._client, api)
+        self.assertIsInstance(item.inferencePayload, CreateInferenceParams)
+        self.assertEqual(item.inferencePayload.numInferenceSteps, 25)
+        self.assertIs(item.status, InferenceStatus.COMPLETED)
+
+    def test_trusted_mode_matches_validation(self):
+        body = json.dumps({"items": [METADATA_ITEM], "paginationMetadata": PAGINATION})
+
+        trusted = ClientAPI(trusted=True)._validate(MetadataItems, body)
+        validated = ClientAPI()._validate(MetadataItems, body)
+
+        self.assertEqual(
+            trusted.first().versionMetadataItems[0].files[0].name,
+            validated.first().versionMetadataItems[0].files[0].name,
+        )
+        self.assertEqual(trusted.first().ratings.rating, 4.5)
+
+    def test_trusted_mode_resolves_forward_references(self):
+        pagination = {**PAGINATION, "totalItems": 1}
+        body = json.dumps({"items": [METADATA_ITEM], "paginationMetadata": pagination})
+
+        page = ClientAPI(trusted=True)._validate(MetadataItems, body)
+
+        self.assertIs(type(page.paginationMetadata), RangePaginationMetadata)
+        self.assertEqual(page.paginationMetadata.totalItems, 1)
+        self.assertIsInstance(page.first().createdAt, datetime)
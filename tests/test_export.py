@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import ImageRecord, InferenceHistoricalResult, save_all
+
+from .utils import INFERENCE
+
+PNG = os.urandom(10 * 1024)
+
+
+class TestSaveAll(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.downloads = 0
+        self.failures = 1
+
+        async def image(request: web.Request):
+            if request.method == "GET":
+                if self.failures:
+                    self.failures -= 1
+                    raise web.HTTPInternalServerError(
+                        text='{"detail": "oops"}', content_type="application/json"
+                    )
+                self.downloads += 1
+            return web.Response(body=PNG, headers={"ETag": '"abc"'})
+
+        app = web.Application()
+        app.router.add_get("/{name}", image)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        patcher = mock.patch.object(
+            ImageRecord,
+            "get_url",
+            lambda image: str(self.server.make_url(f"/{image.id}")),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        images = [{**INFERENCE["images"][0], "id": str(i)} for i in range(5)]
+        self.results = [
+            InferenceHistoricalResult.model_validate({**INFERENCE, "images": images})
+        ]
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_downloads_retries_and_skips(self):
+        with mock.patch("asyncio.sleep"):
+            stats = await save_all(self.results, self.tmp.name, concurrency=2)
+
+        self.assertEqual((stats.downloaded, stats.failed), (5, 0))
+        self.assertEqual(self.downloads, 5)
+        for i in range(5):
+            path = Path(self.tmp.name) / f"{i}-result-0.png"
+            self.assertEqual(path.read_bytes(), PNG)
+
+        stats = await save_all(self.results, self.tmp.name)
+
+        self.assertEqual((stats.downloaded, stats.skipped), (0, 5))
+        self.assertEqual(self.downloads, 5)
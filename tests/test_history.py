@@ -0,0 +1,102 @@
+import unittest
+import uuid
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import HistorySync
+
+from .utils import INFERENCE, LocalClientAPI
+
+
+def inference(number: int, status: str = "COMPLETED") -> dict:
+    return {
+        **INFERENCE,
+        "inferenceId": str(uuid.UUID(int=number)),
+        "createdAt": f"2023-07-01T00:00:{number:02d}",
+        "status": status,
+    }
+
+
+class TestHistorySync(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # Newest first, like the API
+        self.history = [
+            inference(i, "PENDING" if i == 3 else "COMPLETED") for i in range(5)
+        ][::-1]
+        self.pages = 0
+
+        async def inferences(request: web.Request):
+            self.pages += 1
+            page = int(request.query["current_page"])
+            size = int(request.query["page_size"])
+            return web.json_response(
+                {
+                    "items": self.history[page * size : (page + 1) * size],
+                    "paginationMetadata": {
+                        "currentPage": page,
+                        "pageSize": size,
+                        "totalItems": len(self.history),
+                    },
+                }
+            )
+
+        async def one(request: web.Request):
+            for item in self.history:
+                if item["inferenceId"] == request.match_info["id"]:
+                    return web.json_response(item)
+            raise web.HTTPNotFound()
+
+        app = web.Application()
+        app.router.add_get("/v1/inferences/", inferences)
+        app.router.add_get("/v1/inferences/{id}", one)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.store = HistorySync()
+        self.addCleanup(self.store.close)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def sync(self, **kwargs) -> list:
+        async with LocalClientAPI(self.server, token="token", **kwargs) as api:
+            return [
+                (uuid.UUID(str(result.inferenceId)).int, result.status.value)
+                async for result in self.store.sync(api, page_size=2)
+            ]
+
+    async def test_incremental(self):
+        self.assertEqual(len(await self.sync()), 5)
+
+        self.history.insert(0, inference(5))
+        self.history[2]["status"] = "COMPLETED"
+        self.pages = 0
+        synced = await self.sync()
+
+        self.assertEqual(synced, [(5, "COMPLETED"), (3, "COMPLETED")])
+        # Paging stops at the cursor without fetching the next page
+        self.assertEqual(self.pages, 1)
+        self.assertEqual(await self.sync(), [])
+
+    async def test_interrupted_sync_is_repeated(self):
+        async with LocalClientAPI(self.server, token="token") as api:
+            async for _ in self.store.sync(api, page_size=2):
+                break
+
+            self.assertIsNone(self.store.cursor(api))
+
+        self.assertEqual(len(await self.sync()), 5)
+
+    async def test_deleted_pending_inference_is_dropped(self):
+        await self.sync()
+        del self.history[1]  # the pending inference 3
+        self.history.insert(0, inference(5))
+
+        self.assertEqual(await self.sync(), [(5, "COMPLETED")])
+        self.assertEqual(await self.sync(), [])
+
+    async def test_trusted_client(self):
+        self.assertEqual(len(await self.sync(trusted=True)), 5)
+
+        self.history[1]["status"] = "COMPLETED"
+        self.assertEqual(await self.sync(trusted=True), [(3, "COMPLETED")])
@@ -0,0 +1,133 @@
+import os
+import tempfile
+import unittest
+from io import BytesIO
+from pathlib import Path
+from unittest import mock
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import ImageRecord
+
+from .utils import INFERENCE
+
+PNG = os.urandom(300 * 1024)
+ETAG = '"v2"'
+
+
+class TestImageSave(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.ranges = []
+        self.range_start = None
+
+        async def image(request: web.Request):
+            self.ranges.append(request.headers.get("Range"))
+            start = request.http_range.start
+            if start is not None and request.headers.get("If-Range") == ETAG:
+                # A misbehaving server may answer from another offset
+                start = start if self.range_start is None else self.range_start
+                return web.Response(
+                    status=206,
+                    body=PNG[start:],
+                    headers={
+                        "ETag": ETAG,
+                        "Content-Range": f"bytes {start}-{len(PNG) - 1}/{len(PNG)}",
+                    },
+                )
+            return web.Response(
+                body=PNG, content_type="image/png", headers={"ETag": ETAG}
+            )
+
+        async def proxy(request: web.Request):
+            response = web.StreamResponse()
+            await self.image.stream_to(response, request)
+            return response
+
+        app = web.Application()
+        app.router.add_get("/image.png", image)
+        app.router.add_get("/proxy", proxy)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.image = ImageRecord.model_validate(INFERENCE["images"][0])
+        patcher = mock.patch.object(
+            ImageRecord,
+            "get_url",
+            lambda _: str(self.server.make_url("/image.png")),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_save_bytes_io(self):
+        destination = await self.image.save(chunk_size=1024)
+
+        self.assertIsInstance(destination, BytesIO)
+        self.assertEqual(destination.read(), PNG)
+
+    async def test_iter_chunks(self):
+        chunks = [chunk async for chunk in self.image.iter_chunks(chunk_size=1024)]
+
+        self.assertEqual(b"".join(chunks), PNG)
+        self.assertTrue(all(len(chunk) <= 1024 for chunk in chunks))
+
+    async def test_stream_to_response(self):
+        async with ClientSession() as session:
+            async with session.get(self.server.make_url("/proxy")) as res:
+                body = await res.read()
+
+        self.assertEqual(body, PNG)
+        self.assertEqual(res.content_type, "image/png")
+        self.assertEqual(res.content_length, len(PNG))
+
+    async def test_stream_to_writer(self):
+        destination = BytesIO()
+
+        self.assertEqual(await self.image.stream_to(destination), len(PNG))
+        self.assertEqual(destination.getvalue(), PNG)
+
+    async def test_save_path_is_atomic(self):
+        path = Path(self.tmp.name) / "image.png"
+        await self.image.save(path)
+
+        self.assertEqual(path.read_bytes(), PNG)
+        self.assertEqual(os.listdir(self.tmp.name), ["image.png"])
+
+    def partial(self, data: bytes, validator: str = None) -> Path:
+        path = Path(self.tmp.name) / "image.png"
+        Path(str(path) + ".part").write_bytes(data)
+        if validator is not None:
+            Path(str(path) + ".part.validator").write_text(validator)
+        return path
+
+    async def test_resume_partial_file(self):
+        path = self.partial(PNG[:1000], ETAG)
+        await self.image.save(path)
+
+        self.assertEqual(path.read_bytes(), PNG)
+        self.assertEqual(self.ranges, ["bytes=1000-"])
+        self.assertEqual(os.listdir(self.tmp.name), ["image.png"])
+
+    async def test_stale_partial_file_restarts(self):
+        # Left over from a previous version of the image
+        for validator in ('"v1"', None):
+            path = self.partial(b"stale" * 100, validator)
+            await self.image.save(path)
+
+            self.assertEqual(path.read_bytes(), PNG)
+            self.assertEqual(os.listdir(self.tmp.name), ["image.png"])
+
+        self.assertEqual(self.ranges, ["bytes=500-", None])
+
+    async def test_mismatched_content_range_restarts(self):
+        self.range_start = 0
+        path = self.partial(PNG[:1000], ETAG)
+        await self.image.save(path)
+
+        self.assertEqual(path.read_bytes(), PNG)
+        self.assertEqual(self.ranges, ["bytes=1000-", None])
@@ -0,0 +1,54 @@
+import unittest
+from collections import defaultdict
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import CallbackSink
+from happyaccidentsapi.instrumentation import endpoint_name
+
+from .utils import INFERENCE, LocalClientAPI
+
+
+class TestInstrumentation(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        async def inference(request: web.Request):
+            return web.json_response(INFERENCE)
+
+        app = web.Application()
+        app.router.add_get("/v1/inferences/{id}", inference)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    def test_endpoint_name(self):
+        self.assertEqual(
+            endpoint_name("get", f"/inferences/{INFERENCE['inferenceId']}"),
+            "GET /inferences/{id}",
+        )
+        self.assertEqual(
+            endpoint_name(
+                "GET", "/models/metadata-items/841993c68c9b45e3a21d312508578e8f"
+            ),
+            "GET /models/metadata-items/{id}",
+        )
+        self.assertEqual(endpoint_name("POST", "/inference/"), "POST /inference/")
+
+    async def test_records_phases(self):
+        phases = defaultdict(dict)
+
+        def callback(endpoint, phase, seconds, status):
+            phases[endpoint][phase] = seconds
+
+        async with LocalClientAPI(
+            self.server, metrics_sink=CallbackSink(callback)
+        ) as api:
+            await api.fetch_inference(INFERENCE["inferenceId"])
+
+        recorded = phases["GET /inferences/{id}"]
+        self.assertLessEqual(
+            {"connect", "ttfb", "read", "validate", "total"}, set(recorded)
+        )
+        self.assertGreaterEqual(recorded["total"], recorded["ttfb"])
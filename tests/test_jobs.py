@@ -0,0 +1,134 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+
+from aiohttp import web
+
+from happyaccidentsapi import (
+    CompletionEstimator,
+    CreateInferenceParams,
+    JobQueue,
+    JobState,
+    PollingStrategy,
+    QueuePriority,
+)
+
+from .utils import FakeInferenceServer, LocalClientAPI
+
+
+def params(prompt: str) -> CreateInferenceParams:
+    return CreateInferenceParams(modelId="id", prompt=prompt)
+
+
+class JobServer(FakeInferenceServer):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.held = asyncio.Event()
+
+    async def on_create(self, request: web.Request, body: dict):
+        if body["prompt"] == "held":
+            await self.held.wait()
+        return None
+
+
+class TestJobQueue(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake = JobServer(polls_to_complete=2)
+        self.server = await self.fake.start()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.strategy = PollingStrategy(
+            min_delay=0.01,
+            estimator=CompletionEstimator(queue_wait=0.0, run_time=0.0),
+        )
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    def queue(self, **kwargs) -> JobQueue:
+        queue = JobQueue(
+            Path(self.tmp.name) / "jobs.db", polling_strategy=self.strategy, **kwargs
+        )
+        self.addCleanup(queue.close)
+        return queue
+
+    async def drain(self, queue: JobQueue) -> list:
+        async with LocalClientAPI(self.server, token="token", retry_policy=None) as api:
+            return [job async for job in queue.run(api)]
+
+    async def test_priority_and_backpressure(self):
+        queue = self.queue()
+        for i in range(4):
+            queue.submit(params(f"slow {i}"), QueuePriority.TEN_MINUTES)
+        queue.submit(params("fast"), QueuePriority.ONE_SECOND)
+
+        jobs = await self.drain(queue)
+
+        self.assertEqual(len(jobs), 5)
+        self.assertTrue(all(job.state == JobState.COMPLETED for job in jobs))
+        self.assertEqual(self.fake.created[0], "fast")
+        self.assertLessEqual(self.fake.max_in_flight, 2)
+        self.assertEqual(len(queue), 0)
+
+    async def test_cancel_and_deadline(self):
+        queue = self.queue()
+        cancelled = queue.submit(params("cancelled"))
+        expired = queue.submit(params("expired"), deadline=0)
+        queue.submit(params("beach"))
+
+        self.assertTrue(queue.cancel(cancelled))
+        jobs = await self.drain(queue)
+
+        self.assertEqual(
+            [(job.id, job.state) for job in jobs if job.state != JobState.COMPLETED],
+            [(expired, JobState.EXPIRED)],
+        )
+        self.assertEqual(self.fake.created, ["beach"])
+        self.assertEqual(queue.get(cancelled).state, JobState.CANCELLED)
+        self.assertFalse(queue.cancel(cancelled))
+
+    async def test_resumes_after_restart(self):
+        self.fake.polls_to_complete = 1
+        self.strategy.estimator.run_time = 60.0
+        queue = self.queue()
+        job_id = queue.submit(params("beach"))
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(self.drain(queue), 0.5)
+
+        self.assertEqual(queue.get(job_id).state, JobState.SUBMITTED)
+        queue.close()
+
+        # A new process picks up the journal and polls instead of resubmitting
+        jobs = await self.drain(self.queue())
+
+        self.assertEqual([job.id for job in jobs], [job_id])
+        self.assertEqual(jobs[0].result.status.value, "COMPLETED")
+        self.assertEqual(self.fake.created, ["beach"])
+
+    async def test_transient_poll_errors_are_retried(self):
+        self.fake.flaky_polls = 3
+        queue = self.queue()
+        queue.submit(params("beach"))
+
+        jobs = await self.drain(queue)
+
+        self.assertEqual(jobs[0].state, JobState.COMPLETED)
+        self.assertEqual(self.fake.flaky_polls, 0)
+
+    async def test_each_submission_is_journaled_on_its_own(self):
+        queue = self.queue()
+        held = queue.submit(params("held"), QueuePriority.ONE_SECOND)
+        job_id = queue.submit(params("beach"))
+        task = asyncio.ensure_future(self.drain(queue))
+        await asyncio.sleep(0.2)
+        submitted, waiting = queue.get(job_id), queue.get(held)
+        self.fake.held.set()
+        jobs = await asyncio.wait_for(task, 5)
+
+        # Accepted while the other submission was still waiting for an answer
+        self.assertEqual(submitted.state, JobState.SUBMITTED)
+        self.assertIsNotNone(submitted.inference_id)
+        self.assertEqual(waiting.state, JobState.QUEUED)
+        self.assertEqual(len(jobs), 2)
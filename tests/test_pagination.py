@@ -0,0 +1,79 @@
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from .utils import INFERENCE, METADATA_ITEM, LocalClientAPI
+
+
+def page_of(request, total, page_key, size_key, first_page=0):
+    page = int(request.query[page_key])
+    size = int(request.query[size_key])
+    start = (page - first_page) * size
+    return page, size, range(start, min(start + size, total))
+
+
+class TestPagination(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requested = []
+
+        async def inferences(request: web.Request):
+            page, size, indexes = page_of(request, 25, "current_page", "page_size")
+            self.requested.append(page)
+            return web.json_response(
+                {
+                    "items": [INFERENCE for _ in indexes],
+                    "paginationMetadata": {"currentPage": page, "pageSize": size},
+                }
+            )
+
+        async def metadata_items(request: web.Request):
+            page, size, indexes = page_of(request, 35, "currentPage", "pageSize", 1)
+            self.requested.append(page)
+            items = [{**METADATA_ITEM, "id": str(i)} for i in indexes]
+            return web.json_response(
+                {
+                    "items": items,
+                    "paginationMetadata": {
+                        "currentPage": page,
+                        "pageSize": size,
+                        "totalItems": 35,
+                    },
+                }
+            )
+
+        app = web.Application()
+        app.router.add_get("/v1/inferences/", inferences)
+        app.router.add_get("/v1/models/metadata-items", metadata_items)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_unknown_total_stops_on_short_page(self):
+        async with LocalClientAPI(self.server, token="token") as api:
+            items = [item async for item in api.iter_inferences(page_size=10)]
+
+        self.assertEqual(len(items), 25)
+        self.assertEqual(self.requested, [0, 1, 2])
+
+    async def test_known_total_fetches_in_order(self):
+        async with LocalClientAPI(self.server) as api:
+            items = [
+                item.id
+                async for item in api.iter_metadata_items(page_size=10, concurrency=3)
+            ]
+
+        self.assertEqual(items, [str(i) for i in range(35)])
+        self.assertEqual(sorted(self.requested), [1, 2, 3, 4])
+
+    async def test_no_prefetch_stops_where_consumer_stops(self):
+        async with LocalClientAPI(self.server) as api:
+            items = api.iter_metadata_items(page_size=10, prefetch=False)
+            async for item in items:
+                if item.id == "15":
+                    break
+            await items.aclose()
+
+        self.assertEqual(self.requested, [1, 2])
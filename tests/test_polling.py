@@ -0,0 +1,69 @@
+import unittest
+
+from happyaccidentsapi import (
+    CompletionEstimator,
+    CreateInferenceParams,
+    InferenceHistoricalResult,
+    PollingStrategy,
+)
+from happyaccidentsapi.errors import InferenceTimeout
+
+from .utils import FakeInferenceServer, LocalClientAPI
+
+
+class TestPollingStrategy(unittest.TestCase):
+    def test_first_delay_uses_estimate(self):
+        estimator = CompletionEstimator(queue_wait=1.0, run_time=2.0)
+        strategy = PollingStrategy(estimator=estimator)
+
+        self.assertEqual(strategy.first_delay(), 3.0)
+        self.assertEqual(strategy.first_delay(ahead=2), 7.0)
+
+    def test_backoff_is_capped(self):
+        strategy = PollingStrategy(
+            min_delay=1.0,
+            max_delay=4.0,
+            factor=2.0,
+            jitter=0.0,
+            timeout=None,
+            estimator=CompletionEstimator(queue_wait=0.0, run_time=0.0),
+        )
+        delays = strategy.delays()
+
+        self.assertEqual([next(delays) for _ in range(6)], [1, 1, 2, 4, 4, 4])
+
+    def test_estimator_learns(self):
+        estimator = CompletionEstimator()
+        estimator.observe(10.0, queue_wait=4.0, run_time=6.0)
+
+        self.assertEqual(estimator.estimate(), 10.0)
+
+
+class TestCreateInference(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake = FakeInferenceServer(polls_to_complete=3)
+        self.server = await self.fake.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_polls_until_completed(self):
+        estimator = CompletionEstimator(queue_wait=0.0, run_time=0.0)
+        strategy = PollingStrategy(min_delay=0.01, estimator=estimator)
+        params = CreateInferenceParams(modelId="id", prompt="beach")
+
+        async with LocalClientAPI(self.server, token="token") as api:
+            obj = await api.create_inference(params, polling_strategy=strategy)
+
+        self.assertIsInstance(obj, InferenceHistoricalResult)
+        self.assertEqual(self.fake.poll_count, 3)
+        self.assertEqual(estimator.observations, 1)
+
+    async def test_timeout(self):
+        strategy = PollingStrategy(min_delay=0.01, timeout=0.05)
+        params = CreateInferenceParams(modelId="id", prompt="beach")
+        self.fake.polls_to_complete = None
+
+        async with LocalClientAPI(self.server, token="token") as api:
+            with self.assertRaises(InferenceTimeout):
+                await api.create_inference(params, polling_strategy=strategy)
@@ -0,0 +1,141 @@
+import asyncio
+import unittest
+from collections import Counter
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import (
+    ClientAPI,
+    ClientPool,
+    CompletionEstimator,
+    CreateInferenceParams,
+    PollingStrategy,
+)
+from happyaccidentsapi.errors import PoolExhausted
+
+from .utils import FakeInferenceServer, token_of
+
+
+class PoolClientAPI(ClientAPI):
+    server: TestServer = None
+
+    def _get_url(self):
+        return str(self.server.make_url("/v1"))
+
+
+class LocalClientPool(ClientPool):
+    client_class = PoolClientAPI
+
+
+class PoolServer(FakeInferenceServer):
+    async def on_create(self, request: web.Request, body: dict):
+        token = token_of(request)
+        if token == "bad":
+            return web.json_response({"detail": "bad token"}, status=401)
+        if token == "busy":
+            return web.json_response(
+                {"detail": "slow down"}, status=429, headers={"Retry-After": "60"}
+            )
+
+        await asyncio.sleep(0.01)
+        return None
+
+
+class TestClientPool(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake = PoolServer(poll_latency=0.01)
+        self.server = await self.fake.start()
+        PoolClientAPI.server = self.server
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    def pool(self, *tokens: str) -> ClientPool:
+        return LocalClientPool(tokens, skip_token_validation=True)
+
+    def strategy(self) -> PollingStrategy:
+        estimator = CompletionEstimator(queue_wait=0.0, run_time=0.0)
+        return PollingStrategy(min_delay=0.01, estimator=estimator)
+
+    async def test_spreads_load(self):
+        params = CreateInferenceParams(modelId="id", prompt="beach")
+
+        async with self.pool("a", "b") as pool:
+            await asyncio.gather(
+                *(
+                    pool.create_inference(params, polling_strategy=self.strategy())
+                    for _ in range(4)
+                )
+            )
+
+        self.assertEqual(self.fake.created_by, {"a": 2, "b": 2})
+        self.assertEqual(Counter(self.fake.polled_by), {"a": 2, "b": 2})
+
+    async def test_unauthorized_is_drained(self):
+        params = CreateInferenceParams(modelId="id", prompt="beach")
+
+        async with self.pool("bad", "good") as pool:
+            inference = await pool.create_inference(params, wait_for_response=False)
+            await pool.fetch_inference(inference.inferenceId)
+
+            self.assertEqual([client._token for client in pool.healthy], ["good"])
+
+        self.assertEqual(self.fake.created_by, {"good": 1})
+        self.assertEqual(self.fake.polled_by, ["good"])
+
+    async def test_throttled_is_drained_for_retry_after(self):
+        params = CreateInferenceParams(modelId="id", prompt="beach")
+
+        async with self.pool("busy", "good") as pool:
+            await pool.create_inference(params, wait_for_response=False)
+            busy = pool.clients[0]
+
+            self.assertNotIn(busy, pool.healthy)
+            self.assertLess(pool._members[0].drained_until, float("inf"))
+
+            pool.restore(busy)
+            self.assertIn(busy, pool.healthy)
+
+    async def test_exhausted(self):
+        params = CreateInferenceParams(modelId="id", prompt="beach")
+
+        async with self.pool("bad") as pool:
+            with self.assertRaises(web.HTTPUnauthorized):
+                await pool.create_inference(params, wait_for_response=False)
+            with self.assertRaises(PoolExhausted):
+                await pool.create_inference(params, wait_for_response=False)
+
+    async def test_create_inferences(self):
+        params = [CreateInferenceParams(modelId="id", prompt=str(i)) for i in range(6)]
+
+        async with self.pool("a", "b") as pool:
+            results = [
+                result
+                async for result in pool.create_inferences(
+                    params, concurrency=4, polling_strategy=self.strategy()
+                )
+            ]
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(sum(self.fake.created_by.values()), 6)
+
+    async def test_create_inferences_polls_on_one_tick(self):
+        params = [CreateInferenceParams(modelId="id", prompt=str(i)) for i in range(4)]
+        estimator = CompletionEstimator(queue_wait=0.3, run_time=0.0)
+        strategy = PollingStrategy(min_delay=0.1, estimator=estimator)
+
+        async with self.pool("bad", "a", "b") as pool:
+            results = [
+                result
+                async for result in pool.create_inferences(
+                    params, polling_strategy=strategy
+                )
+            ]
+            self.assertEqual([member.in_flight for member in pool._members], [0] * 3)
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(self.fake.created_by, {"a": 2, "b": 2})
+        # Every inference is polled once, on its own account, in one tick
+        self.assertEqual(Counter(self.fake.polled_by), {"a": 2, "b": 2})
+        self.assertEqual(self.fake.max_polling, 4)
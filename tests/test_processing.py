@@ -0,0 +1,116 @@
+import hashlib
+import importlib.util
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import (
+    DuplicateFilter,
+    ImageRecord,
+    InferenceHistoricalResult,
+    ProcessingPipeline,
+    Thumbnail,
+    perceptual_hash,
+    sha256,
+)
+
+from .utils import INFERENCE
+
+BODIES = {str(i): os.urandom(4 * 1024) for i in range(6)}
+
+
+def broken(path: Path) -> None:
+    raise ValueError("broken hook")
+
+
+class TestDuplicateFilter(unittest.TestCase):
+    def test_near_hashes_match(self):
+        duplicates = DuplicateFilter(threshold=2)
+
+        self.assertIsNone(duplicates.check(0b1011_0000, Path("a")))
+        self.assertEqual(duplicates.check(0b1011_0011, Path("b")), Path("a"))
+        self.assertIsNone(duplicates.check(0b0100_1111, Path("c")))
+
+
+class TestProcessingPipeline(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        async def image(request: web.Request):
+            return web.Response(body=BODIES[request.match_info["name"]])
+
+        app = web.Application()
+        app.router.add_get("/{name}", image)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        patcher = mock.patch.object(
+            ImageRecord,
+            "get_url",
+            lambda image: str(self.server.make_url(f"/{image.id}")),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+        images = [{**INFERENCE["images"][0], "id": name} for name in BODIES]
+        self.result = InferenceHistoricalResult.model_validate(
+            {**INFERENCE, "images": images}
+        )
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def run_pipeline(self, pipeline: ProcessingPipeline, source) -> list:
+        with pipeline:
+            return [item async for item in pipeline.process(source, self.tmp.name)]
+
+    async def test_hooks_run_in_threads(self):
+        pipeline = ProcessingPipeline(
+            {"sha256": sha256, "broken": broken}, workers=2, queue_size=1
+        )
+
+        async def source():
+            yield self.result
+
+        processed = await self.run_pipeline(pipeline, source())
+
+        self.assertEqual(len(processed), len(BODIES))
+        for item in processed:
+            digest = hashlib.sha256(BODIES[item.image.id]).hexdigest()
+            self.assertEqual(item.results, {"sha256": digest})
+            self.assertIsInstance(item.errors["broken"], ValueError)
+
+    async def test_hooks_run_in_processes(self):
+        pipeline = ProcessingPipeline({"sha256": sha256}, executor="process", workers=2)
+
+        processed = await self.run_pipeline(pipeline, self.result.images)
+
+        self.assertEqual(
+            {item.results["sha256"] for item in processed},
+            {hashlib.sha256(body).hexdigest() for body in BODIES.values()},
+        )
+
+    async def test_duplicates(self):
+        pipeline = ProcessingPipeline(
+            {"phash": lambda path: 1}, duplicates=DuplicateFilter()
+        )
+
+        processed = await self.run_pipeline(pipeline, [self.result])
+
+        originals = [item for item in processed if item.duplicate_of is None]
+        self.assertEqual(len(originals), 1)
+
+    @unittest.skipUnless(importlib.util.find_spec("PIL"), "requires Pillow")
+    async def test_image_hooks(self):  # pragma: no cover
+        from PIL import Image
+
+        path = Path(self.tmp.name) / "image.png"
+        Image.new("RGB", (64, 64), "red").save(path)
+
+        self.assertEqual(perceptual_hash(path), 0)
+        self.assertTrue(Thumbnail((16, 16))(path).exists())
@@ -0,0 +1,28 @@
+import json
+import unittest
+
+from happyaccidentsapi import MetadataItems, ModelStats, Projection
+from happyaccidentsapi.enums import CivitAiModelType
+
+from .utils import METADATA_ITEM
+
+PAGINATION = {"currentPage": 1, "pageSize": 10, "totalItems": 1}
+
+
+class TestProjection(unittest.TestCase):
+    def test_keeps_only_requested_fields(self):
+        body = json.dumps({"items": [METADATA_ITEM], "paginationMetadata": PAGINATION})
+        projection = Projection(MetadataItems, ["id", "name", "type", "ratings"])
+
+        page = projection.validate(body)
+        item = page.first()
+
+        self.assertIsInstance(item, tuple)
+        self.assertEqual(item._fields, ("id", "name", "type", "ratings"))
+        self.assertEqual(item.type, CivitAiModelType.CHECKPOINT)
+        self.assertIsInstance(item.ratings, ModelStats)
+        self.assertEqual(page.paginationMetadata.totalItems, 1)
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            Projection(MetadataItems, ["id", "size"])
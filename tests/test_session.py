@@ -0,0 +1,129 @@
+import asyncio
+import copy
+import pickle
+import unittest
+from collections import Counter
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import InferenceHistoricalResult
+from happyaccidentsapi.sync import background_loop
+
+from .utils import INFERENCE, LocalClientAPI
+
+
+class TestSession(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.peers = set()
+        self.probes = Counter()
+
+        async def inference(request: web.Request):
+            self.peers.add(request.transport.get_extra_info("peername"))
+            return web.json_response(INFERENCE)
+
+        async def probe(request: web.Request):
+            self.peers.add(request.transport.get_extra_info("peername"))
+            self.probes[request.path] += 1
+            await asyncio.sleep(0.01)
+            return web.Response(status=404, text="Not Found")
+
+        app = web.Application()
+        app.router.add_get("/v1/inferences/{id}", inference)
+        app.router.add_get("/v1/", probe)
+        app.router.add_get("/images/", probe)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_connection_reused(self):
+        async with LocalClientAPI(self.server) as api:
+            for _ in range(5):
+                obj = await api.fetch_inference(INFERENCE["inferenceId"])
+                self.assertIsInstance(obj, InferenceHistoricalResult)
+
+            self.assertEqual(len(self.peers), 1)
+            self.assertIs(obj.images[0]._client, api)
+
+        self.assertIsNone(api._session)
+
+    async def test_results_can_be_copied(self):
+        async with LocalClientAPI(self.server) as api:
+            obj = await api.fetch_inference(INFERENCE["inferenceId"])
+
+            copied = copy.deepcopy(obj)
+            pickled = pickle.loads(pickle.dumps(obj))
+
+        self.assertEqual(copied, obj)
+        self.assertIs(copied.images[0]._client, api)
+        self.assertEqual(pickled.model_dump(), obj.model_dump())
+        self.assertIsNone(pickled.images[0]._client)
+
+    async def test_warm_up_opens_connections(self):
+        async with LocalClientAPI(self.server) as api:
+            self.assertEqual(await api.warm_up(connections=3, image_connections=1), 4)
+            warm = set(self.peers)
+            await asyncio.gather(
+                *(api.fetch_inference(INFERENCE["inferenceId"]) for _ in range(3))
+            )
+
+        self.assertEqual(self.probes, {"/v1/": 3, "/images/": 1})
+        self.assertEqual(len(warm), 4)
+        self.assertEqual(self.peers, warm)
+
+    async def test_eager_keepalive(self):
+        api = LocalClientAPI(self.server, eager=True, keepalive_interval=0.02)
+        async with api:
+            self.assertEqual(self.probes, {"/v1/": 4, "/images/": 2})
+            for _ in range(100):
+                if self.probes["/v1/"] > 4:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertGreater(self.probes["/v1/"], 4)
+
+        self.assertIsNone(api._keepalive_task)
+
+
+class TestSessionAcrossLoops(unittest.TestCase):
+    def setUp(self):
+        async def inference(request: web.Request):
+            return web.json_response(INFERENCE)
+
+        app = web.Application()
+        app.router.add_get("/v1/inferences/{id}", inference)
+        self.loop = background_loop()
+        self.server = TestServer(app)
+        self.loop.run(self.server.start_server())
+
+    def tearDown(self):
+        self.loop.run(self.server.close())
+
+    def test_client_reused_across_asyncio_run(self):
+        api = LocalClientAPI(self.server)
+        sessions = []
+
+        async def fetch():
+            result = await api.fetch_inference(INFERENCE["inferenceId"])
+            sessions.append(api._session)
+            return result
+
+        for _ in range(2):
+            self.assertIsInstance(asyncio.run(fetch()), InferenceHistoricalResult)
+
+        # Each loop had its own session, closed when asyncio.run finished
+        self.assertIsNot(sessions[0], sessions[1])
+        self.assertTrue(all(session.closed for session in sessions))
+
+    def test_session_of_another_running_loop_is_closed(self):
+        api = LocalClientAPI(self.server)
+        self.loop.run(api.fetch_inference(INFERENCE["inferenceId"]))
+        session = api._session
+
+        asyncio.run(api.fetch_inference(INFERENCE["inferenceId"]))
+        # Its owner task closes it on the background loop
+        self.loop.run(asyncio.sleep(0.05))
+
+        self.assertTrue(session.closed)
+        self.assertIsNot(api._session, session)
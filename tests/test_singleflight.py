@@ -0,0 +1,89 @@
+import asyncio
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi._singleflight import SingleFlight
+
+from .utils import INFERENCE, LocalClientAPI
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    async def test_cancelled_waiter_keeps_shared_call(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def func():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(flight.do("key", func))
+        second = asyncio.ensure_future(flight.do("key", func))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual(await second, "done")
+        self.assertTrue(first.cancelled())
+        self.assertEqual(calls, 1)
+        self.assertEqual(len(flight), 0)
+
+    async def test_new_caller_does_not_join_a_cancelled_call(self):
+        flight = SingleFlight()
+        cleanup = asyncio.Event()
+        calls = 0
+
+        async def func():
+            nonlocal calls
+            calls += 1
+            if calls > 1:
+                return calls
+            try:
+                await asyncio.sleep(10)
+            finally:
+                await cleanup.wait()  # awaits while being cancelled
+
+        first = asyncio.ensure_future(flight.do("key", func))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+
+        second = asyncio.ensure_future(flight.do("key", func))
+        await asyncio.sleep(0)
+        cleanup.set()
+
+        self.assertEqual(await second, 2)
+        self.assertTrue(first.cancelled())
+        self.assertEqual(len(flight), 0)
+
+
+class TestCoalescing(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = 0
+
+        async def inference(request: web.Request):
+            self.requests += 1
+            await asyncio.sleep(0.05)
+            return web.json_response(INFERENCE)
+
+        app = web.Application()
+        app.router.add_get("/v1/inferences/{id}", inference)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_identical_gets_share_one_request(self):
+        async with LocalClientAPI(self.server) as api:
+            results = await asyncio.gather(
+                *(api.fetch_inference(INFERENCE["inferenceId"]) for _ in range(10))
+            )
+
+        self.assertEqual(self.requests, 1)
+        self.assertTrue(all(result is results[0] for result in results))
@@ -0,0 +1,107 @@
+import os
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import InferenceHistoricalResult, SyncClientAPI
+from happyaccidentsapi.sync import background_loop
+
+from .utils import INFERENCE, LocalClientAPI
+
+
+class LocalSyncClientAPI(SyncClientAPI):
+    client_class = LocalClientAPI
+
+
+class TestSyncClientAPI(unittest.TestCase):
+    def setUp(self):
+        self.peers = set()
+        self.probes = 0
+
+        async def probe(request: web.Request):
+            self.probes += 1
+            return web.Response()
+
+        async def inference(request: web.Request):
+            self.peers.add(request.transport.get_extra_info("peername"))
+            return web.json_response(INFERENCE)
+
+        async def inferences(request: web.Request):
+            return web.json_response(
+                {
+                    "items": [INFERENCE] * 3,
+                    "paginationMetadata": {"currentPage": 0, "pageSize": 10},
+                }
+            )
+
+        app = web.Application()
+        app.router.add_get("/v1/inferences/{id}", inference)
+        app.router.add_get("/v1/inferences/", inferences)
+        app.router.add_get("/v1/", probe)
+        self.loop = background_loop()
+        self.server = TestServer(app)
+        self.loop.run(self.server.start_server())
+
+    def tearDown(self):
+        self.loop.run(self.server.close())
+
+    def test_blocking_calls_share_connections(self):
+        with LocalSyncClientAPI(self.server, token="token") as api:
+            with ThreadPoolExecutor(4) as pool:
+                results = list(
+                    pool.map(
+                        lambda _: api.fetch_inference(INFERENCE["inferenceId"]),
+                        range(20),
+                    )
+                )
+
+            items = list(api.iter_inferences(page_size=10))
+
+        self.assertTrue(all(isinstance(r, InferenceHistoricalResult) for r in results))
+        self.assertEqual(len(items), 3)
+        self.assertLessEqual(len(self.peers), 4)
+
+    def test_eager_and_keepalive(self):
+        with LocalSyncClientAPI(
+            self.server, token="token", eager=True, keepalive_interval=0.05
+        ) as api:
+            # The warm-up ran on construction
+            self.assertGreaterEqual(self.probes, 4)
+            probes = self.probes
+            time.sleep(0.2)
+            self.assertGreater(self.probes, probes)
+
+            api.stop_keepalive()
+            api.start_keepalive(0.05, connections=1, image_connections=0)
+            probes = self.probes
+            time.sleep(0.2)
+            self.assertGreater(self.probes, probes)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_usable_after_fork(self):
+        with LocalSyncClientAPI(self.server, token="token") as api:
+            api.fetch_inference(INFERENCE["inferenceId"])
+
+            pid = os.fork()
+            if pid == 0:
+                code = 1
+                try:
+                    api.fetch_inference(INFERENCE["inferenceId"])
+                    code = 0
+                finally:
+                    os._exit(code)
+
+            deadline = time.monotonic() + 10
+            while True:
+                done, status = os.waitpid(pid, os.WNOHANG)
+                if done:
+                    break
+                if time.monotonic() > deadline:
+                    os.kill(pid, 9)
+                    self.fail("the forked child hung")
+                time.sleep(0.05)
+
+        self.assertEqual(status, 0)
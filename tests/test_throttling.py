@@ -0,0 +1,96 @@
+import asyncio
+import time
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import (
+    CreateInferenceParams,
+    InferenceHistoricalResult,
+    RateLimiter,
+    RetryPolicy,
+    TokenBucket,
+)
+from happyaccidentsapi.throttling import parse_retry_after
+
+from .utils import INFERENCE, LocalClientAPI
+
+
+class TestTokenBucket(unittest.IsolatedAsyncioTestCase):
+    async def test_waits_when_empty(self):
+        bucket = TokenBucket(rate=100, capacity=2)
+        self.assertEqual(await bucket.acquire(), 0.0)
+        self.assertEqual(await bucket.acquire(), 0.0)
+        self.assertGreater(await bucket.acquire(), 0.0)
+
+    def test_longest_prefix_wins(self):
+        default, inference = TokenBucket(1), TokenBucket(2)
+        limiter = RateLimiter(default, {"/inference": inference})
+
+        self.assertIs(limiter.bucket_for("/inference/"), inference)
+        self.assertIs(limiter.bucket_for("/inferences/1"), inference)
+        self.assertIs(limiter.bucket_for("/models/models"), default)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("2"), 2.0)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+class TestTokenBucketLoop(unittest.TestCase):
+    def test_built_outside_the_loop(self):
+        bucket = TokenBucket(rate=1000, capacity=1)
+
+        async def contend():
+            return await asyncio.gather(*(bucket.acquire() for _ in range(5)))
+
+        for _ in range(2):
+            self.assertEqual(len(asyncio.run(contend())), 5)
+        self.assertIsNotNone(bucket._lock)
+
+
+class TestRetries(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.responses = []
+
+        async def handler(request: web.Request):
+            status, headers = self.responses.pop(0)
+            if status == 200:
+                return web.json_response(INFERENCE)
+            return web.json_response(
+                {"detail": "error"}, status=status, headers=headers
+            )
+
+        app = web.Application()
+        app.router.add_get("/v1/inferences/{id}", handler)
+        app.router.add_post("/v1/inference/", handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_retry_after_is_honored(self):
+        self.responses = [(429, {"Retry-After": "0.1"}), (502, {}), (200, {})]
+        policy = RetryPolicy(backoff=0.01)
+
+        async with LocalClientAPI(self.server, retry_policy=policy) as api:
+            started = time.monotonic()
+            obj = await api.fetch_inference(INFERENCE["inferenceId"])
+
+        self.assertIsInstance(obj, InferenceHistoricalResult)
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+        self.assertEqual(api.throttle_metrics.throttled_responses, 1)
+        self.assertEqual(api.throttle_metrics.server_errors, 1)
+        self.assertEqual(api.throttle_metrics.retries, 2)
+
+    async def test_post_is_not_retried_on_server_error(self):
+        self.responses = [(500, {}), (200, {})]
+        params = CreateInferenceParams(modelId="id", prompt="beach")
+
+        async with LocalClientAPI(self.server, token="token") as api:
+            with self.assertRaises(web.HTTPInternalServerError):
+                await api.create_inference(params, wait_for_response=False)
+
+        self.assertEqual(len(self.responses), 1)
@@ -0,0 +1,120 @@
+import asyncio
+import unittest
+
+from aiohttp import ClientSession
+
+from happyaccidentsapi import (
+    CompletionEstimator,
+    CreateInferenceParams,
+    PollingStrategy,
+    WebhookReceiver,
+)
+from happyaccidentsapi.errors import InferenceTimeout
+
+from .utils import INFERENCE, FakeInferenceServer, LocalClientAPI
+
+
+class TestWebhookReceiver(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake = FakeInferenceServer(unique_ids=False)
+        self.receiver = WebhookReceiver(fallback_after=5.0)
+        self.server = await self.fake.start(self.receiver.create_app())
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def send(self, data: dict) -> dict:
+        event = {"id": "event", "type": "inference.completed", "data": data}
+        async with ClientSession() as session:
+            async with session.post(
+                self.server.make_url("/webhooks"), json=event
+            ) as response:
+                return await response.json()
+
+    def strategy(self) -> PollingStrategy:
+        estimator = CompletionEstimator(queue_wait=0.0, run_time=0.0)
+        return PollingStrategy(min_delay=0.01, estimator=estimator)
+
+    async def test_event_completes_inference(self):
+        params = CreateInferenceParams(modelId="id", prompt="beach")
+
+        async with LocalClientAPI(
+            self.server, token="token", webhook_receiver=self.receiver
+        ) as api:
+            task = asyncio.ensure_future(
+                api.create_inference(params, polling_strategy=self.strategy())
+            )
+            await asyncio.sleep(0.05)
+            self.assertEqual(await self.send(INFERENCE), {"dispatched": True})
+            obj = await asyncio.wait_for(task, 1)
+
+        self.assertEqual(str(obj.inferenceId), INFERENCE["inferenceId"])
+        self.assertIs(obj.images[0]._client, api)
+        # The event only wakes the client up, the result is fetched
+        self.assertEqual(self.fake.poll_count, 1)
+
+    async def test_partial_event_triggers_poll(self):
+        params = CreateInferenceParams(modelId="id", prompt="beach")
+        data = {"inferenceId": INFERENCE["inferenceId"], "status": "COMPLETED"}
+
+        async with LocalClientAPI(
+            self.server, token="token", webhook_receiver=self.receiver
+        ) as api:
+            task = asyncio.ensure_future(
+                api.create_inference(params, polling_strategy=self.strategy())
+            )
+            await asyncio.sleep(0.05)
+            await self.send({"inference": data})
+            await asyncio.wait_for(task, 1)
+
+        self.assertEqual(self.fake.poll_count, 1)
+
+    async def test_forged_event_is_not_returned(self):
+        params = CreateInferenceParams(modelId="id", prompt="beach")
+        forged = {**INFERENCE, "status": "FAILED", "images": []}
+
+        async with LocalClientAPI(
+            self.server, token="token", webhook_receiver=self.receiver
+        ) as api:
+            task = asyncio.ensure_future(
+                api.create_inference(params, polling_strategy=self.strategy())
+            )
+            await asyncio.sleep(0.05)
+            await self.send(forged)
+            obj = await asyncio.wait_for(task, 1)
+
+        self.assertEqual(obj.status, "COMPLETED")
+        self.assertEqual(len(obj.images), len(INFERENCE["images"]))
+
+    async def test_falls_back_to_polling(self):
+        self.receiver.fallback_after = 0.01
+        params = CreateInferenceParams(modelId="id", prompt="beach")
+
+        async with LocalClientAPI(
+            self.server, token="token", webhook_receiver=self.receiver
+        ) as api:
+            await api.create_inference(params, polling_strategy=self.strategy())
+
+        self.assertEqual(self.fake.poll_count, 1)
+        self.assertEqual(self.receiver._pending, {})
+
+    async def test_early_event_is_kept(self):
+        await self.send(INFERENCE)
+        future = self.receiver.register(INFERENCE["inferenceId"])
+
+        self.assertTrue(future.done())
+
+    async def test_webhook_wait_counts_against_timeout(self):
+        self.receiver.fallback_after = 10.0
+        self.fake.polls_to_complete = None
+        strategy = self.strategy()
+        strategy.timeout = 0.1
+        params = CreateInferenceParams(modelId="id", prompt="beach")
+
+        async with LocalClientAPI(
+            self.server, token="token", webhook_receiver=self.receiver
+        ) as api:
+            with self.assertRaises(InferenceTimeout):
+                await asyncio.wait_for(
+                    api.create_inference(params, polling_strategy=strategy), 1
+                )
@@ -0,0 +1,211 @@
+import asyncio
+import uuid
+from collections import Counter
+from typing import List, Optional
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from happyaccidentsapi import ClientAPI
+
+INFERENCE = {
+    "inferenceId": "425ef8f4-32b9-4728-a3f0-ba9214e1efda",
+    "userId": "8e6d1e1c-4f1b-4c8a-9d55-0d1c1b5c7f3a",
+    "inferencePayload": {
+        "modelId": "841993c68c9b45e3a21d312508578e8f",
+        "prompt": "beach",
+    },
+    "images": [
+        {
+            "id": "f7f6ad9c-b6b0-4bc7-a3fe-f890e3aba68f",
+            "folderPath": "folder",
+            "filename": "result-0.png",
+            "createdAt": "2023-07-01T00:00:00",
+            "userId": "8e6d1e1c-4f1b-4c8a-9d55-0d1c1b5c7f3a",
+            "inferenceJobId": "425ef8f4-32b9-4728-a3f0-ba9214e1efda",
+            "favorite": False,
+            "nsfw": False,
+        }
+    ],
+    "status": "COMPLETED",
+    "inferenceType": "TEXT_TO_IMAGE",
+}
+
+CREATED_INFERENCE = {
+    "inferenceId": INFERENCE["inferenceId"],
+    "userId": INFERENCE["userId"],
+    "inferenceType": "TEXT_TO_IMAGE",
+    "inferencePayload": INFERENCE["inferencePayload"],
+    "createdAt": "2023-07-01T00:00:00",
+    "status": "PENDING",
+    "violatesTos": False,
+}
+
+METADATA_ITEM = {
+    "id": "841993c68c9b45e3a21d312508578e8f",
+    "name": "Stable Diffusion v1.5",
+    "activeVersionId": "a1",
+    "externalId": 1,
+    "type": "Checkpoint",
+    "allowCommercialUse": "Rent",
+    "allowNoCredit": True,
+    "nsfw": False,
+    "description": "Base model",
+    "requestingUserId": "user",
+    "createdAt": "2023-07-01T00:00:00",
+    "ratings": {"downloadCount": 10, "rating": 4.5},
+    "downloadStatus": "COMPLETED",
+    "tags": ["base"],
+    "trainedWords": [],
+    "versionMetadataItems": [
+        {
+            "name": "v1.5",
+            "id": "a1",
+            "modelMetadataItemId": "841993c68c9b45e3a21d312508578e8f",
+            "externalId": 2,
+            "baseModel": "SD 1.5",
+            "description": "",
+            "downloadUrl": "https://civitai.com/api/download/models/2",
+            "images": [
+                {
+                    "url": "https://civitai.com/images/1.png",
+                    "nsfw": False,
+                    "width": 512,
+                    "height": 512,
+                }
+            ],
+            "files": [
+                {
+                    "name": "model.safetensors",
+                    "id": 3,
+                    "sizeKb": 2048.0,
+                    "type": "Model",
+                }
+            ],
+        }
+    ],
+}
+
+
+class LocalClientAPI(ClientAPI):
+    def __init__(self, server: TestServer, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._server = server
+
+    def _get_url(self):
+        return str(self._server.make_url("/v1"))
+
+    def _get_image_url(self):
+        return str(self._server.make_url("/images/"))
+
+
+def token_of(request: web.Request) -> str:
+    return request.headers.get("Authorization", "").split()[-1]
+
+
+class FakeInferenceServer:
+    """
+    Inference endpoints of the API: every created inference completes on its
+    ``polls_to_complete``-th poll (never if None).
+
+    With ``unique_ids=False`` every inference is ``INFERENCE``, e.g. so a
+    webhook event about it can be sent. Subclasses answer a request
+    differently by returning a response from ``on_create`` or ``on_poll``.
+    """
+
+    def __init__(
+        self,
+        polls_to_complete: Optional[int] = 1,
+        max_queue_depth: int = 2,
+        unique_ids: bool = True,
+        poll_latency: float = 0.0,
+    ) -> None:
+        self.polls_to_complete = polls_to_complete
+        self.max_queue_depth = max_queue_depth
+        self.unique_ids = unique_ids
+        self.poll_latency = poll_latency
+        # Polls answered with a 502 before any other
+        self.flaky_polls = 0
+
+        self.created: List[str] = []  # prompts, in submission order
+        self.created_by: Counter = Counter()  # per token
+        self.polled_by: List[str] = []  # tokens
+        self.polls: Counter = Counter()  # per inference id
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.polling = 0
+        self.max_polling = 0
+
+    @property
+    def poll_count(self) -> int:
+        return sum(self.polls.values())
+
+    async def on_create(
+        self, request: web.Request, body: dict
+    ) -> Optional[web.Response]:
+        return None
+
+    async def on_poll(self, request: web.Request) -> Optional[web.Response]:
+        return None
+
+    async def create(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        response = await self.on_create(request, body)
+        if response is not None:
+            return response
+
+        self.created.append(body["prompt"])
+        self.created_by[token_of(request)] += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        inference_id = (
+            str(uuid.uuid4()) if self.unique_ids else INFERENCE["inferenceId"]
+        )
+        return web.json_response({**CREATED_INFERENCE, "inferenceId": inference_id})
+
+    async def inference(self, request: web.Request) -> web.Response:
+        self.polling += 1
+        self.max_polling = max(self.max_polling, self.polling)
+        try:
+            await asyncio.sleep(self.poll_latency)
+        finally:
+            self.polling -= 1
+
+        response = await self.on_poll(request)
+        if response is not None:
+            return response
+        if self.flaky_polls:
+            self.flaky_polls -= 1
+            return web.json_response({"detail": "bad gateway"}, status=502)
+
+        inference_id = request.match_info["id"]
+        self.polled_by.append(token_of(request))
+        self.polls[inference_id] += 1
+        status = "PENDING"
+        if (
+            self.polls_to_complete is not None
+            and self.polls[inference_id] >= self.polls_to_complete
+        ):
+            status = "COMPLETED"
+            if self.polls[inference_id] == self.polls_to_complete:
+                self.in_flight -= 1
+        return web.json_response(
+            {**INFERENCE, "inferenceId": inference_id, "status": status}
+        )
+
+    async def queue_depth(self, request: web.Request) -> web.Response:
+        return web.json_response(self.max_queue_depth)
+
+    def setup(self, app: web.Application) -> web.Application:
+        app.router.add_post("/v1/inference/", self.create)
+        app.router.add_get("/v1/inferences/{id}", self.inference)
+        app.router.add_get("/v1/max_queue_depth", self.queue_depth)
+        return app
+
+    async def start(self, app: Optional[web.Application] = None) -> TestServer:
+        """
+        Serve the endpoints, next to the routes already on ``app``
+        """
+        server = TestServer(self.setup(app or web.Application()))
+        await server.start_server()
+        return server